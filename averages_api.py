@@ -6,6 +6,8 @@ import sqlite3
 import urllib.parse
 from pathlib import Path
 
+from backend.aggregates import aggregate
+
 PORT = 8001
 
 class AveragesHandler(http.server.SimpleHTTPRequestHandler):
@@ -44,70 +46,25 @@ class AveragesHandler(http.server.SimpleHTTPRequestHandler):
                 'opinions_rapporteur', 'opinions_shadow', 'explanations'
             ]
             
-            # Calculate EP averages
-            ep_averages = {}
-            for field in activity_fields:
-                cursor.execute(f'''
-                    SELECT AVG(CAST({field} AS FLOAT)) as avg_value
-                    FROM activities a 
-                    JOIN meps m ON a.mep_id = m.mep_id
-                    WHERE a.term = ?
-                ''', (term,))
-                result = cursor.fetchone()
-                ep_averages[field] = result[0] if result[0] is not None else 0
+            # One scan of the term's rows; every average comes out of a single aggregation pass
+            cursor.execute(f'''
+                SELECT m.current_party_group_id, m.country, {', '.join('a.' + field for field in activity_fields)}
+                FROM activities a 
+                JOIN meps m ON a.mep_id = m.mep_id
+                WHERE a.term = ?
+            ''', (term,))
+            averages = aggregate(map(dict, cursor.fetchall()), activity_fields, {
+                'groups': lambda row: row['current_party_group_id'],
+                'countries': lambda row: row['country'],
+            }).means
+            ep_averages = averages['ep']
+            group_averages = averages['groups']
+            country_averages = averages['countries']
             
             # Add questions total
             ep_averages['questions'] = ep_averages['questions_written']
-            
-            # Calculate group averages
-            group_averages = {}
-            cursor.execute('''
-                SELECT DISTINCT m.current_party_group_id 
-                FROM meps m 
-                JOIN activities a ON m.mep_id = a.mep_id 
-                WHERE a.term = ? AND m.current_party_group_id IS NOT NULL
-            ''', (term,))
-            groups = [row[0] for row in cursor.fetchall()]
-            
-            for group in groups:
-                group_averages[group] = {}
-                for field in activity_fields:
-                    cursor.execute(f'''
-                        SELECT AVG(CAST({field} AS FLOAT)) as avg_value
-                        FROM activities a 
-                        JOIN meps m ON a.mep_id = m.mep_id
-                        WHERE a.term = ? AND m.current_party_group_id = ?
-                    ''', (term, group))
-                    result = cursor.fetchone()
-                    group_averages[group][field] = result[0] if result[0] is not None else 0
-                
-                # Add questions total
-                group_averages[group]['questions'] = group_averages[group]['questions_written']
-            
-            # Calculate country averages
-            country_averages = {}
-            cursor.execute('''
-                SELECT DISTINCT m.country 
-                FROM meps m 
-                JOIN activities a ON m.mep_id = a.mep_id 
-                WHERE a.term = ? AND m.country IS NOT NULL
-            ''', (term,))
-            countries = [row[0] for row in cursor.fetchall()]
-            
-            for country in countries:
-                country_averages[country] = {}
-                for field in activity_fields:
-                    cursor.execute(f'''
-                        SELECT AVG(CAST({field} AS FLOAT)) as avg_value
-                        FROM activities a 
-                        JOIN meps m ON a.mep_id = m.mep_id
-                        WHERE a.term = ? AND m.country = ?
-                    ''', (term, country))
-                    result = cursor.fetchone()
-                    country_averages[country][field] = result[0] if result[0] is not None else 0
-                
-                # Add questions total
-                country_averages[country]['questions'] = country_averages[country]['questions_written']
+            for scope_averages in (*group_averages.values(), *country_averages.values()):
+                scope_averages['questions'] = scope_averages['questions_written']
             
             conn.close()
             
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Per-item MEP activities stored in SQLite.
+
+The ingest writes every item of the ParlTrack `ep_mep_activities` bundles into
+the `activity_items` table of `meps.db`, already split into the categories the
+profile drill-downs show (plenary speeches are told apart from explanations of
+vote and one-minute speeches once, here). The detail endpoints then page
+through an index instead of loading and filtering a term file per request.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import zlib
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator, Sequence
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS activity_items (
+        id INTEGER PRIMARY KEY,
+        mep_id INTEGER,
+        term INTEGER,
+        category TEXT,
+        date TEXT,                -- sort key: `date`, else `Date opened`, else ''
+        title TEXT,
+        url TEXT,
+        payload BLOB              -- zlib-compressed JSON of the original item
+    )
+"""
+
+INDEX_NAME = "idx_activity_items_lookup"
+INDEX_COLUMNS = "activity_items (mep_id, term, category, date DESC)"
+
+INSERT_SQL = """
+    INSERT INTO activity_items (mep_id, term, category, date, title, url, payload)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# ParlTrack bucket -> stored category, in insertion order. Items with equal
+# dates keep this order, which is how the JSON endpoints listed them
+# (written explanations before plenary ones, MOTION before IMOTION and WDECL).
+BUCKET_CATEGORIES = (
+    ("WEXP", "explanations_written"),
+    ("CRE", "speeches"),
+    ("WQ", "questions_written"),
+    ("OQ", "questions_oral"),
+    ("MINT", "questions_major"),
+    ("MOTION", "motions"),
+    ("IMOTION", "motions_individual"),
+    ("WDECL", "declarations"),
+    ("REPORT", "reports_rapporteur"),
+    ("REPORT-SHADOW", "reports_shadow"),
+    ("COMPARL", "opinions_rapporteur"),
+    ("COMPARL-SHADOW", "opinions_shadow"),
+)
+
+
+# Drill-down category -> stored categories, one mapping per server of the
+# `/api/mep/<id>/category/<category>` endpoint. They differ because each keeps
+# the selection its server made from the JSON term files before this table
+# existed: serve.py lists plain MOTIONs only and counts written explanations
+# along with the plenary explanations of vote, while scoring_api.py merges
+# individual motions and written declarations into motions and lists only the
+# plenary explanations of vote.
+SERVE_DETAIL_CATEGORIES = {
+    'speeches': ('speeches',),
+    'questions': ('questions_written',),
+    'questions_written': ('questions_written',),
+    'questions_oral': ('questions_oral',),
+    'motions': ('motions',),
+    'explanations': ('explanations_written', 'speeches_explanation'),
+    'reports_rapporteur': ('reports_rapporteur',),
+    'reports_shadow': ('reports_shadow',),
+    'opinions_rapporteur': ('opinions_rapporteur',),
+    'opinions_shadow': ('opinions_shadow',),
+}
+
+SCORING_API_DETAIL_CATEGORIES = {
+    **SERVE_DETAIL_CATEGORIES,
+    'motions': ('motions', 'motions_individual', 'declarations'),
+    'explanations': ('speeches_explanation',),
+}
+
+
+def classify_speech(title: object) -> str:
+    """Split a CRE (plenary) item into a speech, an explanation of vote or a one-minute speech."""
+    text = title if isinstance(title, str) else ""
+    if "Explanations of vote" in text:
+        return "speeches_explanation"
+    if "One-minute speeches" in text:
+        return "speeches_one_minute"
+    return "speeches"
+
+
+def date_key(item: dict) -> str:
+    """Sort key of an item: its `date`, else `Date opened`, as a string."""
+    value = item.get("date") or item.get("Date opened")
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _json_default(value: object) -> object:
+    # Streamed (ijson) records carry non-integer numbers as Decimal.
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_payload(item: dict) -> bytes:
+    encoded = json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+    return zlib.compress(encoded.encode("utf-8"))
+
+
+def decode_payload(payload: bytes) -> dict:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def item_rows(bundle: dict) -> Iterator[tuple]:
+    """
+    Yield one `activity_items` row per item of an ep_mep_activities bundle.
+
+    Items without a term are skipped, like they are when counting.
+    """
+    mep_id = bundle.get("mep_id")
+    if not mep_id:
+        return
+    for bucket, category in BUCKET_CATEGORIES:
+        items = bundle.get(bucket)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict) or not item.get("term"):
+                continue
+            title = item.get("title")
+            yield (
+                mep_id,
+                item["term"],
+                classify_speech(title) if bucket == "CRE" else category,
+                date_key(item),
+                title if isinstance(title, str) else None,
+                item.get("url") if isinstance(item.get("url"), str) else None,
+                encode_payload(item),
+            )
+
+
+def fetch_activity_items(
+    db_path: Path | str,
+    mep_id: int,
+    term: int,
+    categories: Sequence[str],
+    offset: int,
+    limit: int,
+) -> tuple[int, list[dict]] | None:
+    """
+    Return `(total_count, page)` of one MEP's items in `categories`, newest first.
+
+    Returns None when the database has no items at all for this MEP and term
+    (or no `activity_items` table yet), so callers can fall back to the JSON
+    term files.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return None
+    placeholders = ", ".join("?" for _ in categories)
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        if conn.execute(
+            "SELECT 1 FROM activity_items WHERE mep_id = ? AND term = ? LIMIT 1", (mep_id, term)
+        ).fetchone() is None:
+            return None
+        params = (mep_id, term, *categories)
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM activity_items WHERE mep_id = ? AND term = ? AND category IN ({placeholders})",
+            params,
+        ).fetchone()[0]
+        rows = conn.execute(
+            f"""
+            SELECT payload FROM activity_items
+            WHERE mep_id = ? AND term = ? AND category IN ({placeholders})
+            ORDER BY date DESC, id
+            LIMIT ? OFFSET ?
+            """,
+            (*params, limit, offset),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return total, [decode_payload(payload) for (payload,) in rows]
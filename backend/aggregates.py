@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Shared EP / group / country aggregation engine.
+
+The term datasets, the data sync service and the averages API all need the
+same numbers: for every scope (the whole EP, each political group, each
+country) and every activity field, the mean over the MEPs that have a value,
+and for comparisons also the median and a few percentiles.
+
+`aggregate` reads the rows once into one column per field and one bucket
+index per scope, then reduces every (scope, field) pair from those columns:
+`numpy.bincount` for the sums and counts, one sort per field for the
+percentiles. Without numpy the same figures are computed in plain Python.
+
+Sums run in row order, so means equal `sum(values) / len(values)` over the
+same rows exactly. Percentiles interpolate linearly between closest ranks,
+like `numpy.percentile`.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - the pure-Python path is used instead
+    np = None
+
+EP_SCOPE = "ep"
+DEFAULT_PERCENTILES = (25, 50, 75)
+
+# Scope name -> function returning a row's bucket (None: the row is left out of that scope).
+ScopeKeys = Mapping[str, Callable[[Mapping[str, Any]], Optional[Hashable]]]
+
+DEFAULT_SCOPES: ScopeKeys = {
+    "groups": lambda row: row.get("group"),
+    "countries": lambda row: row.get("country"),
+}
+
+
+def percentile_key(q: float) -> str:
+    return "median" if q == 50 else f"p{q:g}"
+
+
+@dataclass
+class Aggregates:
+    """
+    Per-scope statistics, shaped like the `averages` block of the datasets:
+    `means["ep"][field]` and `means["groups"][group][field]`; percentiles
+    add one more level, `percentiles["ep"][field]["p25" | "median" | ...]`.
+    """
+
+    means: Dict[str, Any] = field(default_factory=dict)
+    percentiles: Dict[str, Any] = field(default_factory=dict)
+    counts: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def medians(self) -> Dict[str, Any]:
+        return _map_leaves(self.percentiles, lambda stats: stats.get("median", 0))
+
+
+def _map_leaves(scopes: Dict[str, Any], leaf: Callable[[Dict[str, Any]], Any]) -> Dict[str, Any]:
+    result = {}
+    for scope, by_bucket in scopes.items():
+        if scope == EP_SCOPE:
+            result[scope] = {name: leaf(stats) for name, stats in by_bucket.items()}
+        else:
+            result[scope] = {
+                bucket: {name: leaf(stats) for name, stats in by_field.items()}
+                for bucket, by_field in by_bucket.items()
+            }
+    return result
+
+
+def _interpolate(ordered: Sequence[float], q: float) -> float:
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+
+
+def _reduce_python(
+    column: List[Optional[float]], buckets: List[int], n_buckets: int, qs: Sequence[float]
+) -> tuple[list, list, list]:
+    sums: list = [0] * n_buckets
+    values: List[list] = [[] for _ in range(n_buckets)]
+    for value, bucket in zip(column, buckets):
+        if value is None or bucket < 0:
+            continue
+        sums[bucket] += value
+        values[bucket].append(value)
+    counts = [len(bucket_values) for bucket_values in values]
+    means = [total / count if count else 0 for total, count in zip(sums, counts)]
+    quantiles = []
+    for bucket_values in values:
+        ordered = sorted(bucket_values)
+        quantiles.append([_interpolate(ordered, q) if ordered else 0 for q in qs])
+    return means, quantiles, counts
+
+
+def _reduce_numpy(
+    column: "np.ndarray", buckets: "np.ndarray", n_buckets: int, qs: Sequence[float]
+) -> tuple[list, list, list]:
+    present = ~np.isnan(column) & (buckets >= 0)
+    index, values = buckets[present], column[present]
+    # bincount adds the weights one by one in row order: the same sums as sum()
+    counts = np.bincount(index, minlength=n_buckets)
+    sums = np.bincount(index, weights=values, minlength=n_buckets)
+
+    order = np.lexsort((values, index))
+    ordered = values[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    last = np.maximum(counts - 1, 0)
+    quantiles = np.zeros((n_buckets, len(qs)))
+    filled = counts > 0
+    for slot, q in enumerate(qs):
+        position = last * (q / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, last)
+        low = ordered[(starts + lower)[filled]]
+        high = ordered[(starts + upper)[filled]]
+        quantiles[filled, slot] = low + (high - low) * (position - lower)[filled]
+
+    means = [float(total / count) if count else 0 for total, count in zip(sums.tolist(), counts.tolist())]
+    return means, quantiles.tolist(), counts.tolist()
+
+
+def aggregate(
+    rows: Iterable[Mapping[str, Any]],
+    fields: Sequence[str],
+    scopes: ScopeKeys = DEFAULT_SCOPES,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Aggregates:
+    """
+    Mean, median and `percentiles` of every field, EP-wide and per bucket of each scope.
+
+    Rows without a value (missing or None) for a field are left out of that
+    field's statistics; a bucket with no values at all reports 0. Buckets
+    appear in the order they are first met.
+    """
+    qs = list(dict.fromkeys([*percentiles, 50]))
+    scope_names = [EP_SCOPE, *scopes]
+    bucket_ids: Dict[str, Dict[Hashable, int]] = {name: {} for name in scope_names}
+    bucket_columns: Dict[str, List[int]] = {name: [] for name in scope_names}
+    columns: Dict[str, List[Optional[float]]] = {name: [] for name in fields}
+
+    # The single pass over the rows: one column per field, one bucket index per scope.
+    ep_bucket = bucket_columns[EP_SCOPE]
+    for row in rows:
+        ep_bucket.append(0)
+        for name, key_of in scopes.items():
+            key = key_of(row)
+            if key is None:
+                bucket_columns[name].append(-1)
+            else:
+                bucket_columns[name].append(bucket_ids[name].setdefault(key, len(bucket_ids[name])))
+        for name in fields:
+            columns[name].append(row.get(name))
+    bucket_ids[EP_SCOPE] = {EP_SCOPE: 0} if ep_bucket else {}
+
+    if np is not None:
+        as_arrays = {
+            name: np.array([math.nan if value is None else value for value in column], dtype=np.float64)
+            for name, column in columns.items()
+        }
+        bucket_arrays = {name: np.array(column, dtype=np.int64) for name, column in bucket_columns.items()}
+
+    result = Aggregates()
+    for scope in scope_names:
+        buckets = list(bucket_ids[scope])
+        by_bucket: Dict[Hashable, Dict[str, Any]] = {bucket: {} for bucket in buckets}
+        quantiles_by_bucket: Dict[Hashable, Dict[str, Any]] = {bucket: {} for bucket in buckets}
+        counts_by_bucket: Dict[Hashable, Dict[str, int]] = {bucket: {} for bucket in buckets}
+        for name in fields:
+            if np is not None:
+                means, quantiles, counts = _reduce_numpy(as_arrays[name], bucket_arrays[scope], len(buckets), qs)
+            else:
+                means, quantiles, counts = _reduce_python(columns[name], bucket_columns[scope], len(buckets), qs)
+            for bucket, mean, bucket_quantiles, count in zip(buckets, means, quantiles, counts):
+                by_bucket[bucket][name] = mean
+                quantiles_by_bucket[bucket][name] = {
+                    percentile_key(q): value for q, value in zip(qs, bucket_quantiles)
+                }
+                counts_by_bucket[bucket][name] = count
+        if scope == EP_SCOPE:
+            empty: Dict[str, Any] = {}
+            result.means[scope] = by_bucket.get(EP_SCOPE, {name: 0 for name in fields})
+            result.percentiles[scope] = quantiles_by_bucket.get(EP_SCOPE, empty)
+            result.counts[scope] = counts_by_bucket.get(EP_SCOPE, empty)
+        else:
+            result.means[scope] = by_bucket
+            result.percentiles[scope] = quantiles_by_bucket
+            result.counts[scope] = counts_by_bucket
+    return result
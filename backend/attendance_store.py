@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Per-vote attendance matrix stored next to the vote summary tables.
+
+`mep_vote_summary` only keeps one total per MEP and term. This store keeps
+the detail in a compact form instead of the old one-row-per-vote-per-MEP
+`votes_attended` table:
+
+  * `term_votes` lists the votes of each term in chronological order
+    (position, vote id, timestamp);
+  * `mep_vote_attendance` holds one bitset per MEP and term, bit `n` set
+    when the MEP took part in the vote at position `n`.
+
+Since positions follow the timestamps, any date range (a session, "since the
+MEP joined", ...) is a contiguous slice of positions, answered by a binary
+search and a popcount.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CREATE_TABLES_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS term_votes (
+        term INTEGER NOT NULL,
+        position INTEGER NOT NULL,    -- order of the vote within the term (by timestamp)
+        vote_id TEXT NOT NULL,
+        ts TEXT NOT NULL,
+        PRIMARY KEY (term, position)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mep_vote_attendance (
+        mep_id INTEGER NOT NULL,
+        term INTEGER NOT NULL,
+        attended BLOB NOT NULL,       -- bitset over term_votes positions, least significant bit first
+        PRIMARY KEY (mep_id, term)
+    )
+    """,
+)
+
+
+class AttendanceMatrixBuilder:
+    """
+    Collects the attendees of every vote while the votes dump is tallied.
+
+    Attendees are kept as packed 32-bit MEP ids, merged by vote id, and only
+    turned into bitsets once the votes of a term can be put in order.
+    """
+
+    def __init__(self) -> None:
+        # term -> vote id -> (timestamp, attendee ids)
+        self.votes: Dict[int, Dict[str, Tuple[str, array]]] = {}
+
+    def add_vote(self, term: int, vote_id: str, ts: str, mep_ids: Iterable[int]) -> None:
+        term_votes = self.votes.setdefault(term, {})
+        entry = term_votes.get(vote_id)
+        if entry is None:
+            term_votes[vote_id] = (ts, array("I", mep_ids))
+        else:
+            entry[1].extend(mep_ids)
+
+    def merge(self, other: "AttendanceMatrixBuilder") -> None:
+        for term, term_votes in other.votes.items():
+            for vote_id, (ts, mep_ids) in term_votes.items():
+                self.add_vote(term, vote_id, ts, mep_ids)
+
+    def term_matrix(self, term: int) -> Tuple[List[Tuple[str, str]], Dict[int, bytes]]:
+        """Return the ordered `(vote_id, ts)` list of a term and the bitset of every MEP."""
+        ordered = sorted(self.votes.get(term, {}).items(), key=lambda item: (item[1][0], item[0]))
+        size = (len(ordered) + 7) // 8
+        bitsets: Dict[int, bytearray] = {}
+        for position, (_, (_, mep_ids)) in enumerate(ordered):
+            index, bit = position >> 3, 1 << (position & 7)
+            for mep_id in mep_ids:
+                bits = bitsets.get(mep_id)
+                if bits is None:
+                    bits = bitsets[mep_id] = bytearray(size)
+                bits[index] |= bit
+        votes = [(vote_id, ts) for vote_id, (ts, _) in ordered]
+        return votes, {mep_id: bytes(bits) for mep_id, bits in bitsets.items()}
+
+
+def write_attendance_matrix(
+    cur: sqlite3.Cursor, builder: Optional[AttendanceMatrixBuilder], terms: Iterable[int]
+) -> int:
+    """
+    Replace the stored matrix of `terms` inside the caller's transaction.
+
+    With no builder the rows of those terms are only removed, so the store
+    never disagrees with the summary tables. Returns the bitsets written.
+    """
+    for statement in CREATE_TABLES_SQL:
+        cur.execute(statement)
+    written = 0
+    for term in terms:
+        cur.execute("DELETE FROM term_votes WHERE term = ?", (term,))
+        cur.execute("DELETE FROM mep_vote_attendance WHERE term = ?", (term,))
+        if builder is None:
+            continue
+        votes, bitsets = builder.term_matrix(term)
+        cur.executemany(
+            "INSERT INTO term_votes (term, position, vote_id, ts) VALUES (?, ?, ?, ?)",
+            [(term, position, vote_id, ts) for position, (vote_id, ts) in enumerate(votes)],
+        )
+        cur.executemany(
+            "INSERT INTO mep_vote_attendance (mep_id, term, attended) VALUES (?, ?, ?)",
+            [(mep_id, term, bits) for mep_id, bits in sorted(bitsets.items())],
+        )
+        written += len(bitsets)
+    return written
+
+
+class AttendanceStore:
+    """
+    Read side of the matrix: attendance over arbitrary date ranges.
+
+    A term is loaded on first use (timestamps plus one integer per MEP) and
+    reloaded when the database file changes.
+    """
+
+    def __init__(self, db_path: Path | str = Path("data/meps.db")) -> None:
+        self.db_path = Path(db_path)
+        self._terms: Dict[int, Tuple[List[str], Dict[int, int]]] = {}
+        self._mtime: Optional[int] = None
+
+    def _term(self, term: int) -> Tuple[List[str], Dict[int, int]]:
+        mtime = self.db_path.stat().st_mtime_ns
+        if mtime != self._mtime:
+            self._terms.clear()
+            self._mtime = mtime
+        loaded = self._terms.get(term)
+        if loaded is None:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                timestamps = [ts for (ts,) in conn.execute(
+                    "SELECT ts FROM term_votes WHERE term = ? ORDER BY position", (term,)
+                )]
+                bitsets = {
+                    mep_id: int.from_bytes(bits, "little")
+                    for mep_id, bits in conn.execute(
+                        "SELECT mep_id, attended FROM mep_vote_attendance WHERE term = ?", (term,)
+                    )
+                }
+            finally:
+                conn.close()
+            loaded = self._terms[term] = (timestamps, bitsets)
+        return loaded
+
+    def positions(self, term: int, start: Optional[str] = None, end: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Return the `[first, stop)` positions of the votes between two ISO dates.
+
+        Both bounds are inclusive and may be dates or full timestamps; None
+        leaves that side open.
+        """
+        timestamps, _ = self._term(term)
+        first = 0 if start is None else bisect_left(timestamps, start)
+        # "\uffff" sorts after any time suffix, so a bare end date includes that whole day.
+        stop = len(timestamps) if end is None else bisect_right(timestamps, end + "\uffff")
+        return first, max(first, stop)
+
+    def attendance(
+        self, mep_id: int, term: int, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Tuple[int, int]:
+        """Return `(votes attended, votes held)` by one MEP between two dates (inclusive)."""
+        first, stop = self.positions(term, start, end)
+        bits = self._term(term)[1].get(mep_id, 0)
+        attended = ((bits >> first) & ((1 << (stop - first)) - 1)).bit_count()
+        return attended, stop - first
+
+    def first_vote(self, mep_id: int, term: int) -> Optional[str]:
+        """Timestamp of the first vote the MEP took part in during `term` (None if none)."""
+        timestamps, bitsets = self._term(term)
+        bits = bitsets.get(mep_id, 0)
+        if not bits:
+            return None
+        return timestamps[(bits & -bits).bit_length() - 1]
+
+    def attendance_since_joined(self, mep_id: int, term: int) -> Tuple[int, int]:
+        """Attendance counted from the MEP's first vote of the term, for members who joined late."""
+        joined = self.first_vote(mep_id, term)
+        if joined is None:
+            return 0, 0
+        return self.attendance(mep_id, term, start=joined)
+
@@ -4,19 +4,36 @@ Build static JSON datasets for each EP term using data from the SQLite database.
 Uses new 4-category methodology: Legislative Production, Control & Transparency, 
 Engagement & Presence, and Institutional Roles.
 Outputs files to public/data/ directory.
+
+With --workers N the terms are built in parallel worker processes; the MEP
+metadata is decoded once up front and handed to every worker.
 """
 
+from __future__ import annotations
+
+import argparse
 import os
 import json
 import sqlite3
+import multiprocessing
 from pathlib import Path
 import csv
 import re
+import sys
 import xml.etree.ElementTree as ET
 # from tqdm import tqdm - removed dependency
 import logging, time
-import zstandard as zstd
+try:
+    import resource
+except ImportError:  # Windows: no peak memory reporting
+    resource = None
+from aggregates import aggregate
+from dataset_artifacts import write_artifact
 from mep_score_scorer import MEPScoreScorer
+from mep_store import load_mep_store
+from role_summary import ROLE_KEYS, load_role_summary
+from term_fingerprint import artifacts_current, term_fingerprint
+from term_views import term_artifact_names, write_term_views
 
 logging.basicConfig(
     format="%(asctime)s │ %(levelname)-8s │ %(message)s",
@@ -30,6 +47,9 @@ OUTPUT_DIR = Path("public/data")
 PUBLIC = Path("public/data")
 PARLTRACK_DIR = Path("data/parltrack")
 
+# Manifest writer tag; see term_fingerprint.WRITER_CODE_FILES
+WRITER = "build_term_dataset"
+
 # Store MEP names/metadata by ID
 NAME_BY_ID = {}
 
@@ -57,77 +77,20 @@ def standardize_group_name(group_name: str) -> str:
 def load_mep_data():
     """Load MEP data from ParlTrack to get country information"""
     logging.info("Loading MEP data from ParlTrack")
-    mep_file = PARLTRACK_DIR / "ep_meps.json.zst"
     
     try:
-        with open(mep_file, 'rb') as fh:
-            dctx = zstd.ZstdDecompressor()
-            with dctx.stream_reader(fh) as reader:
-                text = reader.read().decode('utf-8')
-                meps_data = json.loads(text)
-                logging.info(f"Loaded {len(meps_data)} MEP records")
-                
-                if not meps_data:
-                    logging.error("No MEP data found in file")
-                    return {}
-                
-                # Debug first record
-                if meps_data:
-                    logging.info(f"First record: {json.dumps(meps_data[0], indent=2)}")
-                
+        store = load_mep_store(PARLTRACK_DIR / "ep_meps.json.zst")
+        if not store:
+            logging.error("No MEP data found in file")
+            return {}
+        
         mep_info = {}
-        for mep in meps_data:
-            if not isinstance(mep, dict):
-                logging.warning(f"Skipping non-dict MEP record: {type(mep)}")
-                continue
-                
-            mep_id = mep.get("UserID")
-            if not mep_id:
-                logging.warning("Skipping MEP record without UserID")
-                continue
-                
-            constituencies = mep.get("Constituencies", [])
-            if not constituencies:
-                country = "Unknown"
-                logging.debug(f"No constituencies for MEP {mep_id}")
-            else:
-                # Get most recent constituency
-                try:
-                    current_constituency = sorted(
-                        [c for c in constituencies if isinstance(c, dict)],
-                        key=lambda x: x.get("end", "9999"),
-                        reverse=True
-                    )[0]
-                    country = current_constituency.get("country", "Unknown")
-                except (IndexError, KeyError) as e:
-                    logging.warning(f"Error getting constituency for MEP {mep_id}: {e}")
-                    country = "Unknown"
-            
-            # Get current group info
-            groups = mep.get("Groups", [])
-            if not groups:
-                party_group = "Unknown"
-                logging.debug(f"No groups for MEP {mep_id}")
-            else:
-                try:
-                    # Get most recent group
-                    current_group = sorted(
-                        [g for g in groups if isinstance(g, dict)],
-                        key=lambda x: x.get("end", "9999"),
-                        reverse=True
-                    )[0]
-                    party_group = current_group.get("Organization", "Unknown")
-                    party_group = standardize_group_name(party_group)
-                except (IndexError, KeyError) as e:
-                    logging.warning(f"Error getting group for MEP {mep_id}: {e}")
-                    party_group = "NI"
-            
-            name = mep.get("Name", {})
-            full_name = name.get("full", "Unknown")
-            
+        for mep_id, meta in store.items():
+            # A None group means the record's groups could not be read
+            party_group = standardize_group_name(meta["group"]) if meta["group"] is not None else "NI"
             mep_info[mep_id] = {
-                "Name": full_name,
-                "Country": country,
+                "Name": meta["name"],
+                "Country": meta["country"],
                 "Groups": [{"Organization": party_group}]
             }
             
@@ -139,18 +102,23 @@ def load_mep_data():
         logging.error(traceback.format_exc())
         return {}
 
-def load_official_ids(term: int) -> set[int]:
+def term_list_path(term: int) -> Path:
+    """The official MEP list of a term (XML, despite the .csv name)."""
+    return Path("data/term_list") / f"{term}th term_raw.csv"
+
+def load_official_ids(term: int, mep_info: dict | None = None) -> set[int]:
     """
     Load official MEP IDs from the term list XML files.
     
     Args:
         term: The parliamentary term (integer: 8, 9, or 10)
+        mep_info: MEP metadata from load_mep_data(), loaded here if not given
     
     Returns:
         A set of MEP IDs listed in the official term list
     """
     logging.info(f"Loading official IDs for term {term}")
-    xml_path = Path("data/term_list") / f"{term}th term_raw.csv"
+    xml_path = term_list_path(term)
     
     try:
         # Parse XML directly
@@ -161,7 +129,8 @@ def load_official_ids(term: int) -> set[int]:
         meps = root.findall('.//mep')
         
         # Load MEP data from ParlTrack
-        mep_info = load_mep_data()
+        if mep_info is None:
+            mep_info = load_mep_data()
         
         # Build set of IDs and metadata
         ids = set()
@@ -220,19 +189,35 @@ def fetch_data(cur, table: str, term: int, ids: set[int]) -> dict:
             
     return result
 
-def build(term: int):
-    """Build a static JSON dataset for a specific EP term."""
+def build(term: int, mep_info: dict | None = None, force: bool = False):
+    """
+    Build a static JSON dataset for a specific EP term.
+
+    The term is skipped when its input fingerprint matches the one recorded
+    with the existing artifacts, unless `force` is set.
+    """
     start_time = time.time()
     logging.info(f"Building dataset for term {term}")
     
     # Load official MEP IDs for this term
-    ids = load_official_ids(term)
+    ids = load_official_ids(term, mep_info)
     if not ids:
         logging.error(f"No official IDs found for term {term}")
         return
     
     # Get data from database
     conn = sqlite3.connect(DB)
+
+    fingerprint = term_fingerprint(
+        conn, term, WRITER, mep_ids=ids,
+        metadata=[[mep_id, NAME_BY_ID.get(mep_id)] for mep_id in sorted(ids)],
+        term_list=term_list_path(term),
+    )
+    if not force and artifacts_current(term_artifact_names(term), fingerprint, WRITER, PUBLIC):
+        logging.info(f"Term {term}: inputs unchanged (fingerprint {fingerprint[:12]}), skipping")
+        conn.close()
+        return
+
     c = conn.cursor()
     c.row_factory = sqlite3.Row
     
@@ -248,25 +233,13 @@ def build(term: int):
     """, (term,))
     acts_by_id = {row["mep_id"]: dict(row) for row in c.fetchall()}
     
-    # Get roles
-    c.execute("""
-        SELECT mep_id,
-            COUNT(*) FILTER (WHERE role = 'Chair' AND role_type = 'committee') as committee_chair,
-            COUNT(*) FILTER (WHERE role = 'Vice-Chair' AND role_type = 'committee') as committee_vice_chair,
-            COUNT(*) FILTER (WHERE role = 'Member' AND role_type = 'committee') as committee_member,
-            COUNT(*) FILTER (WHERE role = 'Substitute' AND role_type = 'committee') as committee_substitute,
-            COUNT(*) FILTER (WHERE role = 'Chair' AND role_type = 'delegation') as delegation_chair,
-            COUNT(*) FILTER (WHERE role = 'Vice-Chair' AND role_type = 'delegation') as delegation_vice_chair,
-            COUNT(*) FILTER (WHERE role = 'Member' AND role_type = 'delegation') as delegation_member,
-            COUNT(*) FILTER (WHERE role = 'Substitute' AND role_type = 'delegation') as delegation_substitute,
-            COUNT(*) FILTER (WHERE role = 'President' AND role_type = 'ep') as ep_president,
-            COUNT(*) FILTER (WHERE role = 'Vice-President' AND role_type = 'ep') as ep_vice_president,
-            COUNT(*) FILTER (WHERE role = 'Quaestor' AND role_type = 'ep') as ep_quaestor
-        FROM roles 
-        WHERE term = ?
-        GROUP BY mep_id
-    """, (term,))
-    roles_by_id = {row["mep_id"]: dict(row) for row in c.fetchall()}
+    # Get role counts (committee_chair, ep_president, ...) from the per-term summary
+    roles_by_id = {}
+    for mep_id, summary in load_role_summary(conn, term).items():
+        roles = roles_by_id[mep_id] = dict.fromkeys(ROLE_KEYS.values(), 0)
+        for role_key, _, _, count, _ in summary:
+            if role_key in roles:
+                roles[role_key] = count
     
     # Get votes attendance data
     c.execute("""
@@ -438,67 +411,31 @@ def build(term: int):
         # Update backward compatibility score field
         row["score"] = row["final_score"]
 
-    # Calculate averages for profile page
+    # Calculate averages (and medians / percentiles) for profile page
     logging.info(f"Calculating averages for term {term}")
-    
-    # Calculate EP-wide averages
-    ep_averages = {}
     activity_fields = ['speeches', 'amendments', 'reports_rapporteur', 'reports_shadow', 
                       'questions', 'questions_written', 'questions_oral', 'motions', 'opinions_rapporteur', 'opinions_shadow', 
                       'explanations', 'votes_attended', 'attendance_rate']
-    
-    for field in activity_fields:
-        values = [row[field] for row in full if row[field] is not None]
-        ep_averages[field] = sum(values) / len(values) if values else 0
-    
-    # Calculate averages by group
-    group_averages = {}
-    for row in full:
-        group = row['group']
-        if group not in group_averages:
-            group_averages[group] = {field: [] for field in activity_fields}
-        
-        for field in activity_fields:
-            if row[field] is not None:
-                group_averages[group][field].append(row[field])
-    
-    # Convert group lists to averages
-    for group in group_averages:
-        for field in activity_fields:
-            values = group_averages[group][field]
-            group_averages[group][field] = sum(values) / len(values) if values else 0
-    
-    # Calculate averages by country
-    country_averages = {}
-    for row in full:
-        country = row['country']
-        if country not in country_averages:
-            country_averages[country] = {field: [] for field in activity_fields}
-        
-        for field in activity_fields:
-            if row[field] is not None:
-                country_averages[country][field].append(row[field])
-    
-    # Convert country lists to averages
-    for country in country_averages:
-        for field in activity_fields:
-            values = country_averages[country][field]
-            country_averages[country][field] = sum(values) / len(values) if values else 0
+    stats = aggregate(full, activity_fields)
     
     # Create the final dataset structure expected by profile page
     dataset = {
         "meps": full,
-        "averages": {
-            "ep": ep_averages,
-            "groups": group_averages,
-            "countries": country_averages
-        }
+        "averages": stats.means,
+        "percentiles": stats.percentiles
     }
 
     logging.info(f"Writing JSON output for term {term}")
-    output_path = PUBLIC / f"term{term}_dataset.json"
-    output_path.write_text(
-        json.dumps(dataset, ensure_ascii=False, indent=2), "utf‑8")
+    artifact = write_artifact(f"term{term}_dataset", dataset, PUBLIC, fingerprint, WRITER)
+    logging.info(f"Wrote {artifact['file']} ({artifact['bytes']:,} bytes, "
+                 f"precompressed: {', '.join(artifact['encodings']) or 'none'})")
+
+    # Slim index, averages, profile shards and the columnar encodings
+    views = write_term_views(term, dataset, PUBLIC, fingerprint, WRITER)
+    for name in (f"term{term}_index", f"term{term}_index_columnar", f"term{term}_dataset_columnar"):
+        logging.info(f"Wrote {views[name]['file']} ({views[name]['bytes']:,} bytes)")
+    logging.info(f"Wrote {len(views) - 3} averages/profile files "
+                 f"({sum(v['bytes'] for n, v in views.items() if 'profiles' in n or 'averages' in n):,} bytes)")
     
     if missing_meta:
         logging.warning(f"WARNING: {len(missing_meta)} ids had no meta – fix ingest first")
@@ -506,14 +443,57 @@ def build(term: int):
     elapsed = time.time() - start_time
     logging.info(f"Term {term} dataset complete in {elapsed:.2f} seconds")
 
-def main():
+TERMS = (8, 9, 10)
+
+def peak_memory_mb() -> float | None:
+    """Peak resident set size of the current process in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def build_timed(term: int, mep_info: dict | None = None, force: bool = False) -> tuple[int, float, float | None]:
+    """Build one term; returns (term, wall time in seconds, peak memory in MB)."""
+    start_time = time.time()
+    build(term, mep_info, force)
+    return term, time.time() - start_time, peak_memory_mb()
+
+def log_build_stats(stats, total: float):
+    logging.info("Term build summary:")
+    for term, elapsed, peak in sorted(stats):
+        memory = f"{peak:,.0f} MB peak" if peak is not None else "peak memory n/a"
+        logging.info(f"  term {term}: {elapsed:6.2f}s, {memory}")
+    logging.info(f"  total:   {total:6.2f}s")
+
+def main(argv=None):
     """Build datasets for all terms."""
+    parser = argparse.ArgumentParser(description="Build the static JSON datasets of each EP term.")
+    parser.add_argument("--term", type=int, action="append", choices=TERMS,
+                        help="term to build (repeatable, default: all terms)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="build the terms in this many processes (0 = one per term, default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every term, even those whose inputs are unchanged")
+    args = parser.parse_args(argv)
+    terms = tuple(args.term or TERMS)
+    workers = min(args.workers or len(terms), len(terms))
+
     logging.info("Starting dataset generation")
-    
-    # Build datasets for all terms
-    for term in (8, 9, 10):
-        build(term)
-    
+    started = time.time()
+
+    # Decode the MEP metadata once and share it with every term build
+    mep_info = load_mep_data()
+
+    if workers > 1:
+        logging.info(f"Building terms {', '.join(map(str, terms))} in {workers} processes")
+        # One fresh process per term, so each reports its own peak memory
+        with multiprocessing.Pool(processes=workers, maxtasksperchild=1) as pool:
+            stats = pool.starmap(build_timed, [(term, mep_info, args.force) for term in terms], chunksize=1)
+    else:
+        stats = [build_timed(term, mep_info, args.force) for term in terms]
+
+    log_build_stats(stats, time.time() - started)
     logging.info(f"All term datasets created successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Columnar (struct-of-arrays) encoding of the MEP rows in the term datasets.
+
+In the row format every MEP repeats every key name; here each key appears
+once with an array of values:
+
+    {
+      "encoding": "columnar",
+      "version": 1,
+      "length": 720,
+      "columns": {"mep_id": [...], "country": [0, 3, ...], ...},
+      "dictionaries": {"country": ["AT", "BE", ...], ...}
+    }
+
+Columns listed in `dictionaries` (country, group, national_party) hold
+indexes into that list instead of repeating the strings. Rows are expected
+to share their keys, as the dataset rows do; a key missing from some rows
+decodes as None there. `public/js/utilities.js` has the matching
+`decodeColumnar`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Sequence
+
+ENCODING = "columnar"
+VERSION = 1
+DICTIONARY_FIELDS = ("country", "group", "national_party")
+
+
+def encode_columnar(
+    rows: Iterable[Mapping[str, Any]], dictionary_fields: Sequence[str] = DICTIONARY_FIELDS
+) -> Dict[str, Any]:
+    """Encode `rows` column by column, dictionary-encoding `dictionary_fields`."""
+    rows = list(rows)
+    names = list(dict.fromkeys(key for row in rows for key in row))
+    columns = {name: [row.get(name) for row in rows] for name in names}
+
+    dictionaries: Dict[str, List[Any]] = {}
+    for name in dictionary_fields:
+        if name not in columns:
+            continue
+        codes: Dict[Hashable, int] = {}
+        columns[name] = [codes.setdefault(value, len(codes)) for value in columns[name]]
+        dictionaries[name] = list(codes)
+
+    return {
+        "encoding": ENCODING,
+        "version": VERSION,
+        "length": len(rows),
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
+
+
+def is_columnar(data: Any) -> bool:
+    return isinstance(data, Mapping) and data.get("encoding") == ENCODING
+
+
+def decode_columnar(data: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Rows (dicts, keys in column order) of an `encode_columnar` result."""
+    if not is_columnar(data):
+        raise ValueError("not a columnar encoding")
+    if data.get("version") != VERSION:
+        raise ValueError(f"unsupported columnar version: {data.get('version')!r}")
+    columns = dict(data["columns"])
+    for name, values in data.get("dictionaries", {}).items():
+        columns[name] = [values[code] for code in columns[name]]
+    if not columns:
+        return [{} for _ in range(data.get("length", 0))]
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def columnar_dataset(dataset: Mapping[str, Any]) -> Dict[str, Any]:
+    """A copy of a term dataset (or index) with its `meps` rows in columnar form."""
+    return {**dataset, "meps": encode_columnar(dataset.get("meps", []))}
+
+
+def row_dataset(dataset: Mapping[str, Any]) -> Dict[str, Any]:
+    """The inverse of `columnar_dataset`; row-format datasets are returned unchanged."""
+    meps = dataset.get("meps")
+    if not is_columnar(meps):
+        return dict(dataset)
+    return {**dataset, "meps": decode_columnar(meps)}
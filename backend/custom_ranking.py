@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Rankings of a term's MEPs under user-chosen metric weights.
+
+A custom score is the weighted sum of an MEP's metrics (activity counts,
+role counts, category scores, attendance...): `sum(mep[metric] * weight)`.
+The engine keeps, per term, the MEP x metric matrix built from the rows of
+the published `term{N}_index` artifact (the `term{N}_dataset` when there is
+no index), i.e. the same fields custom-ranking.js ranks by in the browser,
+so a ranking is one matrix-vector product and a stable sort. Rankings of
+recently used weight vectors are memoised, so paging through results or
+re-sending the same slider positions does not re-rank.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - plain Python sums and sort instead
+    np = None
+
+try:
+    from .dataset_artifacts import DATA_DIR, load_manifest
+except ImportError:
+    from dataset_artifacts import DATA_DIR, load_manifest  # type: ignore
+
+IDENTITY_FIELDS = ("mep_id", "full_name", "country", "group", "national_party")
+# Numeric fields of the dataset rows that are not metrics.
+EXCLUDED_FIELDS = ("mep_id", "rank")
+
+MEMO_ENTRIES = 256
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+@dataclass(frozen=True)
+class MetricMatrix:
+    """One term's MEPs (in scored order) and their metrics, one row per MEP."""
+
+    key: Tuple
+    meps: Tuple[Dict[str, Any], ...]
+    metrics: Tuple[str, ...]
+    matrix: Any  # numpy float64 (MEPs x metrics) when numpy is installed, else a list of rows
+
+    def column(self, metric: str) -> int:
+        return self.metrics.index(metric)
+
+
+def build_metric_matrix(key: Tuple, rows: Sequence[Mapping[str, Any]]) -> MetricMatrix:
+    """The matrix of every numeric field of the dataset `rows`."""
+    metrics = sorted({
+        name for row in rows for name, value in row.items()
+        if name not in EXCLUDED_FIELDS and isinstance(value, (int, float)) and not isinstance(value, bool)
+    })
+    meps = tuple({name: row.get(name) for name in IDENTITY_FIELDS} for row in rows)
+    values = [[float(row.get(name) or 0) for name in metrics] for row in rows]
+    if np is not None:
+        matrix = np.asarray(values, dtype=np.float64).reshape(len(rows), len(metrics))
+    else:
+        matrix = values
+    return MetricMatrix(key, meps, tuple(metrics), matrix)
+
+
+def parse_weights(raw: Mapping[str, Any], metrics: Sequence[str]) -> Tuple[Tuple[str, float], ...]:
+    """
+    Validated, canonical weights: finite numbers, zeros dropped, sorted by metric.
+
+    Zero weights are dropped before the name is checked, so a form that sends
+    every input can include fields the term does not have.
+    """
+    weights = {}
+    for name, value in raw.items():
+        try:
+            weight = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid weight for {name}: {value!r}") from None
+        if not math.isfinite(weight):
+            raise ValueError(f"Invalid weight for {name}: {value!r}")
+        if not weight:
+            continue
+        if name not in metrics:
+            raise ValueError(f"Unknown metric: {name}")
+        weights[name] = weight
+    return tuple(sorted(weights.items()))
+
+
+class CustomRankingEngine:
+    """Ranks the MEPs of a term by weighted metric sums, paging the result."""
+
+    def __init__(self, data_dir: Path | str = DATA_DIR, memo_entries: int = MEMO_ENTRIES) -> None:
+        self.data_dir = Path(data_dir)
+        self.memo_entries = memo_entries
+        self._matrices: Dict[int, MetricMatrix] = {}
+        self._rankings: "OrderedDict[Tuple, Tuple[List[int], List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _source(self, term: int) -> Path:
+        """The current file of the term's index (or, failing that, dataset) artifact."""
+        artifacts = load_manifest(self.data_dir)["artifacts"]
+        for name in (f"term{term}_index", f"term{term}_dataset"):
+            entry = artifacts.get(name)
+            if entry and (self.data_dir / entry["file"]).exists():
+                return self.data_dir / entry["file"]
+            if (self.data_dir / f"{name}.json").exists():
+                return self.data_dir / f"{name}.json"
+        raise FileNotFoundError(f"No dataset published for term {term} in {self.data_dir}")
+
+    def matrix(self, term: int) -> MetricMatrix:
+        """The metric matrix of `term`, rebuilt when its published dataset changes."""
+        path = self._source(term)
+        key = (term, path.name, path.stat().st_mtime_ns)
+        matrix = self._matrices.get(term)
+        if matrix is None or matrix.key != key:
+            rows = json.loads(path.read_text(encoding="utf-8"))["meps"]
+            matrix = build_metric_matrix(key, rows)
+            self._matrices[term] = matrix
+        return matrix
+
+    def ranking(self, matrix: MetricMatrix, weights: Tuple[Tuple[str, float], ...]) -> Tuple[List[int], List[float]]:
+        """MEP positions in `matrix` ordered by descending custom score (ties keep scored order), and the scores."""
+        memo_key = (matrix.key, weights)
+        with self._lock:
+            ranked = self._rankings.get(memo_key)
+            if ranked is not None:
+                self._rankings.move_to_end(memo_key)
+                return ranked
+
+        if np is not None:
+            vector = np.zeros(len(matrix.metrics), dtype=np.float64)
+            for name, weight in weights:
+                vector[matrix.column(name)] = weight
+            scores = matrix.matrix @ vector
+            order = np.argsort(-scores, kind="stable")
+            ranked = (order.tolist(), scores[order].tolist())
+        else:
+            columns = [(matrix.column(name), weight) for name, weight in weights]
+            scores = [sum(row[column] * weight for column, weight in columns) for row in matrix.matrix]
+            order = sorted(range(len(scores)), key=lambda position: -scores[position])
+            ranked = (order, [scores[position] for position in order])
+
+        with self._lock:
+            self._rankings[memo_key] = ranked
+            while len(self._rankings) > self.memo_entries:
+                self._rankings.popitem(last=False)
+        return ranked
+
+    def rank(
+        self,
+        term: int,
+        weights: Mapping[str, Any],
+        offset: int = 0,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Dict[str, Any]:
+        """One page of the ranking of `term` under `weights` (metric -> weight)."""
+        if offset < 0 or limit < 1:
+            raise ValueError("offset must be >= 0 and limit >= 1")
+        limit = min(limit, MAX_LIMIT)
+        matrix = self.matrix(term)
+        canonical = parse_weights(weights, matrix.metrics)
+        order, scores = self.ranking(matrix, canonical)
+        page = [
+            {**matrix.meps[position], 'rank': offset + index + 1, 'custom_score': scores[offset + index]}
+            for index, position in enumerate(order[offset:offset + limit])
+        ]
+        return {
+            'success': True,
+            'term': term,
+            'count': len(order),
+            'offset': offset,
+            'limit': limit,
+            'weights': dict(canonical),
+            'metrics': list(matrix.metrics),
+            'data': page,
+        }
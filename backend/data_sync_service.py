@@ -11,12 +11,22 @@ import time
 from pathlib import Path
 from typing import Dict, List, Optional
 import logging
+import sqlite3
+from aggregates import aggregate
+from dataset_artifacts import write_artifact
+from term_fingerprint import artifacts_current, term_fingerprint
+from term_views import term_artifact_names, write_term_views
+from incremental_scoring import IncrementalScorer
 from mep_score_scorer import MEPScoreScorer
 
+# Manifest writer tag; see term_fingerprint.WRITER_CODE_FILES
+WRITER = "data_sync_service"
+
 class DataSyncService:
     def __init__(self, db_path: str = "data/meps.db"):
         self.db_path = db_path
         self.scorer = MEPScoreScorer(db_path)
+        self.incremental_scorer = IncrementalScorer(self.scorer)
         self.sync_metadata_file = Path("data/sync_metadata.json")
         self.frontend_data_dir = Path("public/data")
         self.backend_files = [
@@ -87,13 +97,29 @@ class DataSyncService:
             "current_database_hash": current_database_hash
         }
     
-    def regenerate_term_dataset(self, term: int) -> bool:
-        """Regenerate dataset for a specific term"""
+    def get_term_fingerprint(self, term: int) -> str:
+        """Fingerprint of the database rows, term list and code a term's dataset is built from"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return term_fingerprint(
+                conn, term, WRITER,
+                term_list=Path("data/term_list") / f"{term}th term_raw.csv",
+            )
+        finally:
+            conn.close()
+    
+    def regenerate_term_dataset(self, term: int, force: bool = False) -> bool:
+        """Regenerate dataset for a specific term, unless its inputs are unchanged (or `force`)"""
         try:
+            fingerprint = self.get_term_fingerprint(term)
+            if not force and artifacts_current(term_artifact_names(term), fingerprint, WRITER, self.frontend_data_dir):
+                self.logger.info(f"Term {term} inputs unchanged, skipping regeneration")
+                return True
+            
             self.logger.info(f"Regenerating dataset for term {term}")
             
             # Calculate new scores
-            results = self.scorer.score_all_meps(term)
+            results = self.incremental_scorer.score_all_meps(term)
             
             if not results:
                 self.logger.warning(f"No data found for term {term}")
@@ -112,12 +138,11 @@ class DataSyncService:
                 }
             }
             
-            # Save dataset
-            output_file = self.frontend_data_dir / f"term{term}_dataset.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(dataset, f, ensure_ascii=False, indent=2)
+            # Save dataset (minified, content-hashed and precompressed)
+            artifact = write_artifact(f"term{term}_dataset", dataset, self.frontend_data_dir, fingerprint, WRITER)
+            write_term_views(term, dataset, self.frontend_data_dir, fingerprint, WRITER)
             
-            self.logger.info(f"Generated {output_file} with {len(results)} MEPs")
+            self.logger.info(f"Generated {artifact['file']} with {len(results)} MEPs")
             return True
             
         except Exception as e:
@@ -136,42 +161,22 @@ class DataSyncService:
             'opinions_shadow', 'attendance_rate', 'final_score'
         ]
         
-        averages = {"ep": {}, "groups": {}, "countries": {}}
-        
-        # EP-wide averages
-        for field in activity_fields:
-            values = [mep.get(field, 0) for mep in meps_data if mep.get(field) is not None]
-            averages["ep"][field] = sum(values) / len(values) if values else 0
-        
-        # Group averages
-        groups = set(mep.get('group') for mep in meps_data if mep.get('group'))
-        for group in groups:
-            group_meps = [mep for mep in meps_data if mep.get('group') == group]
-            averages["groups"][group] = {}
-            
-            for field in activity_fields:
-                values = [mep.get(field, 0) for mep in group_meps if mep.get(field) is not None]
-                averages["groups"][group][field] = sum(values) / len(values) if values else 0
-        
-        # Country averages
-        countries = set(mep.get('country') for mep in meps_data if mep.get('country'))
-        for country in countries:
-            country_meps = [mep for mep in meps_data if mep.get('country') == country]
-            averages["countries"][country] = {}
-            
-            for field in activity_fields:
-                values = [mep.get(field, 0) for mep in country_meps if mep.get(field) is not None]
-                averages["countries"][country][field] = sum(values) / len(values) if values else 0
-        
-        return averages
+        # Rows without a group or country only count towards the EP-wide averages
+        return aggregate(meps_data, activity_fields, {
+            "groups": lambda mep: mep.get('group') or None,
+            "countries": lambda mep: mep.get('country') or None,
+        }).means
     
-    def full_sync(self) -> bool:
-        """Perform full synchronization of all datasets"""
+    def full_sync(self, force: bool = False) -> bool:
+        """
+        Perform full synchronization of all datasets.
+        Terms whose input fingerprint is unchanged are skipped unless `force` is set.
+        """
         self.logger.info("Starting full synchronization...")
         
         sync_status = self.check_sync_needed()
         
-        if not any([sync_status["backend_changed"], sync_status["database_changed"], sync_status["never_synced"]]):
+        if not force and not any([sync_status["backend_changed"], sync_status["database_changed"], sync_status["never_synced"]]):
             self.logger.info("No synchronization needed - all data is up to date")
             return True
         
@@ -180,7 +185,7 @@ class DataSyncService:
         successful_terms = []
         
         for term in terms_to_sync:
-            if self.regenerate_term_dataset(term):
+            if self.regenerate_term_dataset(term, force):
                 successful_terms.append(term)
         
         if successful_terms:
@@ -213,7 +218,7 @@ class DataSyncService:
                 frontend_data = json.load(f)
             
             # Get fresh backend calculation
-            backend_results = self.scorer.score_all_meps(term)
+            backend_results = self.incremental_scorer.score_all_meps(term)
             
             if not backend_results:
                 return {"exists": True, "consistent": False, "error": "No backend data"}
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Content-hashed, precompressed dataset artifacts for the static frontend.
+
+`write_artifact` serialises a dataset once as minified JSON and writes it as
+`public/data/<name>.<hash>.json` together with `.gz`, `.zst` and `.br`
+siblings (the `.br` ones need the `brotli` package from requirements.txt and
+are skipped without it). `public/data/manifest.json`
+maps every artifact name to its current file, so a hashed file never changes
+once written and can be cached forever; only the small manifest is
+revalidated. The plain `<name>.json` is still written (minified) for the
+scripts and older clients that read it by its fixed name. `write_artifacts`
+writes several artifacts with a single manifest update.
+
+`resolve_artifact` is the serving side: it picks the precompressed variant a
+client accepts and the cache policy of a requested data file.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+import zstandard
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock the manifest with msvcrt instead
+    fcntl = None
+    import msvcrt
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - .br siblings are skipped
+    brotli = None
+
+DATA_DIR = Path("public/data")
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 12
+
+# Content-Encoding -> file suffix, in order of preference when a client accepts several.
+ENCODINGS = (("br", ".br"), ("zstd", ".zst"), ("gzip", ".gz"))
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_HASHED_NAME = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}\.json$")
+
+
+def encode_json(data: Any) -> bytes:
+    """Minified UTF-8 JSON, the byte form every artifact is hashed and served in."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _compressed(payload: bytes) -> Dict[str, bytes]:
+    variants = {
+        ".gz": gzip.compress(payload, compresslevel=9, mtime=0),
+        ".zst": zstandard.ZstdCompressor(level=19).compress(payload),
+    }
+    if brotli is not None:
+        variants[".br"] = brotli.compress(payload, quality=11)
+    return variants
+
+
+def _replace(path: Path, payload: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(directory: Path = DATA_DIR) -> Dict[str, Any]:
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"artifacts": {}}
+    manifest.setdefault("artifacts", {})
+    return manifest
+
+
+@contextmanager
+def _manifest_lock(directory: Path) -> Iterator[None]:
+    """Serialise manifest updates of parallel term builds."""
+    with open(directory / (MANIFEST_NAME + ".lock"), "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            # Locks the first byte of the lock file; LK_LOCK gives up after
+            # ten one-second retries, so keep retrying until the holder is done.
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_files(name: str, data: Any, directory: Path) -> Dict[str, Any]:
+    payload = encode_json(data)
+    digest = hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+    filename = f"{name}.{digest}.json"
+
+    hashed_path = directory / filename
+    if not hashed_path.exists():
+        for suffix, compressed in _compressed(payload).items():
+            _replace(directory / (filename + suffix), compressed)
+        _replace(hashed_path, payload)
+    _replace(directory / f"{name}.json", payload)
+    return {
+        "file": filename,
+        "hash": digest,
+        "bytes": len(payload),
+        "encodings": {
+            encoding: filename + suffix
+            for encoding, suffix in ENCODINGS
+            if (directory / (filename + suffix)).exists()
+        },
+    }
+
+
+def write_artifacts(
+    artifacts: Mapping[str, Any],
+    directory: Path = DATA_DIR,
+    fingerprint: Optional[str] = None,
+    writer: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Write every `name -> data` of `artifacts` and point the manifest at them
+    in one update. `fingerprint`, when given, is recorded in each entry as the
+    digest of the inputs the data was built from, along with the `writer`
+    whose recipe produced it (see `term_fingerprint.py`).
+
+    The previous version's files are kept for one more build, so pages that
+    loaded the old manifest can still fetch them; older ones are removed.
+    Returns the manifest entries by name.
+    """
+    if not artifacts:
+        return {}
+    directory.mkdir(parents=True, exist_ok=True)
+    entries = {name: _write_files(name, data, directory) for name, data in artifacts.items()}
+    if fingerprint is not None:
+        for entry in entries.values():
+            entry["fingerprint"] = fingerprint
+            entry["writer"] = writer
+
+    with _manifest_lock(directory):
+        manifest = load_manifest(directory)
+        previous = {name: manifest["artifacts"].get(name, {}).get("file") for name in entries}
+        manifest["artifacts"].update(entries)
+        _replace(directory / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+    versions = re.compile(
+        rf"^((?:{'|'.join(map(re.escape, entries))})\.[0-9a-f]{{{HASH_LENGTH}}}\.json)(\.gz|\.zst|\.br)?$"
+    )
+    keep = {entry["file"] for entry in entries.values()} | set(previous.values())
+    for path in directory.iterdir():
+        match = versions.match(path.name)
+        if match and match.group(1) not in keep:
+            path.unlink()
+    return entries
+
+
+def write_artifact(
+    name: str, data: Any, directory: Path = DATA_DIR, fingerprint: Optional[str] = None, writer: Optional[str] = None
+) -> Dict[str, Any]:
+    """Write `data` as the artifact `name` and point the manifest at it; returns its manifest entry."""
+    return write_artifacts({name: data}, directory, fingerprint, writer)[name]
+
+
+@dataclass(frozen=True)
+class ArtifactFile:
+    """A data file to send: where it is, its Content-Encoding (if any), Cache-Control and ETag."""
+
+    path: Path
+    encoding: Optional[str]
+    cache_control: str
+    etag: str
+
+
+def _accepted(accept_encoding: str) -> set:
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(token.lower())
+    return accepted
+
+
+def resolve_artifact(directory: Path | str, filename: str, accept_encoding: str = "") -> Optional[ArtifactFile]:
+    """
+    Return how to serve the data file `filename` (relative to `directory`), or
+    None when it is not a JSON data file this module manages.
+
+    Content-hashed files are immutable and served from their best precompressed
+    sibling the client accepts; the manifest and fixed-name files must be
+    revalidated.
+    """
+    if "/" in filename or "\\" in filename or not filename.endswith(".json"):
+        return None
+    path = Path(directory) / filename
+    if not path.is_file():
+        return None
+    if not _HASHED_NAME.search(filename):
+        stat = path.stat()
+        return ArtifactFile(path, None, REVALIDATE, f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"')
+    accepted = _accepted(accept_encoding)
+    digest = filename.rsplit(".", 2)[1]
+    for encoding, suffix in ENCODINGS:
+        variant = path.with_name(path.name + suffix)
+        if encoding in accepted and variant.is_file():
+            return ArtifactFile(variant, encoding, IMMUTABLE, f'"{digest}-{encoding}"')
+    return ArtifactFile(path, None, IMMUTABLE, f'"{digest}"')
@@ -9,6 +9,7 @@ files while existing code keeps referencing the original `.json` paths.
 
 from __future__ import annotations
 
+import hashlib
 import io
 import json
 from pathlib import Path
@@ -51,6 +52,21 @@ def resolve_json_path(path: Path | str) -> Path:
     return candidate
 
 
+def file_fingerprint(path: Path | str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's bytes, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def json_fingerprint(value: Any) -> str:
+    """Return a stable SHA-1 hex digest of a JSON-serialisable value (key order insensitive)."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
 def load_json_auto(path: Path | str) -> Any:
     """
     Load JSON data from either an uncompressed file or a `.json.zst` archive.
@@ -101,15 +117,37 @@ def stream_json_items(path: Path | str) -> Iterator[Any]:
     if not resolved.exists():
         raise FileNotFoundError(f"JSON file not found: {path}")
 
+    # ijson parses raw UTF-8 bytes natively; handing it a text stream forces a
+    # decode/re-encode round trip on every chunk.
     if resolved.suffix == ".zst":
         with resolved.open("rb") as raw:
             reader = zstd.ZstdDecompressor().stream_reader(raw)
-            text_stream = io.TextIOWrapper(reader, encoding="utf-8")
             try:
-                yield from ijson.items(text_stream, "item")
+                yield from ijson.items(reader, "item")
             finally:
-                text_stream.close()
                 reader.close()
     else:
-        with resolved.open("r", encoding="utf-8") as handle:
+        with resolved.open("rb") as handle:
             yield from ijson.items(handle, "item")
+
+
+def stream_combined_dataset(primary: Path | str, fallbacks: Iterable[Path | str]) -> Iterator[Any]:
+    """
+    Streaming counterpart of `load_combined_dataset`.
+
+    Yields the items of the primary JSON array when it exists, otherwise the
+    items of every available fallback file in order. Only one record is held
+    in memory at a time.
+    """
+    resolved_primary = resolve_json_path(primary)
+    if resolved_primary.exists():
+        yield from stream_json_items(resolved_primary)
+        return
+
+    available = [resolve_json_path(fallback) for fallback in fallbacks]
+    available = [candidate for candidate in available if candidate.exists()]
+    if not available:
+        raise FileNotFoundError(f"No dataset found for {primary}")
+
+    for candidate in available:
+        yield from stream_json_items(candidate)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Incremental rescoring of a term after a few MEPs' inputs change.
+
+`IncrementalScorer(scorer).score_all_meps(term)` returns exactly what
+`MEPScoreScorer.score_all_meps(term)` returns, but keeps, per term, the
+input row each MEP was scored from, the outlier bounds of every indicator
+and every MEP's (unranked) result. On the next run it compares the new term
+snapshot with those rows and:
+
+  * finds the changed MEPs (any input differs, or the MEP was added or
+    removed) and, per indicator, whether any of them changed its values;
+  * recomputes the IQR bounds of the affected indicators only;
+  * rescores every MEP when some indicator's bounds moved (every score of
+    that indicator may change), and otherwise only the changed MEPs;
+  * sorts and ranks the whole term again, as a full run does.
+
+The state lives in the process, so long-running services (the scoring API,
+the data sync service) rescore a term after an ingest from their previous
+results. A new `IncrementalScorer` starts with a full run.
+"""
+
+from __future__ import annotations
+
+import json
+import marshal
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+try:
+    from .mep_score_scorer import MEPScoreScorer
+except ImportError:
+    from mep_score_scorer import MEPScoreScorer  # type: ignore
+
+# Snapshot field of each outlier-scored indicator (as in MEPScoreScorer)
+INDICATOR_FIELDS = {
+    'amendments': 'amendments',
+    'written_questions': 'questions_written',
+    'oral_questions': 'questions_oral',
+    'explanations': 'explanations',
+    'speeches': 'speeches',
+    'motions': 'motions',
+}
+
+# The parts of `OutlierBasedScorer.indicator_bounds` that `score_value` depends on
+_BOUND_KEYS = ('lower_bound', 'upper_bound', 'min_clean', 'max_clean')
+
+
+@dataclass(frozen=True)
+class _MepState:
+    """One MEP's input row and its unranked result, packed so each run gets a fresh copy cheaply."""
+
+    row: Dict
+    result: bytes
+
+    @classmethod
+    def scored(cls, row: Dict, result: Dict) -> "_MepState":
+        # Through JSON first: numpy scalars in the result become plain floats
+        return cls(row, marshal.dumps(json.loads(json.dumps(result))))
+
+
+@dataclass(frozen=True)
+class _TermState:
+    bounds: Dict[str, Dict]
+    meps: Dict[int, _MepState]
+
+
+class IncrementalScorer:
+    """Scores whole terms, rescoring only what changed since the previous run."""
+
+    def __init__(self, scorer: MEPScoreScorer) -> None:
+        self.scorer = scorer
+        self._states: Dict[int, _TermState] = {}
+        self._lock = threading.Lock()
+
+    def clear(self, term: Optional[int] = None) -> None:
+        """Forget the state of `term` (or of every term), so the next run is a full one."""
+        with self._lock:
+            for key in (list(self._states) if term is None else [term]):
+                self._states.pop(key, None)
+
+    def score_all_meps(self, term: int = 10) -> List[Dict]:
+        """Same results as `MEPScoreScorer.score_all_meps(term)`, rescoring only what changed."""
+        with self._lock:  # the scorer's ranges and outlier stats are per instance
+            return self._score_all_meps(term)
+
+    def _score_all_meps(self, term: int) -> List[Dict]:
+        scorer = self.scorer
+        scorer.calculate_dynamic_ranges(term)
+        snapshot = scorer.get_snapshot(term)
+        meps_data = snapshot.meps
+        if not meps_data:
+            return []
+
+        rows = {mep['mep_id']: mep for mep in meps_data}
+        previous = self._states.get(term)
+        old_meps = previous.meps if previous else {}
+        changed: Set[int] = {
+            mep_id for mep_id, row in rows.items()
+            if mep_id not in old_meps or old_meps[mep_id].row != row
+        }
+        removed = set(old_meps) - set(rows)
+
+        # Bounds: recomputed for the indicators whose values changed
+        bounds: Dict[str, Dict] = {}
+        moved = []
+        for indicator in scorer.activity_indicators:
+            field = INDICATOR_FIELDS.get(indicator, indicator)
+            old_bounds = previous.bounds.get(indicator) if previous else None
+            affected = old_bounds is None or bool(removed) or any(
+                mep_id not in old_meps or old_meps[mep_id].row[field] != rows[mep_id][field]
+                for mep_id in changed
+            )
+            if affected:
+                bounds[indicator] = scorer.outlier_scorer.indicator_bounds(
+                    scorer._indicator_values(snapshot, indicator), term, indicator)
+                if old_bounds is None or any(bounds[indicator][key] != old_bounds[key] for key in _BOUND_KEYS):
+                    moved.append(indicator)
+            else:
+                bounds[indicator] = old_bounds
+                scorer.outlier_scorer.outlier_stats[f"term_{term}_{indicator}"] = old_bounds['statistics']
+
+        rescore = set(rows) if moved else changed
+        if previous:
+            print(f"Term {term}: {len(changed)} changed and {len(removed)} removed MEPs, "
+                  f"bounds moved for {', '.join(moved) or 'no indicator'}; "
+                  f"rescoring {len(rescore)} of {len(meps_data)} MEPs")
+        else:
+            print(f"Scoring {len(meps_data)} MEPs for term {term}...")
+
+        outlier_data = {}
+        for indicator in scorer.activity_indicators:
+            field = INDICATOR_FIELDS.get(indicator, indicator)
+            outlier_data[indicator] = {
+                'all_values': None,
+                'outlier_stats': bounds[indicator]['statistics'],
+                'results_by_mep': {
+                    mep_id: scorer.outlier_scorer.score_value(float(rows[mep_id][field]), bounds[indicator])
+                    for mep_id in rescore
+                },
+            }
+
+        meps: Dict[int, _MepState] = {}
+        for mep in meps_data:
+            mep_id = mep['mep_id']
+            if mep_id in rescore:
+                meps[mep_id] = _MepState.scored(mep, scorer.score_mep_optimized(mep, term, outlier_data))
+            else:
+                meps[mep_id] = old_meps[mep_id]
+        self._states[term] = _TermState(bounds, meps)
+
+        # Rank exactly as a full run: snapshot order, stable sort by final score
+        results = [marshal.loads(mep.result) for mep in meps.values()]
+        results.sort(key=lambda x: x['final_score'], reverse=True)
+        for i, result in enumerate(results):
+            result['rank'] = i + 1
+
+        print(f"Completed scoring {len(results)} MEPs")
+        return results
@@ -4,239 +4,356 @@ Ingest Parltrack data into SQLite database for MEP ranking analysis.
 Creates tables for MEPs, activities, roles, and rankings in a SQLite database.
 """
 
+import argparse
 import json
 import sqlite3
 import re
+import shutil
+import time
 import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import os
 
-from file_utils import load_combined_dataset, load_json_auto
+from file_utils import (
+    file_fingerprint,
+    json_fingerprint,
+    load_combined_dataset,
+    load_json_auto,
+    resolve_json_path,
+    stream_combined_dataset,
+    stream_json_items,
+)
+from activity_items import (
+    CREATE_TABLE_SQL as ACTIVITY_ITEMS_TABLE_SQL,
+    INDEX_COLUMNS as ACTIVITY_ITEMS_INDEX_COLUMNS,
+    INDEX_NAME as ACTIVITY_ITEMS_INDEX,
+    INSERT_SQL as ACTIVITY_ITEM_INSERT_SQL,
+    item_rows,
+)
+from bulk_load import LOAD_PRAGMAS, STAGING_LOAD_PRAGMAS, BulkLoader, print_timings, timed_stage
+from mep_store import load_mep_records, load_mep_store, role_entries
+from role_summary import (
+    CREATE_TABLE_SQL as ROLE_SUMMARY_TABLE_SQL,
+    INTERVAL_INDEXES as ROLE_INTERVAL_INDEXES,
+    refresh_role_summary,
+)
+from score_cache import purge_score_cache
+from term_calendar import term_for_date
+from vote_matrix import MATRIX_DIR
 from vote_summary import Config as VoteSummaryConfig, VoteSummaryError, update_vote_summary
 
 RAW = Path("data/parltrack")
 DB = Path("data/meps.db")
+MEPS_FILE = RAW/"ep_meps.json.zst"
+VOTES_FILE = RAW/"ep_votes.json.zst"
+AMENDMENTS_FILE = RAW/"ep_amendments.json"
+AMENDMENTS_TERM_FILES = [RAW/f"ep_amendments_term{term}.json" for term in (8, 9, 10)]
+LIVE_ACTIVITIES_FILE = RAW/"ep_mep_activities.json"
 PARLTRACK_BACKUP = Path("data/parltrack backup")
 ACTIVITIES_8_TERM_FILE = Path("data/parltrack/8th term/ep_mep_activities-2019-07-03.json")
 ACTIVITIES_9_TERM_FILE = Path("data/parltrack/9th term/ep_mep_activities-2024-07-02.json")
 
-if not os.path.exists(os.path.dirname(DB)):
-    os.makedirs(os.path.dirname(DB))
-
-# Connect to SQLite database
-conn = sqlite3.connect(DB)
-c = conn.cursor()
-
-# Create tables if they don't exist
-c.execute('''
-CREATE TABLE IF NOT EXISTS meps (
-    mep_id INTEGER PRIMARY KEY,
-    full_name TEXT,
-    surname TEXT,
-    family_name TEXT,
-    gender TEXT,
-    birth_date TEXT,
-    birth_place TEXT,
-    death_date TEXT,
-    country TEXT,
-    current_party TEXT,
-    current_party_group TEXT,
-    current_party_group_id TEXT,
-    photo_url TEXT,
-    twitter_url TEXT,
-    facebook_url TEXT,
-    instagram_url TEXT,
-    homepage_url TEXT,
-    email TEXT,
-    brussels_office TEXT,
-    brussels_phone TEXT,
-    strasbourg_office TEXT,
-    strasbourg_phone TEXT,
-    cv_summary TEXT
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS activities (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    mep_id INTEGER,
-    term INTEGER,
-    speeches INTEGER DEFAULT 0,
-    reports_rapporteur INTEGER DEFAULT 0,
-    reports_shadow INTEGER DEFAULT 0,
-    amendments INTEGER DEFAULT 0,
-    questions_written INTEGER DEFAULT 0,
-    questions_oral INTEGER DEFAULT 0,
-    questions_major INTEGER DEFAULT 0,
-    motions INTEGER DEFAULT 0,
-    motions_individual INTEGER DEFAULT 0,
-    opinions_rapporteur INTEGER DEFAULT 0,
-    opinions_shadow INTEGER DEFAULT 0,
-    declarations INTEGER DEFAULT 0,
-    explanations INTEGER DEFAULT 0,
-    FOREIGN KEY (mep_id) REFERENCES meps(mep_id)
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS roles (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    mep_id INTEGER,
-    term INTEGER,
-    role_type TEXT,           -- 'committee', 'delegation', 'staff', or 'ep'
-    organization TEXT,        -- Full name of committee/delegation/etc
-    organization_abbr TEXT,   -- Abbreviation (e.g. BUDG, AFET)
-    role TEXT,               -- Member, Chair, Vice-Chair, etc
-    start_date TEXT,
-    end_date TEXT,
-    FOREIGN KEY (mep_id) REFERENCES meps(mep_id)
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS rankings (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    mep_id INTEGER,
-    term INTEGER,
-    total_score REAL,
-    FOREIGN KEY (mep_id) REFERENCES meps(mep_id),
-    UNIQUE(mep_id, term)
-)
-''')
+# Connection the ingest writes through, opened by open_database().
+conn = None
+c = None
+db_path = None
+
+def open_database(path=DB):
+    """Connect the module to the database at ``path`` and create any missing tables."""
+    global conn, c, db_path
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    db_path = path
+
+    # Create tables if they don't exist
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS meps (
+        mep_id INTEGER PRIMARY KEY,
+        full_name TEXT,
+        surname TEXT,
+        family_name TEXT,
+        gender TEXT,
+        birth_date TEXT,
+        birth_place TEXT,
+        death_date TEXT,
+        country TEXT,
+        current_party TEXT,
+        current_party_group TEXT,
+        current_party_group_id TEXT,
+        photo_url TEXT,
+        twitter_url TEXT,
+        facebook_url TEXT,
+        instagram_url TEXT,
+        homepage_url TEXT,
+        email TEXT,
+        brussels_office TEXT,
+        brussels_phone TEXT,
+        strasbourg_office TEXT,
+        strasbourg_phone TEXT,
+        cv_summary TEXT
+    )
+    ''')
+
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS activities (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mep_id INTEGER,
+        term INTEGER,
+        speeches INTEGER DEFAULT 0,
+        reports_rapporteur INTEGER DEFAULT 0,
+        reports_shadow INTEGER DEFAULT 0,
+        amendments INTEGER DEFAULT 0,
+        questions_written INTEGER DEFAULT 0,
+        questions_oral INTEGER DEFAULT 0,
+        questions_major INTEGER DEFAULT 0,
+        motions INTEGER DEFAULT 0,
+        motions_individual INTEGER DEFAULT 0,
+        opinions_rapporteur INTEGER DEFAULT 0,
+        opinions_shadow INTEGER DEFAULT 0,
+        declarations INTEGER DEFAULT 0,
+        explanations INTEGER DEFAULT 0,
+        FOREIGN KEY (mep_id) REFERENCES meps(mep_id)
+    )
+    ''')
+
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS roles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mep_id INTEGER,
+        term INTEGER,
+        role_type TEXT,           -- 'committee', 'delegation', 'staff', or 'ep'
+        organization TEXT,        -- Full name of committee/delegation/etc
+        organization_abbr TEXT,   -- Abbreviation (e.g. BUDG, AFET)
+        role TEXT,               -- Member, Chair, Vice-Chair, etc
+        start_date TEXT,
+        end_date TEXT,
+        FOREIGN KEY (mep_id) REFERENCES meps(mep_id)
+    )
+    ''')
+
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS rankings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mep_id INTEGER,
+        term INTEGER,
+        total_score REAL,
+        FOREIGN KEY (mep_id) REFERENCES meps(mep_id),
+        UNIQUE(mep_id, term)
+    )
+    ''')
+
+    # Bookkeeping for --incremental runs: what every source looked like at the
+    # last ingest, and the per-source activity counts it produced.
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS ingest_sources (
+        source TEXT PRIMARY KEY,
+        signature TEXT,           -- file names, sizes and mtimes (cheap change check)
+        fingerprint TEXT,         -- content hash of the source files
+        updated_at TEXT
+    )
+    ''')
+
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS mep_fingerprints (
+        mep_id INTEGER PRIMARY KEY,
+        fingerprint TEXT
+    )
+    ''')
+
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS activity_source_counts (
+        source TEXT,
+        mep_id INTEGER,
+        term INTEGER,
+        counts TEXT,              -- JSON object of activity counts
+        PRIMARY KEY (source, mep_id, term)
+    )
+    ''')
+
+    # One row per ep_mep_activities item, for the profile detail endpoints.
+    c.execute(ACTIVITY_ITEMS_TABLE_SQL)
+    # Per-term role counts and days held, derived from roles.
+    c.execute(ROLE_SUMMARY_TABLE_SQL)
+    conn.commit()
 
 def get_term_for_date(date_str):
-    """Determine EP term based on date."""
-    try:
-        date = dt.datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        
-        if dt.datetime(2009, 7, 14) <= date < dt.datetime(2014, 7, 1):
-            return 7
-        elif dt.datetime(2014, 7, 1) <= date < dt.datetime(2019, 7, 2):
-            return 8
-        elif dt.datetime(2019, 7, 2) <= date < dt.datetime(2024, 7, 16):
-            return 9
-        elif dt.datetime(2024, 7, 16) <= date:
-            return 10
-    except Exception:
-        pass
-    
-    return None
-
-def populate_meps_table():
-    """Populate the meps table with detailed MEP information."""
+    """Determine EP term based on date (see term_calendar.TERM_STARTS)."""
+    return term_for_date(date_str)
+
+MEP_INSERT_SQL = """
+    INSERT INTO meps (
+        mep_id, full_name, surname, family_name, gender,
+        birth_date, birth_place, death_date,
+        country, current_party, current_party_group, current_party_group_id,
+        photo_url, twitter_url, facebook_url, instagram_url, homepage_url,
+        email, brussels_office, brussels_phone,
+        strasbourg_office, strasbourg_phone, cv_summary
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ROLE_INSERT_SQL = """
+    INSERT INTO roles (mep_id, term, role_type, organization, organization_abbr, role, start_date, end_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ACTIVITY_INSERT_SQL = """
+    INSERT INTO activities (
+        mep_id, term, speeches, reports_rapporteur, reports_shadow,
+        amendments, questions_written, questions_oral, questions_major,
+        motions, motions_individual, opinions_rapporteur, opinions_shadow,
+        declarations, explanations
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def mep_row(mep):
+    """Build the meps table row for one ep_meps record (raises on malformed records)."""
+    # Basic info
+    mep_id = mep["UserID"]
+    
+    # Name components
+    name = mep.get("Name", {})
+    full_name = name.get("full", "Unknown")
+    surname = name.get("sur")
+    family_name = name.get("family")
+    
+    # Personal info
+    gender = mep.get("Gender")
+    birth = mep.get("Birth", {})
+    birth_date = birth.get("date")
+    birth_place = birth.get("place")
+    death_date = mep.get("Death")
+    
+    # Get current constituency info
+    constituencies = mep.get("Constituencies", [])
+    current_constituency = sorted(constituencies, key=lambda x: x.get("end", "9999"), reverse=True)[0] if constituencies else {}
+    country = current_constituency.get("country")
+    current_party = current_constituency.get("party")
+    
+    # Get current group info
+    groups = mep.get("Groups", [])
+    current_group = sorted(groups, key=lambda x: x.get("end", "9999"), reverse=True)[0] if groups else {}
+    current_party_group = current_group.get("Organization")
+    current_party_group_id = current_group.get("groupid")
+    
+    # URLs and contact info
+    photo_url = mep.get("Photo")
+    twitter_urls = mep.get("Twitter", [])
+    twitter_url = twitter_urls[0] if twitter_urls else None
+    facebook_urls = mep.get("Facebook", [])
+    facebook_url = facebook_urls[0] if facebook_urls else None
+    instagram_urls = mep.get("Instagram", [])
+    instagram_url = instagram_urls[0] if instagram_urls else None
+    homepage_urls = mep.get("Homepage", [])
+    homepage_url = homepage_urls[0] if homepage_urls else None
+    
+    # Email
+    emails = mep.get("Mail", [])
+    email = emails[0] if emails else None
+    
+    # Office info
+    addresses = mep.get("Addresses", {})
+    brussels = addresses.get("Brussels", {})
+    brussels_addr = brussels.get("Address", {})
+    brussels_office = brussels_addr.get("Office")
+    brussels_phone = brussels.get("Phone")
+    
+    strasbourg = addresses.get("Strasbourg", {})
+    strasbourg_addr = strasbourg.get("Address", {})
+    strasbourg_office = strasbourg_addr.get("Office")
+    strasbourg_phone = strasbourg.get("Phone")
+    
+    # CV summary (first few entries)
+    cv_entries = mep.get("CV", [])
+    cv_summary = "; ".join(cv_entries[:3]) if isinstance(cv_entries, list) else None
+    
+    return (
+        mep_id, full_name, surname, family_name, gender,
+        birth_date, birth_place, death_date,
+        country, current_party, current_party_group, current_party_group_id,
+        photo_url, twitter_url, facebook_url, instagram_url, homepage_url,
+        email, brussels_office, brussels_phone,
+        strasbourg_office, strasbourg_phone, cv_summary
+    )
+
+def insert_mep(mep):
+    """Insert one ep_meps record into the meps table (raises on malformed records)."""
+    c.execute(MEP_INSERT_SQL, mep_row(mep))
+
+def group_mep_records(meps_data):
+    """Group ep_meps records by UserID, keeping file order (the dump may repeat an ID)."""
+    records = {}
+    for mep in meps_data:
+        mep_id = mep.get("UserID") if isinstance(mep, dict) else None
+        if mep_id:
+            records.setdefault(mep_id, []).append(mep)
+    return records
+
+def store_mep_fingerprints(fingerprints):
+    """Replace the stored per-MEP record fingerprints."""
+    c.execute("DELETE FROM mep_fingerprints")
+    c.executemany("INSERT INTO mep_fingerprints (mep_id, fingerprint) VALUES (?, ?)", fingerprints.items())
+
+def populate_meps_table(loader=None, meps_data=None):
+    """Populate the meps table with detailed MEP information.
+
+    Rows go through ``loader`` (a BulkLoader) when given, otherwise they are
+    inserted and committed one by one. ``meps_data`` are the decoded ep_meps
+    records, read from MEPS_FILE when not given.
+    """
     print("Populating MEPs table...")
     
     # Load MEP data
-    meps_data = load_json_auto(RAW/"ep_meps.json.zst")
+    if meps_data is None:
+        meps_data = load_mep_records(MEPS_FILE)
     if not meps_data:
         print("Failed to load MEP data")
         return
     
     # Clear existing data
     c.execute("DELETE FROM meps")
+    store_mep_fingerprints({
+        mep_id: json_fingerprint(records) for mep_id, records in group_mep_records(meps_data).items()
+    })
     
     # Process each MEP
     for mep in meps_data:
         try:
-            # Basic info
-            mep_id = mep["UserID"]
-            
-            # Name components
-            name = mep.get("Name", {})
-            full_name = name.get("full", "Unknown")
-            surname = name.get("sur")
-            family_name = name.get("family")
-            
-            # Personal info
-            gender = mep.get("Gender")
-            birth = mep.get("Birth", {})
-            birth_date = birth.get("date")
-            birth_place = birth.get("place")
-            death_date = mep.get("Death")
-            
-            # Get current constituency info
-            constituencies = mep.get("Constituencies", [])
-            current_constituency = sorted(constituencies, key=lambda x: x.get("end", "9999"), reverse=True)[0] if constituencies else {}
-            country = current_constituency.get("country")
-            current_party = current_constituency.get("party")
-            
-            # Get current group info
-            groups = mep.get("Groups", [])
-            current_group = sorted(groups, key=lambda x: x.get("end", "9999"), reverse=True)[0] if groups else {}
-            current_party_group = current_group.get("Organization")
-            current_party_group_id = current_group.get("groupid")
-            
-            # URLs and contact info
-            photo_url = mep.get("Photo")
-            twitter_urls = mep.get("Twitter", [])
-            twitter_url = twitter_urls[0] if twitter_urls else None
-            facebook_urls = mep.get("Facebook", [])
-            facebook_url = facebook_urls[0] if facebook_urls else None
-            instagram_urls = mep.get("Instagram", [])
-            instagram_url = instagram_urls[0] if instagram_urls else None
-            homepage_urls = mep.get("Homepage", [])
-            homepage_url = homepage_urls[0] if homepage_urls else None
-            
-            # Email
-            emails = mep.get("Mail", [])
-            email = emails[0] if emails else None
-            
-            # Office info
-            addresses = mep.get("Addresses", {})
-            brussels = addresses.get("Brussels", {})
-            brussels_addr = brussels.get("Address", {})
-            brussels_office = brussels_addr.get("Office")
-            brussels_phone = brussels.get("Phone")
-            
-            strasbourg = addresses.get("Strasbourg", {})
-            strasbourg_addr = strasbourg.get("Address", {})
-            strasbourg_office = strasbourg_addr.get("Office")
-            strasbourg_phone = strasbourg.get("Phone")
-            
-            # CV summary (first few entries)
-            cv_entries = mep.get("CV", [])
-            cv_summary = "; ".join(cv_entries[:3]) if isinstance(cv_entries, list) else None
-            
-            # Insert into database
-            c.execute("""
-                INSERT INTO meps (
-                    mep_id, full_name, surname, family_name, gender,
-                    birth_date, birth_place, death_date,
-                    country, current_party, current_party_group, current_party_group_id,
-                    photo_url, twitter_url, facebook_url, instagram_url, homepage_url,
-                    email, brussels_office, brussels_phone,
-                    strasbourg_office, strasbourg_phone, cv_summary
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                mep_id, full_name, surname, family_name, gender,
-                birth_date, birth_place, death_date,
-                country, current_party, current_party_group, current_party_group_id,
-                photo_url, twitter_url, facebook_url, instagram_url, homepage_url,
-                email, brussels_office, brussels_phone,
-                strasbourg_office, strasbourg_phone, cv_summary
-            ))
-            
+            if loader is None:
+                insert_mep(mep)
+            else:
+                loader.add(MEP_INSERT_SQL, mep_row(mep))
         except Exception as e:
             print(f"Error processing MEP {mep.get('UserID', 'unknown')}: {e}")
             continue
     
-    conn.commit()
+    if loader is None:
+        conn.commit()
+    else:
+        loader.flush()
     print(f"Added {c.execute('SELECT COUNT(*) FROM meps').fetchone()[0]} MEPs to the database")
 
-def count_amendments_activity():
-    """Process amendments data to count amendments per MEP per term."""
+def count_amendments_activity(stream=False):
+    """Process amendments data to count amendments per MEP per term.
+
+    With ``stream=True`` the dump is parsed record by record instead of being
+    loaded into memory in one piece; the resulting counts are identical.
+    """
     print("Processing amendments data...")
     activity_counts = {}  # (mep_id, term) -> {"amendments": count}
     
-    amendments_data = load_combined_dataset(
-        RAW / "ep_amendments.json",
-        [RAW / f"ep_amendments_term{term}.json" for term in (8, 9, 10)],
-    )
-    if not amendments_data:
-        print("No amendments data available")
-        return activity_counts
-    
-    print(f"Processing {len(amendments_data)} amendments...")
+    if stream:
+        amendments_data = stream_combined_dataset(AMENDMENTS_FILE, AMENDMENTS_TERM_FILES)
+        print("Streaming amendments...")
+    else:
+        amendments_data = load_combined_dataset(AMENDMENTS_FILE, AMENDMENTS_TERM_FILES)
+        if not amendments_data:
+            print("No amendments data available")
+            return activity_counts
+        
+        print(f"Processing {len(amendments_data)} amendments...")
     processed_amendment_count = 0
 
     for i, amendment in enumerate(amendments_data):
@@ -289,18 +406,22 @@ def count_amendments_activity():
                 break
     return activity_counts
 
-def count_reports_activity():
+def count_reports_activity(stream=False):
     """Process votes data to count reports (rapporteur and shadow) per MEP per term."""
     print("Processing votes data for reports...")
     activity_counts = {}  # (mep_id, term) -> {"reports_rapporteur": count, "reports_shadow": count}
     
     # Load votes data
-    votes_data = load_json_auto(RAW/"ep_votes.json.zst")
-    if not votes_data:
-        print("No votes data available")
-        return activity_counts
-    
-    print(f"Processing {len(votes_data)} votes...")
+    if stream:
+        votes_data = stream_json_items(VOTES_FILE)
+        print("Streaming votes...")
+    else:
+        votes_data = load_json_auto(VOTES_FILE)
+        if not votes_data:
+            print("No votes data available")
+            return activity_counts
+        
+        print(f"Processing {len(votes_data)} votes...")
     
     # Process votes
     for vote in votes_data:
@@ -488,56 +609,51 @@ def process_mep_activities(mep_activities):
     
     return activity_counts
 
-def count_other_activities():
-    """Process other activities (speeches, questions, motions, opinions) per MEP per term."""
-    print("Processing other activities...")
-    activity_counts = {}  # (mep_id, term) -> activity counts
-    
-    # Load MEP activities data
-    activities_data_10_source = load_json_auto(RAW/"ep_mep_activities.json")
-    activities_data_8_source = load_json_auto(ACTIVITIES_8_TERM_FILE)
-    activities_data_9_source = load_json_auto(ACTIVITIES_9_TERM_FILE)
-
-    # Start with the definitive data for terms 8 and 9 from backup files.
-    all_mep_activities = []
-    if activities_data_8_source:
-        all_mep_activities.extend(activities_data_8_source)
-    if activities_data_9_source:
-        all_mep_activities.extend(activities_data_9_source)
-
-    # Process the live data, but only extract term 10 activities to avoid overwriting the correct 8/9 data.
-    if activities_data_10_source:
-        term10_mep_activities = []
-        for mep_activity_bundle in activities_data_10_source:
-            term10_mep_bundle = {'mep_id': mep_activity_bundle.get('mep_id')}
-            has_term10_activity = False
-
-            for activity_type, activities in mep_activity_bundle.items():
-                if activity_type == 'mep_id' or not isinstance(activities, list):
-                    continue
-                
-                term10_filtered_activities = [
-                    activity for activity in activities 
-                    if isinstance(activity, dict) and activity.get('term') == 10
-                ]
-                
-                if term10_filtered_activities:
-                    term10_mep_bundle[activity_type] = term10_filtered_activities
-                    has_term10_activity = True
-            
-            if has_term10_activity:
-                term10_mep_activities.append(term10_mep_bundle)
-        
-        all_mep_activities.extend(term10_mep_activities)
+def term10_bundle(mep_activity_bundle):
+    """Reduce a live ep_mep_activities bundle to its term 10 activities (None if it has none)."""
+    term10_mep_bundle = {'mep_id': mep_activity_bundle.get('mep_id')}
+    has_term10_activity = False
 
-    if not all_mep_activities:
-        print("No MEP activities data available")
-        return activity_counts
-    
-    print(f"Processing activities for {len(all_mep_activities)} MEPs...")
+    for activity_type, activities in mep_activity_bundle.items():
+        if activity_type == 'mep_id' or not isinstance(activities, list):
+            continue
+        
+        term10_filtered_activities = [
+            activity for activity in activities 
+            if isinstance(activity, dict) and activity.get('term') == 10
+        ]
+        
+        if term10_filtered_activities:
+            term10_mep_bundle[activity_type] = term10_filtered_activities
+            has_term10_activity = True
     
+    return term10_mep_bundle if has_term10_activity else None
+
+def count_mep_activity_file(path, live=False, stream=False):
+    """Count activities from one ep_mep_activities dump.
+
+    ``live`` marks the current ParlTrack dump, of which only the term 10
+    part is used. Later bundles replace earlier counts for the same
+    (mep_id, term).
+    """
+    activity_counts = {}  # (mep_id, term) -> activity counts
+
+    if stream:
+        bundles = stream_json_items(path)
+        print(f"Streaming MEP activities from {path}...")
+    else:
+        bundles = load_json_auto(path)
+        if not bundles:
+            print(f"No MEP activities data in {path}")
+            return activity_counts
+        print(f"Processing activities for {len(bundles)} MEPs from {path}...")
+
+    if live:
+        # Only extract term 10 activities to avoid overwriting the correct 8/9 data.
+        bundles = filter(None, map(term10_bundle, bundles))
+
     # Process each MEP's activities
-    for mep_activities in all_mep_activities:
+    for mep_activities in bundles:
         try:
             mep_counts = process_mep_activities(mep_activities)
             activity_counts.update(mep_counts)
@@ -547,6 +663,75 @@ def count_other_activities():
     
     return activity_counts
 
+def count_other_activities(stream=False):
+    """Process other activities (speeches, questions, motions, opinions) per MEP per term.
+
+    Start with the definitive data for terms 8 and 9 from the backup files,
+    then the term 10 part of the live data. Counts from a later file replace
+    earlier ones for the same (mep_id, term).
+    """
+    print("Processing other activities...")
+    activity_counts = {}  # (mep_id, term) -> activity counts
+    for source in MEP_ACTIVITY_SOURCES:
+        activity_counts.update(count_activity_source(source, stream))
+    return activity_counts
+
+# Independent activity sources, in merge order. Each one can be aggregated on
+# its own (see count_activity_source) and only meets the others in
+# merge_source_counts.
+MEP_ACTIVITY_SOURCES = ("activities_8", "activities_9", "activities_10")
+ACTIVITY_SOURCES = ("amendments", "reports") + MEP_ACTIVITY_SOURCES
+
+# ep_mep_activities source -> (dump, whether it is the live dump)
+MEP_ACTIVITY_FILES = {
+    "activities_8": (ACTIVITIES_8_TERM_FILE, False),
+    "activities_9": (ACTIVITIES_9_TERM_FILE, False),
+    "activities_10": (LIVE_ACTIVITIES_FILE, True),
+}
+
+def count_activity_source(source, stream=False):
+    """Aggregate the partial (mep_id, term) counts of a single source.
+
+    Module-level so it can run in a worker process.
+    """
+    if source == "amendments":
+        return count_amendments_activity(stream)
+    if source == "reports":
+        return count_reports_activity(stream)
+    if source in MEP_ACTIVITY_FILES:
+        path, live = MEP_ACTIVITY_FILES[source]
+        return count_mep_activity_file(path, live=live, stream=stream)
+    raise ValueError(f"Unknown activity source: {source}")
+
+def collect_activity_counts(stream=False, workers=1, sources=ACTIVITY_SOURCES):
+    """Aggregate the given activity sources, optionally one worker process per source.
+
+    Returns a ``{source: counts}`` dict of partial counts, ready for
+    merge_source_counts. The result does not depend on ``workers``.
+    """
+    if workers > 1 and len(sources) > 1:
+        print(f"Aggregating {len(sources)} activity sources with {workers} worker processes...")
+        with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as pool:
+            futures = {source: pool.submit(count_activity_source, source, stream) for source in sources}
+            return {source: future.result() for source, future in futures.items()}
+    return {source: count_activity_source(source, stream) for source in sources}
+
+def merge_source_counts(partials):
+    """Combine per-source partial counts into per-(mep_id, term) activity totals.
+
+    The ep_mep_activities sources replace each other in MEP_ACTIVITY_SOURCES
+    order; amendments and reports are added on top. Sources missing from
+    ``partials`` count as empty.
+    """
+    other_activities_counts = {}
+    for source in MEP_ACTIVITY_SOURCES:
+        other_activities_counts.update(partials.get(source, {}))
+    return merge_activity_counts(
+        partials.get("amendments", {}),
+        partials.get("reports", {}),
+        other_activities_counts
+    )
+
 def merge_activity_counts(*counts_list):
     """Merge multiple activity count dictionaries."""
     merged = {}
@@ -573,23 +758,17 @@ def merge_activity_counts(*counts_list):
                     merged[key][activity_type] += count
     return merged
 
-def populate_activities_table():
+def populate_activities_table(stream=False, workers=1, loader=None):
     """Populate the activities table with aggregated counts from various sources."""
     print("Populating activities table...")
     
     # Count activities from different sources
-    amendments_counts = count_amendments_activity()
-    reports_counts = count_reports_activity()
-    other_activities_counts = count_other_activities()
+    partials = collect_activity_counts(stream, workers)
+    for source, counts in partials.items():
+        store_source_counts(source, counts)
     
     # Merge all activity counts
-    # Ensure merge_activity_counts can handle cases where some dicts might be empty
-    # or not have all MEPs.
-    all_activities = merge_activity_counts(
-        amendments_counts if amendments_counts else {}, 
-        reports_counts if reports_counts else {}, 
-        other_activities_counts if other_activities_counts else {}
-    )
+    all_activities = merge_source_counts(partials)
 
     if not all_activities:
         print("No activity data to populate. Exiting populate_activities_table.")
@@ -598,8 +777,41 @@ def populate_activities_table():
     print(f"DEBUG: Merged activities for {len(all_activities)} MEP-term combinations.")
     # Clear existing data
     c.execute("DELETE FROM activities")
-    
-    # Insert data
+    if loader is None:
+        insert_activity_rows(all_activities)
+        conn.commit()
+    else:
+        bulk_insert_activity_rows(all_activities, loader)
+    print(f"Populated activities table with {c.execute('SELECT COUNT(*) FROM activities').fetchone()[0]} records.")
+
+def activity_row(mep_id, term, counts):
+    """Build the activities table row for one (mep_id, term)."""
+    return (
+        mep_id, term,
+        counts.get("speeches", 0),
+        counts.get("reports_rapporteur", 0),
+        counts.get("reports_shadow", 0),
+        counts.get("amendments", 0),
+        counts.get("questions_written", 0),
+        counts.get("questions_oral", 0),
+        counts.get("questions_major", 0),
+        counts.get("motions", 0),
+        counts.get("motions_individual", 0),
+        counts.get("opinions_rapporteur", 0),
+        counts.get("opinions_shadow", 0),
+        counts.get("declarations", 0),
+        counts.get("explanations", 0)
+    )
+
+def bulk_insert_activity_rows(all_activities, loader):
+    """Bulk counterpart of insert_activity_rows: one meps scan instead of a probe per row."""
+    known_meps = {row[0] for row in c.execute("SELECT mep_id FROM meps")}
+    for (mep_id, term), counts in all_activities.items():
+        if mep_id in known_meps and term is not None:
+            loader.add(ACTIVITY_INSERT_SQL, activity_row(mep_id, term, counts))
+
+def insert_activity_rows(all_activities):
+    """Insert merged activity counts, skipping MEPs that are not in the meps table."""
     for (mep_id, term), counts in all_activities.items():
         try:
             # Ensure mep_id exists in meps table
@@ -616,40 +828,135 @@ def populate_activities_table():
             if counts.get("amendments", 0) > 0:
                 print(f"DEBUG populate_activities_table: MEP {mep_id}, Term {term}, Amendments: {counts.get('amendments', 0)}")
 
-            c.execute("""
-                INSERT INTO activities (
-                    mep_id, term, speeches, reports_rapporteur, reports_shadow,
-                    amendments, questions_written, questions_oral, questions_major,
-                    motions, motions_individual, opinions_rapporteur, opinions_shadow,
-                    declarations, explanations
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                mep_id, term,
-                counts.get("speeches", 0),
-                counts.get("reports_rapporteur", 0),
-                counts.get("reports_shadow", 0),
-                counts.get("amendments", 0),
-                counts.get("questions_written", 0),
-                counts.get("questions_oral", 0),
-                counts.get("questions_major", 0),
-                counts.get("motions", 0),
-                counts.get("motions_individual", 0),
-                counts.get("opinions_rapporteur", 0),
-                counts.get("opinions_shadow", 0),
-                counts.get("declarations", 0),
-                counts.get("explanations", 0)
-            ))
+            c.execute(ACTIVITY_INSERT_SQL, activity_row(mep_id, term, counts))
         except Exception as e:
             # print(f"Error inserting activities for MEP {mep_id}, Term {term}: {e}")
             continue
-            
-    conn.commit()
-    print(f"Populated activities table with {c.execute('SELECT COUNT(*) FROM activities').fetchone()[0]} records.")
 
-def populate_roles_table():
-    """Populate the roles table with MEP roles in committees, delegations, etc."""
+def activity_item_owners():
+    """Map every (mep_id, term) to the ep_mep_activities source its counts come from."""
+    c.execute("SELECT source, mep_id, term FROM activity_source_counts")
+    rows = [row for row in c.fetchall() if row[0] in MEP_ACTIVITY_SOURCES]
+    # Later sources replace earlier ones, as in merge_source_counts.
+    rows.sort(key=lambda row: MEP_ACTIVITY_SOURCES.index(row[0]))
+    return {(mep_id, term): source for source, mep_id, term in rows}
+
+def populate_activity_items(keys=None, loader=None):
+    """Populate the activity_items table from the ep_mep_activities dumps.
+
+    Every (mep_id, term) takes its items from the source its counts come
+    from, so the detail lists always add up to the activities table.
+    ``keys`` limits the rewrite to those pairs; by default the whole table is
+    rebuilt. The dumps are always streamed, as only one bundle is needed at a
+    time.
+    """
+    print("Populating activity items...")
+    owners = activity_item_owners()
+    if keys is None:
+        c.execute("DELETE FROM activity_items")
+        keys = owners.keys()
+    else:
+        c.executemany("DELETE FROM activity_items WHERE mep_id = ? AND term = ?", list(keys))
+    known_meps = {row[0] for row in c.execute("SELECT mep_id FROM meps")}
+    wanted = {key: owners[key] for key in keys if key in owners and key[0] in known_meps}
+
+    items_added = 0
+    for source in MEP_ACTIVITY_SOURCES:
+        if source not in wanted.values():
+            continue
+        path, live = MEP_ACTIVITY_FILES[source]
+        written = set()
+        for bundle in stream_json_items(path):
+            if not isinstance(bundle, dict):
+                continue
+            bundle_rows = {}
+            for row in item_rows(bundle):
+                key = (row[0], row[1])
+                if (live and row[1] != 10) or wanted.get(key) != source:
+                    continue
+                bundle_rows.setdefault(key, []).append(row)
+            for key, rows in bundle_rows.items():
+                if key in written:
+                    # A later bundle of the same MEP replaces the earlier one, like its counts do.
+                    if loader is not None:
+                        loader.flush()
+                    c.execute("DELETE FROM activity_items WHERE mep_id = ? AND term = ?", key)
+                written.add(key)
+                if loader is None:
+                    c.executemany(ACTIVITY_ITEM_INSERT_SQL, rows)
+                else:
+                    for row in rows:
+                        loader.add(ACTIVITY_ITEM_INSERT_SQL, row)
+                items_added += len(rows)
+
+    if loader is None:
+        conn.commit()
+    else:
+        loader.flush()
+    print(f"Added {items_added} activity items for {len(wanted)} MEP-term combinations.")
+
+def mep_role_rows(mep):
+    """Build the roles table rows (committees, delegations, staff, group offices) of one ep_meps record."""
+    mep_id = mep.get("UserID")
+    if not mep_id:
+        return []
+
+    rows = []
+
+    # Helper to collect a role
+    def add_role(role_type, org, org_abbr, role_title, start, end):
+        term = get_term_for_date(start) if start else None
+        if not term and end:
+            term = get_term_for_date(end)
+        
+        if term is None:
+            return
+
+        # Standardize EP leadership roles before inserting
+        normalized_role_title = role_title
+        current_role_type = role_type
+
+        if org == "European Parliament": # Check if the organization is the EP itself
+            # print(f"DEBUG Potential EP Leadership: MEP {mep_id}, Org: {org}, Role: {role_title}, Start: {start}")
+            if "president" in role_title.lower() and "vice" not in role_title.lower() and "committee" not in role_title.lower() and "delegation" not in role_title.lower(): # More specific
+                normalized_role_title = "President"
+                current_role_type = "ep"
+                print(f"DEBUG Normalized to EP President: MEP {mep_id}, Original Role: {role_title}")
+            elif ("vice-president" in role_title.lower() or "vice president" in role_title.lower()) and "committee" not in role_title.lower() and "delegation" not in role_title.lower(): # More specific
+                normalized_role_title = "Vice-President"
+                current_role_type = "ep"
+                print(f"DEBUG Normalized to EP Vice-President: MEP {mep_id}, Original Role: {role_title}")
+            elif "quaestor" in role_title.lower() and "committee" not in role_title.lower() and "delegation" not in role_title.lower(): # Ensure it's not a committee/delegation quaestor if such a thing exists
+                normalized_role_title = "Quaestor"
+                current_role_type = "ep"
+                print(f"DEBUG Normalized to EP Quaestor: MEP {mep_id}, Original Role: {role_title}")
+
+        rows.append((mep_id, term, current_role_type, org, org_abbr, normalized_role_title, start, end))
+
+    for entry in role_entries(mep):
+        add_role(*entry)
+
+    return rows
+
+def insert_mep_roles(mep):
+    """Insert the roles of one ep_meps record; returns the number of roles added."""
+    roles_added_count = 0
+    for row in mep_role_rows(mep):
+        try:
+            c.execute(ROLE_INSERT_SQL, row)
+            roles_added_count += 1
+        except Exception as e:
+            pass
+    return roles_added_count
+
+def populate_roles_table(loader=None, meps_data=None):
+    """Populate the roles table with MEP roles in committees, delegations, etc.
+
+    ``meps_data`` are the decoded ep_meps records, read from MEPS_FILE when not given.
+    """
     print("Populating roles table...")
-    meps_data = load_json_auto(RAW/"ep_meps.json.zst")
+    if meps_data is None:
+        meps_data = load_mep_records(MEPS_FILE)
     if not meps_data:
         print("Failed to load MEP data for roles")
         return
@@ -665,237 +972,600 @@ def populate_roles_table():
         # You can also print the full first MEP entry if needed, but it might be large
         # print(f"DEBUG: First MEP entry full data: {json.dumps(first_mep_entry, indent=2)}")
 
+    if loader is not None:
+        # Write other tables' queued rows first so only roles are counted below.
+        loader.flush()
+        written_before = loader.rows_written
     for mep in meps_data:
-        mep_id = mep.get("UserID")
-        if not mep_id:
+        if loader is None:
+            roles_added_count += insert_mep_roles(mep)
             continue
+        for row in mep_role_rows(mep):
+            loader.add(ROLE_INSERT_SQL, row)
 
-        # Helper to insert role
-        def insert_role(role_type, org, org_abbr, role_title, start, end):
-            nonlocal roles_added_count
-            term = get_term_for_date(start) if start else None
-            if not term and end:
-                term = get_term_for_date(end)
-            
-            if term is None:
-                return
-
-            # Standardize EP leadership roles before inserting
-            normalized_role_title = role_title
-            current_role_type = role_type
-
-            if org == "European Parliament": # Check if the organization is the EP itself
-                # print(f"DEBUG Potential EP Leadership: MEP {mep_id}, Org: {org}, Role: {role_title}, Start: {start}")
-                if "president" in role_title.lower() and "vice" not in role_title.lower() and "committee" not in role_title.lower() and "delegation" not in role_title.lower(): # More specific
-                    normalized_role_title = "President"
-                    current_role_type = "ep"
-                    print(f"DEBUG Normalized to EP President: MEP {mep_id}, Original Role: {role_title}")
-                elif ("vice-president" in role_title.lower() or "vice president" in role_title.lower()) and "committee" not in role_title.lower() and "delegation" not in role_title.lower(): # More specific
-                    normalized_role_title = "Vice-President"
-                    current_role_type = "ep"
-                    print(f"DEBUG Normalized to EP Vice-President: MEP {mep_id}, Original Role: {role_title}")
-                elif "quaestor" in role_title.lower() and "committee" not in role_title.lower() and "delegation" not in role_title.lower(): # Ensure it's not a committee/delegation quaestor if such a thing exists
-                    normalized_role_title = "Quaestor"
-                    current_role_type = "ep"
-                    print(f"DEBUG Normalized to EP Quaestor: MEP {mep_id}, Original Role: {role_title}")
+    if loader is None:
+        conn.commit()
+    else:
+        # Count written rows, not queued ones: a row that fails on its own is skipped.
+        loader.flush()
+        roles_added_count = loader.rows_written - written_before
+    print(f"Added {roles_added_count} roles for MEPs to the database")
 
-            try:
-                c.execute("""
-                    INSERT INTO roles (mep_id, term, role_type, organization, organization_abbr, role, start_date, end_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (mep_id, term, current_role_type, org, org_abbr, normalized_role_title, start, end))
-                roles_added_count += 1
-            except Exception as e:
-                pass
-
-        # Constituencies (Term information primarily)
-        # for constituency in mep.get("Constituencies", []):
-            # start = constituency.get("start")
-            # end = constituency.get("end")
-            # insert_role('constituency', constituency.get("country"), constituency.get("name"), "MEP", start, end)
-
-        # Groups and their Offices (potential source of EP leadership roles)
-        if "Groups" in mep:
-            for group in mep["Groups"]:
-                group_org = group.get("Organization")
-                group_abbr = group.get("groupid") # Using groupid as abbr
-                group_start = group.get("start")
-                group_end = group.get("end")
-                # Insert the general group membership
-                # insert_role('group', group_org, group_abbr, "Member", group_start, group_end)
-                print(f"DEBUG Processing Group for MEP {mep_id}: Org='{group_org}', Abbr='{group_abbr}', Start='{group_start}'")
-
-                if "Offices" in group:
-                    for office in group["Offices"]:
-                        office_title = office.get("Office")
-                        office_org = group_org # Office is within the group
-                        office_org_abbr = group_abbr
-                        # If Office Body is European Parliament, it might be an EP leadership role
-                        if office.get("Body") == "European Parliament":
-                            office_org = "European Parliament"
-                            office_org_abbr = "EP"
-                            print(f"DEBUG EP Office Found: MEP {mep_id}, Office Title: {office_title}, Body: {office.get('Body')}")
-                        
-                        # Fallback for office title if not present
-                        if not office_title:
-                            office_title = office.get("Function", "Unknown Office") # Use Function as fallback
-
-                        office_start = office.get("start", group_start) # Inherit start from group if not specified
-                        office_end = office.get("end", group_end) # Inherit end from group if not specified
-                        print(f"DEBUG ==> Office/Function within Group '{group_org}': Title='{office_title}', OrgBody='{office.get('Body')}', Start='{office_start}'")
-                        insert_role('group_office', office_org, office_org_abbr, office_title, office_start, office_end)
-
-        # EP Functions (Original check - now superseded by checking Offices within Groups like "European Parliament")
-        # if "EPFunctions" in mep: # This key was not found in data
-        #    ... (old code commented out or removed)
-
-        # Committees
-        if "Committees" in mep:
-            for committee in mep["Committees"]:
-                org = committee.get("Organization")
-                org_abbr = committee.get("abbr")
-                role_title = committee.get("role")
-                start = committee.get("start")
-                end = committee.get("end")
-                insert_role('committee', org, org_abbr, role_title, start, end)
-
-        # Delegations
-        if "Delegations" in mep:
-            for delegation in mep["Delegations"]:
-                org = delegation.get("Organization")
-                org_abbr = delegation.get("abbr")
-                role_title = delegation.get("role")
-                start = delegation.get("start")
-                end = delegation.get("end")
-                insert_role('delegation', org, org_abbr, role_title, start, end)
-
-        # Staff
-        if "Staff" in mep:
-            for staff in mep["Staff"]:
-                org = staff.get("Organization")
-                org_abbr = staff.get("abbr")
-                role_title = staff.get("role")
-                start = staff.get("start")
-                end = staff.get("end")
-                insert_role('staff', org, org_abbr, role_title, start, end)
+# Ranking weights. Activity weights apply to the activities columns of the same
+# name; role weights to each roles row with a matching (role_type, role), i.e.
+# to the role_summary count of that role.
+ACTIVITY_WEIGHTS = {
+    "speeches": 1,
+    "reports_rapporteur": 5,
+    "reports_shadow": 3,
+    "amendments": 1,
+    "questions_written": 1,
+    "questions_oral": 1,
+    "questions_major": 2,
+    "motions": 2,
+    "motions_individual": 2,
+    "opinions_rapporteur": 3,
+    "opinions_shadow": 2,
+    "declarations": 1,
+    "explanations": 1
+}
 
-    conn.commit()
-    print(f"Added {roles_added_count} roles for MEPs to the database")
+ROLE_WEIGHTS = {
+    ("committee", "Chair"): 10,
+    ("committee", "Vice-Chair"): 7,
+    ("committee", "Member"): 5,
+    ("committee", "Substitute"): 3,
+    ("delegation", "Chair"): 8,
+    ("delegation", "Vice-Chair"): 6,
+    ("delegation", "Member"): 4,
+    ("delegation", "Substitute"): 2,
+    ("ep", "President"): 15,  # EP leadership roles
+    ("ep", "Vice-President"): 12,
+    ("ep", "Quaestor"): 10
+}
 
-def calculate_rankings():
-    """Calculate and store rankings based on activity and role data."""
+RANKED_TERMS = (8, 9, 10)
+
+def calculate_rankings(mep_ids=None, activity_weights=ACTIVITY_WEIGHTS, role_weights=ROLE_WEIGHTS):
+    """Calculate and store rankings based on activity and role data.
+
+    Every (mep_id, term) with activities or roles in a ranked term gets the
+    weighted sum of its activity counts (first activities row of the pair)
+    plus the weights of its roles (read from role_summary), all in a single
+    INSERT ... SELECT.
+    ``mep_ids`` limits the recalculation to those MEPs; by default every
+    ranking is rebuilt.
+    """
     print("Calculating rankings...")
     
     # First, clear existing rankings to avoid duplicates
-    c.execute("DELETE FROM rankings")
-    conn.commit()
-    
-    # Define weights for activities and roles
-    activity_weights = {
-        "speeches": 1,
-        "reports_rapporteur": 5,
-        "reports_shadow": 3,
-        "amendments": 1,
-        "questions_written": 1,
-        "questions_oral": 1,
-        "questions_major": 2,
-        "motions": 2,
-        "motions_individual": 2,
-        "opinions_rapporteur": 3,
-        "opinions_shadow": 2,
-        "declarations": 1,
-        "explanations": 1
-    }
-    
-    role_weights = {
-        "committee_chair": 10,
-        "committee_vice_chair": 7,
-        "committee_member": 5,
-        "committee_substitute": 3,
-        "delegation_chair": 8,
-        "delegation_vice_chair": 6,
-        "delegation_member": 4,
-        "delegation_substitute": 2,
-        "ep_president": 15,  # EP leadership roles
-        "ep_vice_president": 12,
-        "ep_quaestor": 10
-    }
-    
-    # Get all MEPs with activities or roles
-    c.execute("SELECT DISTINCT mep_id FROM activities UNION SELECT DISTINCT mep_id FROM roles")
-    mep_ids = [row[0] for row in c.fetchall()]
-    
-    for mep_id in mep_ids:
-        for term in (8, 9, 10):
-            # Get activity data
-            c.execute("SELECT * FROM activities WHERE mep_id = ? AND term = ?", (mep_id, term))
-            activity_row = c.fetchone()
-            
-            # Get role data
-            c.execute("SELECT * FROM roles WHERE mep_id = ? AND term = ?", (mep_id, term))
-            role_row = c.fetchone()
-            
-            if not activity_row and not role_row:
-                continue
-            
-            # Calculate weighted score
-            total_score = 0
-            
-            if activity_row:
-                # Activities columns start at index 3 (after id, mep_id, term)
-                for i, activity in enumerate(activity_weights.keys()):
-                    if activity_row[i+3] is not None:  # Check for NULL values
-                        try:
-                            total_score += int(activity_row[i+3]) * activity_weights[activity]
-                        except (ValueError, TypeError):
-                            print(f"Warning: Invalid value for {activity} for MEP {mep_id}")
-            
-            if role_row:
-                # Get role counts from the roles table
-                c.execute("""
-                    SELECT 
-                        COUNT(*) FILTER (WHERE role = 'Chair' AND role_type = 'committee') as committee_chair,
-                        COUNT(*) FILTER (WHERE role = 'Vice-Chair' AND role_type = 'committee') as committee_vice_chair,
-                        COUNT(*) FILTER (WHERE role = 'Member' AND role_type = 'committee') as committee_member,
-                        COUNT(*) FILTER (WHERE role = 'Substitute' AND role_type = 'committee') as committee_substitute,
-                        COUNT(*) FILTER (WHERE role = 'Chair' AND role_type = 'delegation') as delegation_chair,
-                        COUNT(*) FILTER (WHERE role = 'Vice-Chair' AND role_type = 'delegation') as delegation_vice_chair,
-                        COUNT(*) FILTER (WHERE role = 'Member' AND role_type = 'delegation') as delegation_member,
-                        COUNT(*) FILTER (WHERE role = 'Substitute' AND role_type = 'delegation') as delegation_substitute,
-                        COUNT(*) FILTER (WHERE role = 'President' AND role_type = 'ep') as ep_president,
-                        COUNT(*) FILTER (WHERE role = 'Vice-President' AND role_type = 'ep') as ep_vice_president,
-                        COUNT(*) FILTER (WHERE role = 'Quaestor' AND role_type = 'ep') as ep_quaestor
-                    FROM roles 
-                    WHERE mep_id = ? AND term = ?
-                """, (mep_id, term))
-                role_counts = c.fetchone()
-                
-                if role_counts:
-                    for i, role in enumerate(role_weights.keys()):
-                        if role_counts[i] is not None:
-                            total_score += int(role_counts[i]) * role_weights[role]
-            
-            # Insert ranking
-            c.execute(
-                "INSERT INTO rankings (mep_id, term, total_score) VALUES (?, ?, ?)",
-                (mep_id, term, total_score)
-            )
+    if mep_ids is None:
+        c.execute("DELETE FROM rankings")
+        scope = ""
+    else:
+        c.execute("CREATE TEMP TABLE IF NOT EXISTS ranking_scope (mep_id PRIMARY KEY)")
+        c.execute("DELETE FROM ranking_scope")
+        c.executemany("INSERT OR IGNORE INTO ranking_scope (mep_id) VALUES (?)", [(mep_id,) for mep_id in mep_ids])
+        c.execute("DELETE FROM rankings WHERE mep_id IN (SELECT mep_id FROM ranking_scope)")
+        scope = "AND mep_id IN (SELECT mep_id FROM ranking_scope)"
+
+    terms = ", ".join(str(int(term)) for term in RANKED_TERMS)
+    activity_score = " + ".join(f"CAST(COALESCE(a.{column}, 0) AS INTEGER) * ?" for column in activity_weights) or "0"
+    role_values = ", ".join("(?, ?, ?)" for _ in role_weights) or "(NULL, NULL, 0)"
+    params = [value for (role_type, role), weight in role_weights.items() for value in (role_type, role, weight)]
+    params += list(activity_weights.values())
+
+    c.execute(f"""
+        INSERT INTO rankings (mep_id, term, total_score)
+        WITH role_weights (role_type, role, weight) AS (
+            VALUES {role_values}
+        ),
+        first_activity AS (
+            SELECT MIN(id) AS id FROM activities
+            WHERE mep_id IS NOT NULL AND term IN ({terms}) {scope}
+            GROUP BY mep_id, term
+        ),
+        scores AS (
+            SELECT a.mep_id, a.term, {activity_score} AS score
+            FROM first_activity f JOIN activities a ON a.id = f.id
+            UNION ALL
+            SELECT r.mep_id, r.term, r.count * COALESCE(w.weight, 0)
+            FROM role_summary r LEFT JOIN role_weights w ON w.role_type = r.role_type AND w.role = r.role
+            WHERE r.term IN ({terms}) {scope.replace("mep_id", "r.mep_id", 1)}
+        )
+        SELECT mep_id, term, SUM(score)
+        FROM scores
+        GROUP BY mep_id, term
+        ORDER BY mep_id, term
+    """, params)
     
     conn.commit()
     print(f"Added rankings for {c.execute('SELECT COUNT(DISTINCT mep_id) FROM rankings').fetchone()[0]} MEPs")
 
-def main():
-    print("Starting Parltrack data ingest...")
-    populate_meps_table()
-    populate_activities_table()
-    populate_roles_table()
+# --- Incremental ingest -------------------------------------------------
+#
+# A full run records a fingerprint for every source dump (ingest_sources), for
+# every MEP record (mep_fingerprints) and the partial counts each activity
+# source produced (activity_source_counts). An --incremental run compares the
+# dumps against that state, re-aggregates only the sources that changed and
+# rewrites only the (mep_id, term) rows whose merged counts can differ.
+
+INGEST_SOURCES = ("meps",) + ACTIVITY_SOURCES + ("vote_summary",)
+
+# Per-MEP lookups used by calculate_rankings and the incremental upserts.
+# Bulk loads drop them and build them once the tables are filled.
+LOOKUP_INDEXES = (
+    ("idx_activities_mep_term", "activities (mep_id, term)"),
+    ("idx_roles_mep_term", "roles (mep_id, term)"),
+    (ACTIVITY_ITEMS_INDEX, ACTIVITY_ITEMS_INDEX_COLUMNS),
+) + ROLE_INTERVAL_INDEXES
+
+def source_files(source):
+    """Return the existing dump files a source is read from, in read order."""
+    if source == "amendments":
+        primary = resolve_json_path(AMENDMENTS_FILE)
+        if primary.exists():
+            return [primary]
+        candidates = AMENDMENTS_TERM_FILES
+    else:
+        candidates = {
+            "meps": [MEPS_FILE],
+            "reports": [VOTES_FILE],
+            "activities_8": [ACTIVITIES_8_TERM_FILE],
+            "activities_9": [ACTIVITIES_9_TERM_FILE],
+            "activities_10": [LIVE_ACTIVITIES_FILE],
+            "vote_summary": [VoteSummaryConfig().votes_file],
+        }[source]
+    resolved = [resolve_json_path(path) for path in candidates]
+    return [path for path in resolved if path.exists()]
+
+def source_fingerprint(source, recorded=None):
+    """Return the (signature, fingerprint) pair describing a source's current dumps.
+
+    The content hash is only recomputed when the size/mtime signature differs
+    from the ``recorded`` pair of the previous run.
+    """
+    paths = source_files(source)
+    signature = json.dumps([[str(path), path.stat().st_size, path.stat().st_mtime_ns] for path in paths])
+    if recorded and recorded[0] == signature:
+        return recorded
+    return signature, json_fingerprint([[path.name, file_fingerprint(path)] for path in paths])
+
+def load_source_state():
+    """Return the recorded ``{source: (signature, fingerprint)}`` of the last ingest."""
+    c.execute("SELECT source, signature, fingerprint FROM ingest_sources")
+    return {source: (signature, fingerprint) for source, signature, fingerprint in c.fetchall()}
+
+def record_source_state(fingerprints):
+    """Store source fingerprints once the data derived from them is in the database."""
+    updated_at = dt.datetime.now().isoformat(timespec="seconds")
+    c.executemany(
+        "INSERT OR REPLACE INTO ingest_sources (source, signature, fingerprint, updated_at) VALUES (?, ?, ?, ?)",
+        [(source, signature, fingerprint, updated_at) for source, (signature, fingerprint) in fingerprints.items()]
+    )
+    conn.commit()
+
+def store_source_counts(source, counts):
+    """Replace the stored partial counts of one activity source.
+
+    Returns the (mep_id, term) keys whose counts were added, changed or removed.
+    """
+    c.execute("SELECT mep_id, term, counts FROM activity_source_counts WHERE source = ?", (source,))
+    previous = {(mep_id, term): stored for mep_id, term, stored in c.fetchall()}
+    current = {key: json.dumps(value, sort_keys=True) for key, value in counts.items()}
+
+    c.execute("DELETE FROM activity_source_counts WHERE source = ?", (source,))
+    c.executemany(
+        "INSERT OR REPLACE INTO activity_source_counts (source, mep_id, term, counts) VALUES (?, ?, ?, ?)",
+        [(source, mep_id, term, encoded) for (mep_id, term), encoded in current.items()]
+    )
+    return {key for key in previous.keys() | current.keys() if previous.get(key) != current.get(key)}
+
+def load_source_counts(keys):
+    """Load the stored partial counts of every source for the given (mep_id, term) keys."""
+    partials = {source: {} for source in ACTIVITY_SOURCES}
+    c.execute("SELECT source, mep_id, term, counts FROM activity_source_counts")
+    for source, mep_id, term, encoded in c.fetchall():
+        if (mep_id, term) in keys and source in partials:
+            partials[source][(mep_id, term)] = json.loads(encoded)
+    return partials
+
+def sync_meps_table(meps_data):
+    """Re-insert the meps and roles rows of MEPs whose ep_meps records changed.
+
+    ``meps_data`` are the decoded ep_meps records. Returns the sets of
+    changed, newly added and removed MEP IDs.
+    """
+    print("Syncing MEPs table...")
+    if not meps_data:
+        print("Failed to load MEP data")
+        return set(), set(), set()
+
+    records = group_mep_records(meps_data)
+    fingerprints = {mep_id: json_fingerprint(mep_records) for mep_id, mep_records in records.items()}
+    recorded = dict(c.execute("SELECT mep_id, fingerprint FROM mep_fingerprints").fetchall())
+    present = {row[0] for row in c.execute("SELECT mep_id FROM meps").fetchall()}
+
+    changed = {mep_id for mep_id, fingerprint in fingerprints.items() if recorded.get(mep_id) != fingerprint}
+    removed = recorded.keys() - fingerprints.keys()
+
+    for mep_id in changed | removed:
+        c.execute("DELETE FROM meps WHERE mep_id = ?", (mep_id,))
+        c.execute("DELETE FROM roles WHERE mep_id = ?", (mep_id,))
+        c.execute("DELETE FROM mep_fingerprints WHERE mep_id = ?", (mep_id,))
+    for mep_id in removed:
+        c.execute("DELETE FROM activities WHERE mep_id = ?", (mep_id,))
+        c.execute("DELETE FROM activity_items WHERE mep_id = ?", (mep_id,))
+        c.execute("DELETE FROM rankings WHERE mep_id = ?", (mep_id,))
+
+    roles_added_count = 0
+    for mep_id in changed:
+        for mep in records[mep_id]:
+            try:
+                insert_mep(mep)
+            except Exception as e:
+                print(f"Error processing MEP {mep_id}: {e}")
+            roles_added_count += insert_mep_roles(mep)
+        c.execute("INSERT INTO mep_fingerprints (mep_id, fingerprint) VALUES (?, ?)", (mep_id, fingerprints[mep_id]))
+
+    conn.commit()
+    now_present = {row[0] for row in c.execute("SELECT mep_id FROM meps").fetchall()}
+    added = (changed & now_present) - present
+    print(f"Re-ingested {len(changed)} changed MEPs ({len(added)} new, {roles_added_count} roles), removed {len(removed)}")
+    return changed, added, removed
+
+def upsert_activities(keys):
+    """Rewrite the activities rows of the given (mep_id, term) keys from the stored partial counts."""
+    all_activities = merge_source_counts(load_source_counts(keys))
+    c.executemany("DELETE FROM activities WHERE mep_id = ? AND term = ?", list(keys))
+    insert_activity_rows(all_activities)
+    conn.commit()
+    print(f"Updated activities for {len(keys)} MEP-term combinations.")
+
+def refresh_vote_summary(workers=1):
+    """Rebuild the vote attendance summary; returns False when it could not be updated.
+
+    On a staging database a failure aborts the run instead: the staged file
+    may have no vote tables at all, and it must not replace the live one.
+    """
+    config = VoteSummaryConfig(db_path=db_path, workers=workers, matrix_dir=vote_matrix_dir())
     try:
-        inserted_rows, term_rows = update_vote_summary(VoteSummaryConfig())
+        inserted_rows, term_rows = update_vote_summary(config)
         print(f"Vote attendance summary updated ({inserted_rows} rows across {term_rows} terms).")
+        return True
     except VoteSummaryError as exc:
+        if building_staging():
+            raise IngestValidationError(f"vote summary could not be built: {exc}") from exc
         print(f"WARNING: vote summary not updated: {exc}")
-    calculate_rankings()
-    print("Ingest complete!")
+        return False
+
+def update_role_summary(mep_ids=None):
+    """Rebuild the role_summary rows of ``mep_ids`` (every MEP by default)."""
+    written = refresh_role_summary(c, mep_ids)
+    conn.commit()
+    print(f"Summarised roles into {written} role_summary rows.")
+
+def drop_lookup_indexes():
+    for name, _ in LOOKUP_INDEXES:
+        c.execute(f"DROP INDEX IF EXISTS {name}")
+
+def create_lookup_indexes():
+    for name, columns in LOOKUP_INDEXES:
+        c.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}")
+    conn.commit()
+
+def run_full_ingest(stream=False, workers=1, bulk=True):
+    """Rebuild every table from scratch and record the state for later incremental runs.
+
+    By default meps, activities and roles are bulk-loaded in one transaction
+    with the lookup indexes dropped until the load is done; ``bulk=False``
+    keeps the original row-by-row writers.
+    """
+    timings = {}
+    # Forget the previous state first so an interrupted run is never mistaken for a complete one.
+    c.execute("DELETE FROM ingest_sources")
+    conn.commit()
+    with timed_stage(timings, "fingerprints"):
+        fingerprints = {source: source_fingerprint(source) for source in INGEST_SOURCES}
+
+    # The ep_meps dump is decoded once and only kept while the meps, roles and
+    # MEP store are built from it, so it is released before the activity
+    # dumps are read.
+    with timed_stage(timings, "meps_dump"):
+        meps_data = load_mep_records(MEPS_FILE)
+    if bulk:
+        # The unsafe journal/sync settings are only acceptable on a staging file.
+        pragmas = STAGING_LOAD_PRAGMAS if building_staging() else LOAD_PRAGMAS
+        with BulkLoader(conn, pragmas=pragmas) as loader:
+            drop_lookup_indexes()
+            with timed_stage(timings, "meps"):
+                populate_meps_table(loader, meps_data)
+            with timed_stage(timings, "roles"):
+                populate_roles_table(loader, meps_data)
+            with timed_stage(timings, "mep_store"):
+                # Persist the compact MEP metadata while the dump is decoded anyway,
+                # so build_term_dataset does not have to decode it again.
+                load_mep_store(MEPS_FILE, records=meps_data)
+            meps_data = None
+            with timed_stage(timings, "activities"):
+                populate_activities_table(stream=stream, workers=workers, loader=loader)
+            with timed_stage(timings, "activity_items"):
+                populate_activity_items(loader=loader)
+    else:
+        with timed_stage(timings, "meps"):
+            populate_meps_table(meps_data=meps_data)
+        with timed_stage(timings, "roles"):
+            populate_roles_table(meps_data=meps_data)
+        with timed_stage(timings, "mep_store"):
+            load_mep_store(MEPS_FILE, records=meps_data)
+        meps_data = None
+        with timed_stage(timings, "activities"):
+            populate_activities_table(stream=stream, workers=workers)
+        with timed_stage(timings, "activity_items"):
+            populate_activity_items()
+    with timed_stage(timings, "indexes"):
+        create_lookup_indexes()
+    with timed_stage(timings, "role_summary"):
+        update_role_summary()
+
+    with timed_stage(timings, "vote_summary"):
+        if not refresh_vote_summary(workers):
+            del fingerprints["vote_summary"]
+    with timed_stage(timings, "rankings"):
+        calculate_rankings()
+    record_source_state(fingerprints)
+    print_timings(timings)
+
+def run_incremental_ingest(stream=False, workers=1):
+    """Re-ingest only the sources and MEPs that changed since the last recorded run.
+
+    Returns False, without touching the database, when no previous state is recorded.
+    """
+    recorded = load_source_state()
+    if "meps" not in recorded:
+        return False
+
+    fingerprints = {source: source_fingerprint(source, recorded.get(source)) for source in INGEST_SOURCES}
+    changed_sources = [source for source in INGEST_SOURCES if recorded.get(source) is None or recorded[source][1] != fingerprints[source][1]]
+    print(f"Changed sources: {', '.join(changed_sources) if changed_sources else 'none'}")
+
+    affected_meps = set()
+    affected_keys = set()
+    if "meps" in changed_sources:
+        meps_data = load_mep_records(MEPS_FILE)
+        changed_meps, added_meps, removed_meps = sync_meps_table(meps_data)
+        load_mep_store(MEPS_FILE, records=meps_data)
+        meps_data = None  # release the decoded dump before the activity dumps are read
+        affected_meps |= changed_meps | removed_meps
+        if added_meps:
+            # Their activities were skipped while they were missing from the meps table.
+            c.execute("SELECT DISTINCT mep_id, term FROM activity_source_counts")
+            affected_keys |= {(mep_id, term) for mep_id, term in c.fetchall() if mep_id in added_meps}
+
+    activity_sources = tuple(source for source in ACTIVITY_SOURCES if source in changed_sources)
+    if activity_sources:
+        partials = collect_activity_counts(stream, workers, sources=activity_sources)
+        for source, counts in partials.items():
+            affected_keys |= store_source_counts(source, counts)
+    if affected_keys:
+        upsert_activities(affected_keys)
+        affected_meps |= {mep_id for mep_id, _ in affected_keys}
+
+    # Item lists can change without their counts changing: rewrite every pair
+    # served by a changed dump (or everything, if the table was never filled).
+    item_sources = [source for source in MEP_ACTIVITY_SOURCES if source in changed_sources]
+    if c.execute("SELECT 1 FROM activity_items LIMIT 1").fetchone() is None:
+        populate_activity_items()
+    elif item_sources or affected_keys:
+        item_keys = set(affected_keys)
+        item_keys |= {key for key, source in activity_item_owners().items() if source in item_sources}
+        populate_activity_items(item_keys)
+    create_lookup_indexes()
+    if c.execute("SELECT 1 FROM role_summary LIMIT 1").fetchone() is None:
+        update_role_summary()
+    elif "meps" in changed_sources:
+        update_role_summary(changed_meps | removed_meps)
+
+    if "vote_summary" in changed_sources and not refresh_vote_summary(workers):
+        del fingerprints["vote_summary"]
+    if affected_meps:
+        calculate_rankings(affected_meps)
+    record_source_state(fingerprints)
+    return True
+
+# --- Atomic (staging database) ingest -----------------------------------
+#
+# With --atomic the ingest never touches the live database: it writes a
+# staging copy next to it, validates the result and renames it over the live
+# file. Readers open a new connection per request, so they keep seeing the
+# old snapshot until the rename and the new one right after it. The roll-call
+# matrices of the run go to a staging directory next to MATRIX_DIR and are
+# moved into place right after the database, file by file.
+
+class IngestValidationError(RuntimeError):
+    """Raised when a staged database is not fit to replace the live one."""
+
+class StagingSwapError(RuntimeError):
+    """Raised when a validated staging database cannot be renamed over the live one."""
+
+# Tables that must be filled, and the smallest fraction of the live row count
+# they may shrink to before the swap is refused (guards against truncated dumps).
+VALIDATED_TABLES = (
+    "meps", "activities", "activity_items", "roles", "role_summary", "rankings",
+    "mep_vote_summary", "term_vote_totals",
+)
+MIN_ROW_RATIO = 0.5
+
+def staging_path(live=DB):
+    return live.with_name(live.name + ".staging")
+
+def building_staging():
+    """True while the module writes into a staging database (ingest --atomic)."""
+    return db_path is not None and db_path.name.endswith(".staging")
+
+def vote_matrix_dir():
+    """Where this run writes the roll-call matrices: MATRIX_DIR, or its staging twin."""
+    return staging_path(MATRIX_DIR) if building_staging() else MATRIX_DIR
+
+def discard_staging(live=DB):
+    """Remove the staging database and staging matrices of an aborted run."""
+    staging = staging_path(live)
+    for leftover in (staging, staging.with_name(staging.name + "-journal")):
+        if leftover.exists():
+            leftover.unlink()
+    shutil.rmtree(staging_path(MATRIX_DIR), ignore_errors=True)
+
+def promote_vote_matrices():
+    """Move the staged roll-call matrices into MATRIX_DIR, each term's sidecar last."""
+    staged = staging_path(MATRIX_DIR)
+    if not staged.is_dir():
+        return
+    MATRIX_DIR.mkdir(parents=True, exist_ok=True)
+    files = sorted(staged.iterdir(), key=lambda path: (path.name.endswith(".index.json"), path.name))
+    for path in files:
+        os.replace(path, MATRIX_DIR / path.name)
+    shutil.rmtree(staged, ignore_errors=True)
+
+def prepare_staging_database(live=DB, copy_live=False):
+    """Create a fresh staging database, seeded with a snapshot of the live one if requested."""
+    staging = staging_path(live)
+    discard_staging(live)
+    if copy_live and live.exists():
+        # The backup API takes a consistent snapshot even while readers are active.
+        source = sqlite3.connect(live)
+        target = sqlite3.connect(staging)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+    return staging
+
+def row_counts(connection):
+    counts = {}
+    for table in VALIDATED_TABLES:
+        try:
+            counts[table] = connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        except sqlite3.Error:
+            counts[table] = 0
+    return counts
+
+def validate_staging_database(live=DB):
+    """Check the staged database through the open connection before it may replace ``live``."""
+    result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    if result != "ok":
+        raise IngestValidationError(f"integrity check failed: {result}")
+
+    staged = row_counts(conn)
+    empty = [table for table, count in staged.items() if count == 0]
+    if empty:
+        raise IngestValidationError(f"empty tables: {', '.join(empty)}")
+
+    if live.exists():
+        live_conn = sqlite3.connect(live)
+        try:
+            current = row_counts(live_conn)
+        finally:
+            live_conn.close()
+        for table, count in staged.items():
+            if count < current[table] * MIN_ROW_RATIO:
+                raise IngestValidationError(
+                    f"{table} would shrink from {current[table]} to {count} rows"
+                )
+    print(f"Staging database validated: {', '.join(f'{t}={n}' for t, n in staged.items())}")
+
+# On Windows a file cannot be replaced while another process (serve.py,
+# averages_api.py) holds it open, so the rename is retried for a while.
+SWAP_ATTEMPTS = 10
+SWAP_RETRY_DELAY = 1.0  # seconds
+
+def swap_in_staging_database(live=DB):
+    """Close the staging database and atomically rename it over the live one.
+
+    Raises StagingSwapError, after removing the staging file, when the
+    live database stays locked by other processes.
+    """
+    staging = staging_path(live)
+    # A self-contained file: no WAL or rollback journal may be left behind.
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        try:
+            os.replace(staging, live)
+            break
+        except PermissionError as exc:
+            if attempt == SWAP_ATTEMPTS:
+                discard_staging(live)
+                raise StagingSwapError(
+                    f"could not replace {live}, it is still open in another process "
+                    f"(stop serve.py / averages_api.py and rerun): {exc}"
+                ) from exc
+            time.sleep(SWAP_RETRY_DELAY)
+    print(f"Swapped {staging} into place as {live}")
+    promote_vote_matrices()
+    purge_score_cache(Path(live).parent / "derived" / "score_cache")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest ParlTrack dumps into the SQLite database.")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="parse the amendments, votes and activities dumps record by record "
+             "so peak memory stays bounded regardless of dump size",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes used to aggregate the activity sources "
+             "and the per-term vote dumps in parallel (0 = one per CPU core, default: 1)",
+    )
+    parser.add_argument(
+        "--row-by-row",
+        action="store_true",
+        help="use the original one-INSERT-per-row writers instead of the bulk loader "
+             "(for timing comparisons)",
+    )
+    parser.add_argument(
+        "--atomic",
+        action="store_true",
+        help="build into a staging copy of the database, validate it and atomically "
+             "replace the live database only if it passes",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-ingest the dumps and MEP records that changed since the last run "
+             "(falls back to a full ingest when no previous run is recorded)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be zero or positive")
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("Starting Parltrack data ingest...")
+    if args.atomic:
+        open_database(prepare_staging_database(DB, copy_live=args.incremental))
+        print(f"Building into staging database {db_path}")
+    else:
+        open_database(DB)
+    try:
+        if args.incremental and run_incremental_ingest(stream=args.stream, workers=args.workers):
+            print("Incremental ingest complete!")
+        else:
+            if args.incremental:
+                print("No previous ingest recorded, running a full ingest...")
+            run_full_ingest(stream=args.stream, workers=args.workers, bulk=not args.row_by_row)
+            print("Ingest complete!")
+    except IngestValidationError as exc:
+        conn.close()
+        discard_staging(DB)
+        print(f"ERROR: ingest aborted, {DB} left unchanged: {exc}")
+        return 1
     
     # Print some statistics
     c.execute("SELECT COUNT(*) FROM meps")
@@ -918,8 +1588,25 @@ def main():
     for row in c.fetchall():
         print(f"{row[1]} ({row[2]}, {row[3]}) - Score: {row[4]}")
     
+    if args.atomic:
+        try:
+            validate_staging_database(DB)
+        except IngestValidationError as exc:
+            conn.close()
+            discard_staging(DB)
+            print(f"ERROR: staging database rejected, {DB} left unchanged: {exc}")
+            return 1
+        try:
+            swap_in_staging_database(DB)
+        except StagingSwapError as exc:
+            print(f"ERROR: staging database not swapped in, {DB} left unchanged: {exc}")
+            return 1
+        return 0
+
     # Close DB connection
     conn.close()
+    purge_score_cache(DB.parent / "derived" / "score_cache")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -7,14 +7,17 @@ Engagement & Presence, and Institutional Roles
 Now using outlier-based logarithmic scoring (IQR method) for all activity indicators
 """
 
-import sqlite3
 import json
 import math
 from typing import Dict, List, Tuple, Optional
 try:
     from .outlier_based_scorer import OutlierBasedScorer
+    from .term_snapshot import TermSnapshot, load_term_snapshot
 except ImportError:
     from outlier_based_scorer import OutlierBasedScorer  # type: ignore
+    from term_snapshot import TermSnapshot, load_term_snapshot  # type: ignore
+
+METHODOLOGY = 'MEP Ranking (October 2017) with term-specific ranges'
 
 class MEPScoreScorer:
     def __init__(self, db_path: str = "data/meps.db"):
@@ -146,90 +149,13 @@ class MEPScoreScorer:
         }
         self.motions_ranges = [(5, 10, 1), (11, 20, 2), (21, 40, 3), (41, float('inf'), 4)]
     
+    def get_snapshot(self, term: int = 10) -> TermSnapshot:
+        """The term's input data, loaded once and reused until the database changes"""
+        return load_term_snapshot(self.db_path, term)
+    
     def get_mep_data(self, term: int = 10) -> List[Dict]:
-        """Get MEP data using optimized queries"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get total votes for this term
-        cursor.execute("""
-            SELECT votes_total
-            FROM term_vote_totals
-            WHERE term = ?
-        """, (term,))
-        total_votes_result = cursor.fetchone()
-        total_votes = total_votes_result[0] if total_votes_result else 0
-        
-        # Main query for MEP data and activities
-        query = """
-        SELECT 
-            m.mep_id, m.full_name, m.country, m.current_party_group, m.current_party,
-            a.speeches, a.reports_rapporteur, a.reports_shadow, 
-            a.amendments, a.questions_written, a.questions_oral, a.questions_major,
-            a.motions, a.motions_individual, a.opinions_rapporteur, a.opinions_shadow,
-            a.explanations, a.declarations,
-            COALESCE(va.votes_attended, 0) as votes_attended
-        FROM meps m
-        INNER JOIN activities a ON m.mep_id = a.mep_id
-            LEFT JOIN (
-                SELECT mep_id, votes_attended
-                FROM mep_vote_summary
-                WHERE term = ?
-            ) va ON m.mep_id = va.mep_id
-        WHERE a.term = ?
-        """
-        
-        cursor.execute(query, (term, term))
-        meps_data = {}
-        
-        for row in cursor.fetchall():
-            mep_id = row[0]
-            meps_data[mep_id] = {
-                'mep_id': mep_id,
-                'full_name': row[1] or 'Unknown',
-                'country': row[2] or 'Unknown',
-                'group': row[3] or 'Unknown',
-                'national_party': row[4] or 'Unknown',
-                'speeches': row[5] or 0,
-                'reports_rapporteur': row[6] or 0,
-                'reports_shadow': row[7] or 0,
-                'amendments': row[8] or 0,
-                'questions_written': row[9] or 0,
-                'questions_oral': row[10] or 0,
-                'questions_major': row[11] or 0,
-                'motions': (row[12] or 0) + (row[13] or 0),
-                'opinions_rapporteur': row[14] or 0,
-                'opinions_shadow': row[15] or 0,
-                'explanations': row[16] or 0,
-                'declarations': row[17] or 0,
-                'votes_attended': row[18] or 0,
-                'votes_total': 0,
-                'roles': []
-            }
-        
-        # Get all roles in one query
-        mep_ids = list(meps_data.keys())
-        if mep_ids:
-            placeholders = ','.join('?' * len(mep_ids))
-            cursor.execute(f"""
-                SELECT mep_id, role_type, role, organization
-                FROM roles 
-                WHERE mep_id IN ({placeholders}) AND term = ?
-            """, mep_ids + [term])
-            
-            for row in cursor.fetchall():
-                mep_id = row[0]
-                if mep_id in meps_data:
-                    meps_data[mep_id]['roles'].append({
-                        'type': row[1], 'role': row[2], 'org': row[3]
-                    })
-        
-        # Update votes_total for all MEPs
-        for mep_data in meps_data.values():
-            mep_data['votes_total'] = total_votes
-        
-        conn.close()
-        return list(meps_data.values())
+        """Get MEP data (copies of the term snapshot's rows)"""
+        return [dict(mep, roles=[dict(role) for role in mep['roles']]) for mep in self.get_snapshot(term).meps]
     
     def get_all_indicator_values(self, term: int, indicator: str) -> List[float]:
         """
@@ -242,8 +168,10 @@ class MEPScoreScorer:
         Returns:
             List of all MEP values for this indicator
         """
-        meps_data = self.get_mep_data(term)
-        
+        return self._indicator_values(self.get_snapshot(term), indicator)
+    
+    def _indicator_values(self, snapshot: TermSnapshot, indicator: str) -> List[float]:
+        """Values of one indicator for every MEP of the snapshot, in order"""
         # Map indicator to correct field name
         field_mapping = {
             'amendments': 'amendments',
@@ -254,14 +182,7 @@ class MEPScoreScorer:
             'motions': 'motions'
         }
         
-        field_name = field_mapping.get(indicator, indicator)
-        values = []
-        
-        for mep in meps_data:
-            value = mep.get(field_name, 0)
-            values.append(float(value) if value is not None else 0.0)
-        
-        return values
+        return snapshot.values(field_mapping.get(indicator, indicator))
     
     def calculate_outlier_based_scores(self, mep: Dict, term: int) -> Dict:
         """
@@ -761,16 +682,18 @@ class MEPScoreScorer:
             if mep_value is None:
                 mep_value = 0.0
             
-            # Use pre-calculated outlier data
-            all_values = outlier_data[indicator]['all_values']
-            
-            # Calculate outlier-based score
-            result = self.outlier_scorer.score_indicator_outlier_based(
-                all_values=all_values,
-                mep_value=float(mep_value),
-                term=term,
-                indicator=indicator
-            )
+            # Use pre-calculated outlier data: the vectorized results of the
+            # whole term when available, else score against the term's values
+            by_mep = outlier_data[indicator].get('results_by_mep')
+            if by_mep is not None and mep.get('mep_id') in by_mep:
+                result = by_mep[mep['mep_id']]
+            else:
+                result = self.outlier_scorer.score_indicator_outlier_based(
+                    all_values=outlier_data[indicator]['all_values'],
+                    mep_value=float(mep_value),
+                    term=term,
+                    indicator=indicator
+                )
             
             # Store score and metadata
             scores[f"{indicator}_score"] = result['score']
@@ -791,23 +714,28 @@ class MEPScoreScorer:
         # Calculate dynamic ranges based on term data before scoring
         self.calculate_dynamic_ranges(term)
         
-        meps_data = self.get_mep_data(term)
+        # One data snapshot for every scoring stage (the rows are read, never modified)
+        snapshot = self.get_snapshot(term)
+        meps_data = snapshot.meps
         
         if not meps_data:
             return []
         
         print(f"Scoring {len(meps_data)} MEPs for term {term}...")
         
-        # PRE-CALCULATE ALL OUTLIER STATISTICS ONCE (Performance optimization)
+        # PRE-CALCULATE ALL OUTLIER STATISTICS ONCE (Performance optimization):
+        # bounds once per indicator, then every MEP's value scored in one pass
         print("Pre-calculating outlier statistics for all indicators...")
         outlier_data = {}
         
         for indicator in self.activity_indicators:
             print(f"  Calculating outliers for {indicator}...")
-            all_values = self.get_all_indicator_values(term, indicator)
+            all_values = self._indicator_values(snapshot, indicator)
+            results = self.outlier_scorer.score_indicator_vector(all_values, all_values, term, indicator)
             outlier_data[indicator] = {
                 'all_values': all_values,
-                'outlier_stats': None  # Will be calculated by outlier_scorer when first used
+                'outlier_stats': self.outlier_scorer.outlier_stats[f"term_{term}_{indicator}"],
+                'results_by_mep': {mep['mep_id']: result for mep, result in zip(meps_data, results)}
             }
         
         # Score each MEP using pre-calculated outlier data
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Compact MEP metadata store built from the ParlTrack `ep_meps` dump.
+
+The ingest (meps and roles tables) and the term dataset builder all need the
+MEP dump, which takes seconds to decompress and parse. The ingest decodes it
+once with `load_mep_records` and hands the records to every step that needs
+them (including `load_mep_store`), then drops them. This module persists a
+compact per-MEP summary (name,
+country, latest group, party and role entries) next to the other derived
+data. The summary is keyed by the dump's fingerprint, so later runs skip
+decoding entirely until ParlTrack publishes a new dump.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import zstandard as zstd
+
+try:
+    from .file_utils import file_fingerprint, load_json_auto, resolve_json_path
+except ImportError:  # pragma: no cover
+    from file_utils import file_fingerprint, load_json_auto, resolve_json_path  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+MEPS_FILE = Path("data/parltrack/ep_meps.json.zst")
+STORE_FILE = Path("data/derived/mep_store.json.zst")
+STORE_VERSION = 1
+
+# resolved dump path -> (stat signature, compact store)
+_store_memo: dict[Path, tuple[list[int], dict]] = {}
+
+
+def _resolve(path: Path | str) -> tuple[Path, list[int]]:
+    resolved = resolve_json_path(path)
+    if not resolved.exists():
+        raise FileNotFoundError(f"MEP dump not found: {path}")
+    stat = resolved.stat()
+    return resolved, [stat.st_size, stat.st_mtime_ns]
+
+
+def load_mep_records(path: Path | str = MEPS_FILE) -> list:
+    """
+    Decode and return the raw ep_meps records.
+
+    Not memoised: the whole dump is large, so callers pass the result to
+    the steps that need it and release it when they are done.
+    """
+    resolved, _ = _resolve(path)
+    return load_json_auto(resolved)
+
+
+def role_entries(mep: dict) -> list[tuple]:
+    """
+    List the roles of one ep_meps record as
+    `(role_type, organization, abbreviation, title, start, end)` tuples.
+
+    Group offices held for the European Parliament itself are reported with
+    the EP as their organization. Term assignment and title normalization are
+    left to the caller.
+    """
+    entries = []
+
+    # Groups and their Offices (potential source of EP leadership roles)
+    for group in mep.get("Groups", []):
+        group_org = group.get("Organization")
+        group_abbr = group.get("groupid")  # Using groupid as abbr
+        group_start = group.get("start")
+        group_end = group.get("end")
+        for office in group.get("Offices", []):
+            office_title = office.get("Office")
+            office_org = group_org  # Office is within the group
+            office_org_abbr = group_abbr
+            if office.get("Body") == "European Parliament":
+                office_org = "European Parliament"
+                office_org_abbr = "EP"
+            if not office_title:
+                office_title = office.get("Function", "Unknown Office")
+            entries.append((
+                "group_office", office_org, office_org_abbr, office_title,
+                office.get("start", group_start), office.get("end", group_end),
+            ))
+
+    for key, role_type in (("Committees", "committee"), ("Delegations", "delegation"), ("Staff", "staff")):
+        for entry in mep.get(key, []):
+            entries.append((
+                role_type, entry.get("Organization"), entry.get("abbr"), entry.get("role"),
+                entry.get("start"), entry.get("end"),
+            ))
+    return entries
+
+
+def _most_recent(items: Any) -> dict | None:
+    """Return the dict entry with the latest `end` (open-ended first), or None if there is none."""
+    candidates = sorted(
+        [item for item in items if isinstance(item, dict)],
+        key=lambda x: x.get("end", "9999"),
+        reverse=True,
+    )
+    return candidates[0] if candidates else None
+
+
+def summarize_mep(mep: dict) -> dict:
+    """Reduce one ep_meps record to the fields the pipeline reads."""
+    constituency = _most_recent(mep.get("Constituencies", [])) or {}
+    groups = mep.get("Groups", [])
+    if not groups:
+        group = "Unknown"
+    else:
+        current_group = _most_recent(groups)
+        # None marks a record whose groups could not be read
+        group = current_group.get("Organization", "Unknown") if current_group is not None else None
+
+    return {
+        "name": mep.get("Name", {}).get("full", "Unknown"),
+        "country": constituency.get("country", "Unknown"),
+        "party": constituency.get("party"),
+        "group": group,
+        "roles": role_entries(mep),
+    }
+
+
+def _read_store(store_file: Path) -> dict | None:
+    if not store_file.exists():
+        return None
+    try:
+        with store_file.open("rb") as handle:
+            reader = zstd.ZstdDecompressor().stream_reader(handle)
+            return json.load(io.TextIOWrapper(reader, encoding="utf-8"))
+    except (OSError, ValueError, zstd.ZstdError) as exc:
+        logger.warning("Ignoring unreadable MEP store %s: %s", store_file, exc)
+        return None
+
+
+def _write_store(store_file: Path, payload: dict) -> None:
+    """Write the store atomically; a read-only data directory only costs the cache."""
+    tmp_file = store_file.with_name(store_file.name + ".tmp")
+    try:
+        store_file.parent.mkdir(parents=True, exist_ok=True)
+        encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        tmp_file.write_bytes(zstd.ZstdCompressor(level=10).compress(encoded))
+        os.replace(tmp_file, store_file)
+    except OSError as exc:
+        logger.warning("Could not persist MEP store to %s: %s", store_file, exc)
+
+
+def load_mep_store(
+    path: Path | str = MEPS_FILE, store_file: Path | str = STORE_FILE, records: list | None = None
+) -> dict[Any, dict]:
+    """
+    Return the compact metadata of every MEP, keyed by UserID.
+
+    Served from memory after the first call, then from `store_file` when it
+    was built from a dump with the same fingerprint, and only otherwise from
+    the dump (which also refreshes `store_file`): `records` when the caller
+    already decoded it, else by decoding it here.
+    """
+    resolved, signature = _resolve(path)
+    cached = _store_memo.get(resolved)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    store_file = Path(store_file)
+    persisted = _read_store(store_file)
+    fingerprint = None
+    if persisted and persisted.get("version") == STORE_VERSION and persisted.get("source") == resolved.name:
+        if persisted.get("signature") != signature:
+            fingerprint = file_fingerprint(resolved)
+        if fingerprint is None or fingerprint == persisted.get("fingerprint"):
+            if fingerprint is not None:
+                # Same content under a new mtime: remember it to skip hashing next time.
+                _write_store(store_file, {**persisted, "signature": signature})
+            meps = {int(key) if key.isdigit() else key: value for key, value in persisted["meps"].items()}
+            _store_memo[resolved] = (signature, meps)
+            return meps
+
+    meps = {}
+    for mep in records if records is not None else load_mep_records(resolved):
+        if isinstance(mep, dict) and mep.get("UserID"):
+            meps[mep["UserID"]] = summarize_mep(mep)
+    _write_store(store_file, {
+        "version": STORE_VERSION,
+        "source": resolved.name,
+        "signature": signature,
+        "fingerprint": fingerprint or file_fingerprint(resolved),
+        "meps": meps,
+    })
+    _store_memo[resolved] = (signature, meps)
+    return meps
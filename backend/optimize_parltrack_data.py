@@ -17,6 +17,8 @@ import sys
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 
+from term_calendar import classify_dates, date_prefix, term_bounds, term_for_date, term_for_prefix
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,26 +30,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# EP Term boundaries
-TERM_BOUNDARIES = {
-    8: {
-        'start': dt.datetime(2014, 7, 1),
-        'end': dt.datetime(2019, 7, 2),
-        'name': '8th'
-    },
-    9: {
-        'start': dt.datetime(2019, 7, 2), 
-        'end': dt.datetime(2024, 7, 16),
-        'name': '9th'
-    },
-    10: {
-        'start': dt.datetime(2024, 7, 16),
-        'end': dt.datetime(2030, 1, 1),  # Future end date
-        'name': '10th'
-    }
+# EP terms split into separate files (boundaries live in term_calendar)
+TERM_NAMES = {
+    8: '8th',
+    9: '9th',
+    10: '10th'
 }
 
-CUTOFF_DATE = dt.datetime(2014, 1, 1)
+CUTOFF_DATE = "2014-01-01"  # compared against YYYY-MM-DD date prefixes
 LARGE_FILE_THRESHOLD = 150 * 1024 * 1024  # 150MB in bytes
 
 class ParlTrackOptimizer:
@@ -80,34 +70,15 @@ class ParlTrackOptimizer:
                 else:
                     logger.info(f"Backup already exists for {json_file.name}")
     
-    def parse_date(self, date_str: str) -> Optional[dt.datetime]:
-        """Parse various date formats from ParlTrack data"""
-        if not date_str:
-            return None
-            
-        try:
-            # Handle ISO format with T and Z
-            if 'T' in date_str:
-                clean_date = date_str.replace('T', ' ').replace('Z', '')
-                return dt.datetime.fromisoformat(clean_date)
-            else:
-                return dt.datetime.fromisoformat(date_str)
-        except (ValueError, TypeError):
-            # Try other common formats
-            for fmt in ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S']:
-                try:
-                    return dt.datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            logger.warning(f"Could not parse date: {date_str}")
-            return None
+    def get_term_for_date(self, date_str: str) -> Optional[int]:
+        """Determine which split EP term a ParlTrack date string belongs to"""
+        term = term_for_date(date_str)
+        return term if term in TERM_NAMES else None
     
-    def get_term_for_date(self, date_obj: dt.datetime) -> Optional[int]:
-        """Determine EP term for a given date"""
-        for term, boundaries in TERM_BOUNDARIES.items():
-            if boundaries['start'] <= date_obj < boundaries['end']:
-                return term
-        return None
+    def is_before_cutoff(self, date_str: str) -> bool:
+        """Check whether a ParlTrack date string predates CUTOFF_DATE"""
+        prefix = date_prefix(date_str)
+        return prefix is not None and prefix < CUTOFF_DATE
     
     def optimize_amendments(self) -> None:
         """Optimize ep_amendments.json file"""
@@ -128,21 +99,13 @@ class ParlTrackOptimizer:
         amendments_by_term = {8: [], 9: [], 10: []}
         removed_count = 0
         
-        for amend in all_amendments:
-            date_str = amend.get('date', '')
-            date_obj = self.parse_date(date_str)
-            
-            if not date_obj:
-                continue
-                
+        terms = classify_dates(amend.get('date', '') for amend in all_amendments)
+        for amend, term in zip(all_amendments, terms):
+            if term in amendments_by_term:
+                amendments_by_term[term].append(amend)
             # Remove data before cutoff
-            if date_obj < CUTOFF_DATE:
+            elif self.is_before_cutoff(amend.get('date', '')):
                 removed_count += 1
-                continue
-                
-            term = self.get_term_for_date(date_obj)
-            if term and term in amendments_by_term:
-                amendments_by_term[term].append(amend)
         
         # Save optimized files
         for term, amendments in amendments_by_term.items():
@@ -158,7 +121,7 @@ class ParlTrackOptimizer:
                 logger.info(f"Created ep_amendments_term{term}.json with {len(amendments)} records ({file_size/1024/1024:.1f} MB)")
         
         self.stats['records_removed']['amendments'] = removed_count
-        logger.info(f"Removed {removed_count} amendments before {CUTOFF_DATE.strftime('%Y-%m-%d')}")
+        logger.info(f"Removed {removed_count} amendments before {CUTOFF_DATE}")
     
     def optimize_activities(self) -> None:
         """Optimize ep_mep_activities.json file"""
@@ -182,7 +145,6 @@ class ParlTrackOptimizer:
         for mep_data in all_meps:
             # Process each MEP's activities by term
             for term in [8, 9, 10]:
-                term_boundaries = TERM_BOUNDARIES[term]
                 filtered_mep_data = {
                     'mep_id': mep_data.get('mep_id'),
                     'meta': mep_data.get('meta', {}),
@@ -202,19 +164,18 @@ class ParlTrackOptimizer:
                     filtered_activities = []
                     
                     for activity in activities:
-                        date_str = activity.get('date', '')
-                        date_obj = self.parse_date(date_str)
+                        prefix = date_prefix(activity.get('date', ''))
                         
-                        if not date_obj:
+                        if not prefix:
                             continue
                             
                         # Remove data before cutoff
-                        if date_obj < CUTOFF_DATE:
+                        if prefix < CUTOFF_DATE:
                             removed_activities_count += 1
                             continue
                             
                         # Check if activity belongs to this term
-                        if term_boundaries['start'] <= date_obj < term_boundaries['end']:
+                        if term_for_prefix(prefix) == term:
                             filtered_activities.append(activity)
                             has_activities_in_term = True
                     
@@ -239,7 +200,7 @@ class ParlTrackOptimizer:
                 logger.info(f"Created ep_mep_activities_term{term}.json with {len(mep_list)} MEPs ({file_size/1024/1024:.1f} MB)")
         
         self.stats['records_removed']['activities'] = removed_activities_count
-        logger.info(f"Removed {removed_activities_count} activities before {CUTOFF_DATE.strftime('%Y-%m-%d')}")
+        logger.info(f"Removed {removed_activities_count} activities before {CUTOFF_DATE}")
     
     def optimize_votes(self) -> None:
         """Optimize ep_votes.json file if it's large"""
@@ -265,21 +226,13 @@ class ParlTrackOptimizer:
         votes_by_term = {8: [], 9: [], 10: []}
         removed_count = 0
         
-        for vote in all_votes:
-            date_str = vote.get('date', vote.get('ts', ''))
-            date_obj = self.parse_date(date_str)
-            
-            if not date_obj:
-                continue
-                
+        dates = [vote.get('date', vote.get('ts', '')) for vote in all_votes]
+        for vote, date_str, term in zip(all_votes, dates, classify_dates(dates)):
+            if term in votes_by_term:
+                votes_by_term[term].append(vote)
             # Remove data before cutoff
-            if date_obj < CUTOFF_DATE:
+            elif self.is_before_cutoff(date_str):
                 removed_count += 1
-                continue
-                
-            term = self.get_term_for_date(date_obj)
-            if term and term in votes_by_term:
-                votes_by_term[term].append(vote)
         
         # Save optimized files
         for term, votes in votes_by_term.items():
@@ -295,18 +248,18 @@ class ParlTrackOptimizer:
                 logger.info(f"Created ep_votes_term{term}.json with {len(votes)} records ({file_size/1024/1024:.1f} MB)")
         
         self.stats['records_removed']['votes'] = removed_count
-        logger.info(f"Removed {removed_count} votes before {CUTOFF_DATE.strftime('%Y-%m-%d')}")
+        logger.info(f"Removed {removed_count} votes before {CUTOFF_DATE}")
     
     def generate_metadata(self) -> None:
         """Generate optimization metadata and statistics"""
         metadata = {
             'optimization_timestamp': dt.datetime.now().isoformat(),
-            'cutoff_date': CUTOFF_DATE.isoformat(),
+            'cutoff_date': CUTOFF_DATE,
             'term_boundaries': {str(k): {
-                'start': v['start'].isoformat(),
-                'end': v['end'].isoformat(),
-                'name': v['name']
-            } for k, v in TERM_BOUNDARIES.items()},
+                'start': term_bounds(k)[0],
+                'end': term_bounds(k)[1],  # None: current, open-ended term
+                'name': v
+            } for k, v in TERM_NAMES.items()},
             'statistics': self.stats,
             'file_mapping': {
                 'amendments': {
@@ -405,7 +358,7 @@ if __name__ == "__main__":
     def optimize_all(self) -> None:
         """Run complete optimization process"""
         logger.info("Starting ParlTrack data optimization...")
-        logger.info(f"Cutoff date: {CUTOFF_DATE.strftime('%Y-%m-%d')}")
+        logger.info(f"Cutoff date: {CUTOFF_DATE}")
         logger.info(f"Large file threshold: {LARGE_FILE_THRESHOLD/1024/1024:.1f} MB")
         
         try:
@@ -157,44 +157,74 @@ class OutlierBasedScorer:
         # Ensure bounds (should be automatic, but for safety)
         return max(0.0, min(4.0, score))
     
-    def score_indicator_outlier_based(self, all_values: List[float], mep_value: float, 
-                                    term: int, indicator: str) -> Dict:
+    def indicator_bounds(self, all_values: List[float], term: int, indicator: str) -> Dict:
         """
-        Score a single MEP's indicator value using outlier-based method
+        Calculate the quartiles, outlier bounds and clean min/max of one indicator
+        
+        Computed once per (term, indicator) and stored in `outlier_stats`; the
+        scoring methods below only compare values against them.
         
         Args:
             all_values: All MEPs' values for this indicator in this term
-            mep_value: The specific MEP's value to score
             term: Parliamentary term number
             indicator: Name of the indicator (for statistics storage)
             
         Returns:
-            Dict with score, bounds, normalization info, and statistics
+            Dict with the statistics plus 'min_clean' and 'max_clean'
+            (None when fewer than two values are within the bounds)
         """
-        if mep_value is None:
-            mep_value = 0.0
-        
-        mep_value = float(mep_value)
-        
-        # Detect outliers and get bounds
-        lower_bound, upper_bound, clean_values = self.detect_outliers(all_values)
-        
-        # Store statistics for transparency
-        stats_key = f"term_{term}_{indicator}"
         q1, q3, iqr = self.calculate_quartiles(all_values)
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
         
-        self.outlier_stats[stats_key] = {
+        present = [float(v) for v in all_values if v is not None]
+        if np is not None and present:
+            values = np.asarray(present, dtype=np.float64)
+            clean = values[(values >= lower_bound) & (values <= upper_bound)]
+            clean_count = int(clean.size)
+            min_clean = float(clean.min()) if clean_count else None
+            max_clean = float(clean.max()) if clean_count else None
+        else:
+            clean = [v for v in present if lower_bound <= v <= upper_bound]
+            clean_count = len(clean)
+            min_clean = min(clean) if clean else None
+            max_clean = max(clean) if clean else None
+        
+        stats = {
             'term': term,
             'indicator': indicator,
-            'total_meps': len([v for v in all_values if v is not None]),
+            'total_meps': len(present),
             'q1': q1,
             'q3': q3,
             'iqr': iqr,
             'lower_bound': lower_bound,
             'upper_bound': upper_bound,
-            'clean_values_count': len(clean_values),
-            'outliers_count': len([v for v in all_values if v is not None]) - len(clean_values)
+            'clean_values_count': clean_count,
+            'outliers_count': len(present) - clean_count
+        }
+        self.outlier_stats[f"term_{term}_{indicator}"] = stats
+        
+        return {
+            **stats,
+            'min_clean': min_clean if clean_count > 1 else None,
+            'max_clean': max_clean if clean_count > 1 else None,
+            'statistics': stats
         }
+    
+    def score_value(self, mep_value: float, bounds: Dict) -> Dict:
+        """
+        Score one value against pre-calculated `indicator_bounds`
+        
+        Args:
+            mep_value: The specific MEP's value to score
+            bounds: Result of `indicator_bounds` for the value's term and indicator
+            
+        Returns:
+            Dict with score, bounds, normalization info, and statistics
+        """
+        mep_value = 0.0 if mep_value is None else float(mep_value)
+        lower_bound = bounds['lower_bound']
+        upper_bound = bounds['upper_bound']
         
         # Apply scoring rules
         if mep_value < lower_bound:
@@ -207,27 +237,21 @@ class OutlierBasedScorer:
             score = 4.0
             status = "above_outlier_threshold"
             normalized = 1.0
+        elif bounds['min_clean'] is None:
+            # Edge case: insufficient data for normalization
+            score = 2.0  # Default middle score
+            normalized = 0.5
+            status = "insufficient_data"
+        elif bounds['max_clean'] == bounds['min_clean']:
+            # All clean values are the same
+            score = 2.0
+            normalized = 0.5
+            status = "uniform_data"
         else:
-            # Within normal range → logarithmic scaling
-            if len(clean_values) <= 1:
-                # Edge case: insufficient data for normalization
-                score = 2.0  # Default middle score
-                normalized = 0.5
-                status = "insufficient_data"
-            else:
-                min_clean = min(clean_values)
-                max_clean = max(clean_values)
-                
-                if max_clean == min_clean:
-                    # All clean values are the same
-                    score = 2.0
-                    normalized = 0.5
-                    status = "uniform_data"
-                else:
-                    # Normal case: normalize and apply logarithmic scoring
-                    normalized = (mep_value - min_clean) / (max_clean - min_clean)
-                    score = self.logarithmic_score(normalized)
-                    status = "normal_range"
+            # Normal case: normalize and apply logarithmic scoring
+            normalized = (mep_value - bounds['min_clean']) / (bounds['max_clean'] - bounds['min_clean'])
+            score = self.logarithmic_score(normalized)
+            status = "normal_range"
         
         return {
             'score': round(score, 3),
@@ -236,9 +260,63 @@ class OutlierBasedScorer:
             'lower_bound': round(lower_bound, 2),
             'upper_bound': round(upper_bound, 2),
             'mep_value': mep_value,
-            'statistics': self.outlier_stats[stats_key]
+            'statistics': bounds['statistics']
         }
     
+    def score_indicator_vector(self, all_values: List[float], mep_values: List[float],
+                               term: int, indicator: str) -> List[Dict]:
+        """
+        Score every value of `mep_values` for one indicator in one pass
+        
+        The bounds are computed once; each distinct value is scored once and
+        the result shared by the MEPs with that value (activity counts repeat
+        a lot). Results are identical to calling `score_indicator_outlier_based`
+        for each value.
+        
+        Args:
+            all_values: All MEPs' values for this indicator in this term
+            mep_values: The values to score (usually `all_values` itself)
+            term: Parliamentary term number
+            indicator: Name of the indicator (for statistics storage)
+            
+        Returns:
+            One result dict per value of `mep_values`, in order
+        """
+        bounds = self.indicator_bounds(all_values, term, indicator)
+        values = [0.0 if v is None else float(v) for v in mep_values]
+        if not values:
+            return []
+        
+        if np is not None:
+            distinct, positions = np.unique(np.asarray(values, dtype=np.float64), return_inverse=True)
+            scored = [self.score_value(value, bounds) for value in distinct.tolist()]
+            return [dict(scored[position]) for position in positions.ravel().tolist()]
+        
+        scored = {}
+        for value in values:
+            if value not in scored:
+                scored[value] = self.score_value(value, bounds)
+        return [dict(scored[value]) for value in values]
+    
+    def score_indicator_outlier_based(self, all_values: List[float], mep_value: float, 
+                                    term: int, indicator: str) -> Dict:
+        """
+        Score a single MEP's indicator value using outlier-based method
+        
+        Recomputes the indicator's bounds on every call; to score a whole term
+        use `score_indicator_vector`.
+        
+        Args:
+            all_values: All MEPs' values for this indicator in this term
+            mep_value: The specific MEP's value to score
+            term: Parliamentary term number
+            indicator: Name of the indicator (for statistics storage)
+            
+        Returns:
+            Dict with score, bounds, normalization info, and statistics
+        """
+        return self.score_value(mep_value, self.indicator_bounds(all_values, term, indicator))
+    
     def get_outlier_statistics(self, term: int = None, indicator: str = None) -> Dict:
         """
         Get stored outlier statistics
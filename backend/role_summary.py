@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Per-term role summaries and date-interval lookups over the `roles` table.
+
+Every roles row is one (MEP, organisation, role) interval. The ingest folds
+them into `role_summary`, one row per MEP, term and distinct role with the
+number of rows and the days they cover inside the term, so the dataset
+builder, the scorer and the rankings read a handful of precomputed rows
+instead of re-aggregating the roles table on every run.
+
+The interval indexes on `roles` answer date questions directly:
+`roles_on_date` ("which roles did MEP X hold on D") and `role_holders` ("who
+chaired committee C between R1 and R2").
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .term_calendar import date_prefix, term_bounds
+except ImportError:
+    from term_calendar import date_prefix, term_bounds
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS role_summary (
+        mep_id INTEGER NOT NULL,
+        term INTEGER NOT NULL,
+        role_key TEXT NOT NULL,   -- e.g. committee_chair, or 'role_type:role' for unranked roles
+        role_type TEXT,
+        role TEXT,
+        count INTEGER NOT NULL,   -- roles rows (one per organisation and mandate)
+        days_held INTEGER NOT NULL,  -- days covered inside the term, up to today for open roles
+        PRIMARY KEY (mep_id, term, role_key)
+    )
+"""
+
+# Interval lookups on roles; added to the ingest's lookup indexes.
+INTERVAL_INDEXES = (
+    ("idx_roles_mep_interval", "roles (mep_id, start_date, end_date)"),
+    ("idx_roles_org_interval", "roles (organization_abbr, role, start_date, end_date)"),
+)
+
+# (role_type, role) -> role_key of the roles the datasets and rankings count.
+ROLE_KEYS = {
+    ("committee", "Chair"): "committee_chair",
+    ("committee", "Vice-Chair"): "committee_vice_chair",
+    ("committee", "Member"): "committee_member",
+    ("committee", "Substitute"): "committee_substitute",
+    ("delegation", "Chair"): "delegation_chair",
+    ("delegation", "Vice-Chair"): "delegation_vice_chair",
+    ("delegation", "Member"): "delegation_member",
+    ("delegation", "Substitute"): "delegation_substitute",
+    ("ep", "President"): "ep_president",
+    ("ep", "Vice-President"): "ep_vice_president",
+    ("ep", "Quaestor"): "ep_quaestor",
+}
+
+INSERT_SQL = """
+    INSERT INTO role_summary (mep_id, term, role_key, role_type, role, count, days_held)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_ROLE_COLUMNS = "mep_id, term, role_type, role, start_date, end_date"
+
+
+def role_key(role_type: Optional[str], role: Optional[str]) -> str:
+    key = ROLE_KEYS.get((role_type, role))
+    return key if key is not None else f"{role_type or ''}:{role or ''}"
+
+
+def _day(value: object) -> Optional[dt.date]:
+    prefix = date_prefix(value)
+    if prefix is None:
+        return None
+    try:
+        return dt.date.fromisoformat(prefix)
+    except ValueError:  # e.g. 2019-02-30
+        return None
+
+
+def days_in_term(term: int, start: object, end: object, today: dt.date) -> int:
+    """Days of the `[start, end]` interval that fall inside `term` (and not after `today`)."""
+    first, next_start = term_bounds(term)
+    lower = max(filter(None, (_day(start), dt.date.fromisoformat(first))))
+    upper = min(filter(None, (_day(end), today)))
+    if next_start is not None:
+        upper = min(upper, dt.date.fromisoformat(next_start) - dt.timedelta(days=1))
+    return max(0, (upper - lower).days + 1)
+
+
+def summarize_roles(rows: Iterable[tuple], today: Optional[dt.date] = None) -> List[tuple]:
+    """
+    Fold `(mep_id, term, role_type, role, start_date, end_date)` rows into
+    `role_summary` rows, in the order each role first appears.
+
+    That order is kept on purpose: the scorer picks the first of equally
+    weighted roles, as it did when reading roles rows in insertion order.
+    """
+    today = today or dt.date.today()
+    summary: Dict[Tuple[int, int, str], list] = {}
+    for mep_id, term, role_type, role, start, end in rows:
+        if mep_id is None or term is None:
+            continue
+        key = (mep_id, term, role_key(role_type, role))
+        entry = summary.get(key)
+        if entry is None:
+            entry = summary[key] = [role_type, role, 0, 0]
+        entry[2] += 1
+        try:
+            entry[3] += days_in_term(term, start, end, today)
+        except ValueError:  # a term outside the calendar
+            pass
+    return [(*key, *entry) for key, entry in summary.items()]
+
+
+def refresh_role_summary(cur: sqlite3.Cursor, mep_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rebuild the summary rows of `mep_ids` (all MEPs by default) from `roles`
+    inside the caller's transaction; returns the rows written.
+    """
+    cur.execute(CREATE_TABLE_SQL)
+    if mep_ids is None:
+        cur.execute("DELETE FROM role_summary")
+        rows = cur.execute(f"SELECT {_ROLE_COLUMNS} FROM roles ORDER BY id").fetchall()
+    else:
+        rows = []
+        for mep_id in sorted(set(mep_ids)):
+            cur.execute("DELETE FROM role_summary WHERE mep_id = ?", (mep_id,))
+            rows += cur.execute(
+                f"SELECT {_ROLE_COLUMNS} FROM roles WHERE mep_id = ? ORDER BY id", (mep_id,)
+            ).fetchall()
+    summary = summarize_roles(rows)
+    cur.executemany(INSERT_SQL, summary)
+    return len(summary)
+
+
+def load_role_summary(conn: sqlite3.Connection, term: int) -> Dict[int, List[tuple]]:
+    """
+    Return `{mep_id: [(role_key, role_type, role, count, days_held), ...]}` for one term.
+
+    Databases built before the table existed are summarised from `roles` on the fly.
+    """
+    try:
+        rows = conn.execute(
+            "SELECT mep_id, term, role_key, role_type, role, count, days_held "
+            "FROM role_summary WHERE term = ? ORDER BY rowid",
+            (term,),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        rows = summarize_roles(
+            conn.execute(f"SELECT {_ROLE_COLUMNS} FROM roles WHERE term = ? ORDER BY id", (term,)).fetchall()
+        )
+    by_mep: Dict[int, List[tuple]] = {}
+    for mep_id, _, key, role_type, role, count, days_held in rows:
+        by_mep.setdefault(mep_id, []).append((key, role_type, role, count, days_held))
+    return by_mep
+
+
+# --- Interval queries ---------------------------------------------------
+#
+# Dates compare as ISO strings. "\uffff" sorts after any time suffix, so a
+# bare end date includes that whole day; open-ended roles have no end date
+# or ParlTrack's 9999-12-31.
+
+
+def _connect(db_path: Path | str) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def roles_on_date(db_path: Path | str, mep_id: int, date: str) -> List[dict]:
+    """Roles one MEP held on `date` (an ISO date or timestamp)."""
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT role_type, organization, organization_abbr, role, start_date, end_date
+            FROM roles
+            WHERE mep_id = ? AND start_date <= ? AND (end_date IS NULL OR end_date >= ?)
+            ORDER BY start_date, organization
+            """,
+            (mep_id, date + "\uffff", date[:10]),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def role_holders(
+    db_path: Path | str,
+    organization: str,
+    role: str = "Chair",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> List[dict]:
+    """
+    MEPs who held `role` in `organization` (abbreviation, e.g. BUDG) at any
+    point between `start` and `end` (inclusive, None leaves a side open).
+    """
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT mep_id, term, role_type, organization, organization_abbr, role, start_date, end_date
+            FROM roles
+            WHERE organization_abbr = ? AND role = ?
+              AND (? IS NULL OR start_date <= ?)
+              AND (? IS NULL OR end_date IS NULL OR end_date >= ?)
+            ORDER BY start_date, mep_id
+            """,
+            (
+                organization,
+                role,
+                end,
+                None if end is None else end + "\uffff",
+                start,
+                None if start is None else start[:10],
+            ),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
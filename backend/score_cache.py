@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Cache of the `/api/score` responses.
+
+Scoring a whole term takes seconds of CPU, so `ScoreCache` keeps the
+serialised response of each term and serves repeat requests from those
+bytes. An entry is keyed by
+
+  * the term,
+  * the scorer methodology version (`METHODOLOGY` plus a digest of the
+    scoring code, so a code change is a new version), and
+  * the database fingerprint (`term_snapshot.database_signature`: inode,
+    size and mtime of `meps.db` and its WAL),
+
+so a new database or a new scorer never serves an old result. Entries live
+in a small in-memory LRU and, optionally, on disk (one gzip file per term,
+`data/derived/score_cache/term{N}-{key}.json.gz`) so a restarted server
+does not rescore. Concurrent misses for the same key compute it once; the
+other requests wait for that result.
+
+The ingest calls `purge_score_cache()` after replacing the database so the
+on-disk entries of the old one are dropped as well.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from .file_utils import file_fingerprint, json_fingerprint
+    from .mep_score_scorer import METHODOLOGY
+    from .term_snapshot import clear_term_snapshots, database_signature
+except ImportError:
+    from file_utils import file_fingerprint, json_fingerprint  # type: ignore
+    from mep_score_scorer import METHODOLOGY  # type: ignore
+    from term_snapshot import clear_term_snapshots, database_signature  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent
+SCORE_CACHE_DIR = BACKEND_DIR.parent / "data" / "derived" / "score_cache"
+
+# Modules whose source determines the scores.
+SCORER_FILES = (
+    "mep_score_scorer.py",
+    "outlier_based_scorer.py",
+    "incremental_scoring.py",
+    "term_snapshot.py",
+    "role_summary.py",
+)
+
+MEMORY_ENTRIES = 8
+GZIP_LEVEL = 6
+
+
+def methodology_version() -> str:
+    """`METHODOLOGY` and the digest of `SCORER_FILES`, shortened."""
+    sources = [
+        [name, file_fingerprint(BACKEND_DIR / name) if (BACKEND_DIR / name).exists() else None]
+        for name in SCORER_FILES
+    ]
+    return json_fingerprint([METHODOLOGY, sources])[:16]
+
+
+def database_fingerprint(db_path: Path | str) -> str:
+    """Short digest of the database's `database_signature`."""
+    return json_fingerprint(database_signature(db_path))[:16]
+
+
+@dataclass(frozen=True)
+class CachedScores:
+    """A serialised score response: the JSON body, its gzip encoding and its ETag."""
+
+    key: Tuple[int, str, str]
+    body: bytes
+    gzipped: bytes
+
+    @property
+    def etag(self) -> str:
+        """ETag of the identity-encoded body."""
+        return hashlib.sha1("/".join(map(str, self.key)).encode("utf-8")).hexdigest()[:20]
+
+    @property
+    def gzip_etag(self) -> str:
+        """ETag of the gzip-encoded body; each representation needs its own strong ETag."""
+        return f"{self.etag}-gz"
+
+
+class _Flight:
+    """One in-progress computation that other requests for the same key wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[CachedScores] = None
+        self.error: Optional[BaseException] = None
+
+
+class ScoreCache:
+    """
+    Serialised score responses per (term, methodology version, database fingerprint).
+
+    `render(term)` must return the JSON body for a term as bytes; it is only
+    called on a miss of both tiers. `directory=None` disables the disk tier.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        render: Callable[[int], bytes],
+        directory: Optional[Path | str] = SCORE_CACHE_DIR,
+        max_entries: int = MEMORY_ENTRIES,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.render = render
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.version = methodology_version()
+        self._memory: "OrderedDict[Tuple[int, str, str], CachedScores]" = OrderedDict()
+        self._flights: Dict[Tuple[int, str, str], _Flight] = {}
+        self._lock = threading.Lock()
+
+    def key(self, term: int) -> Tuple[int, str, str]:
+        return (term, self.version, database_fingerprint(self.db_path))
+
+    def get(self, term: int) -> CachedScores:
+        """The cached response for `term`, rendering it (once) when missing."""
+        key = self.key(term)
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                return cached
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            cached = self._load(key)
+            if cached is None:
+                body = self.render(term)
+                cached = CachedScores(key, body, gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0))
+                self._store(cached)
+            with self._lock:
+                # Entries of the same term for an older database or scorer are dead.
+                for stale in [k for k in self._memory if k[0] == term and k != key]:
+                    del self._memory[stale]
+                self._memory[key] = cached
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+            flight.result = cached
+            return cached
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def invalidate(self, term: Optional[int] = None) -> None:
+        """Drop the cached responses (and scorer snapshots) of `term`, or of every term."""
+        with self._lock:
+            for key in [k for k in self._memory if term is None or k[0] == term]:
+                del self._memory[key]
+        clear_term_snapshots(self.db_path, None if term is None else [term])
+        if self.directory is not None:
+            purge_score_cache(self.directory, term)
+
+    # --- Disk tier ----------------------------------------------------------
+
+    def _path(self, key: Tuple[int, str, str]) -> Path:
+        term, version, database = key
+        return self.directory / f"term{term}-{version}-{database}.json.gz"
+
+    def _load(self, key: Tuple[int, str, str]) -> Optional[CachedScores]:
+        if self.directory is None:
+            return None
+        try:
+            gzipped = self._path(key).read_bytes()
+            return CachedScores(key, gzip.decompress(gzipped), gzipped)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError) as exc:
+            logger.warning("Ignoring unreadable score cache file %s: %s", self._path(key), exc)
+            return None
+
+    def _store(self, cached: CachedScores) -> None:
+        if self.directory is None:
+            return
+        path = self._path(cached.key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=path.name, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(cached.gzipped)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            for stale in self.directory.glob(f"term{cached.key[0]}-*.json.gz"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as exc:  # read-only deployments keep the memory tier only
+            logger.warning("Could not write score cache file %s: %s", path, exc)
+
+
+def purge_score_cache(directory: Path | str = SCORE_CACHE_DIR, term: Optional[int] = None) -> int:
+    """Delete the on-disk score cache (of one term, or all); returns how many files were removed."""
+    pattern = f"term{term}-*.json.gz" if term is not None else "term*.json.gz"
+    removed = 0
+    for path in Path(directory).glob(pattern):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
@@ -13,15 +13,23 @@ from pathlib import Path
 from typing import Dict, Iterable, Iterator, List, Optional
 
 import zstandard as zstd
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException
 
 try:
-    from .mep_score_scorer import MEPScoreScorer
+    from .mep_score_scorer import METHODOLOGY, MEPScoreScorer
+    from .score_cache import SCORE_CACHE_DIR, ScoreCache
+    from .custom_ranking import DEFAULT_LIMIT, CustomRankingEngine
+    from .incremental_scoring import IncrementalScorer
+    from .activity_items import SCORING_API_DETAIL_CATEGORIES, fetch_activity_items
     from .file_utils import load_json_auto, resolve_json_path, stream_json_items
 except ImportError:  # pragma: no cover
-    from mep_score_scorer import MEPScoreScorer  # type: ignore
+    from mep_score_scorer import METHODOLOGY, MEPScoreScorer  # type: ignore
+    from score_cache import SCORE_CACHE_DIR, ScoreCache  # type: ignore
+    from custom_ranking import DEFAULT_LIMIT, CustomRankingEngine  # type: ignore
+    from incremental_scoring import IncrementalScorer  # type: ignore
+    from activity_items import SCORING_API_DETAIL_CATEGORIES, fetch_activity_items  # type: ignore
     from file_utils import load_json_auto, resolve_json_path, stream_json_items  # type: ignore
 
 
@@ -60,7 +68,30 @@ PARLTRACK_DIR = DATA_DIR / "parltrack"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 PARLTRACK_DIR.mkdir(parents=True, exist_ok=True)
 
-scorer = MEPScoreScorer(db_path=str(DATA_DIR / "meps.db"))
+MEPS_DB_PATH = DATA_DIR / "meps.db"
+scorer = MEPScoreScorer(db_path=str(MEPS_DB_PATH))
+# Rescoring after an ingest only recomputes the MEPs whose scores can change
+incremental_scorer = IncrementalScorer(scorer)
+
+
+def _render_scores(term: int) -> bytes:
+    """The `/api/score` body for a term, serialised exactly as `jsonify` would."""
+    results = incremental_scorer.score_all_meps(term)
+    return app.json.response({
+        'success': True,
+        'count': len(results),
+        'data': results,
+        'methodology': METHODOLOGY
+    }).get_data()
+
+
+# SCORE_CACHE_DIR= (empty) keeps the score cache in memory only.
+score_cache = ScoreCache(
+    MEPS_DB_PATH,
+    _render_scores,
+    directory=os.environ.get("SCORE_CACHE_DIR", str(SCORE_CACHE_DIR)) or None,
+)
+custom_ranking = CustomRankingEngine(BASE_DIR / "public" / "data")
 
 TERM_YEAR_RANGES = {
     8: (2014, 2019),
@@ -438,13 +469,56 @@ def get_scores():
     """Return term-wide scores computed from the SQLite database."""
     try:
         term = int(request.args.get('term', 10))
-        results = scorer.score_all_meps(term)
-        return jsonify({
-            'success': True,
-            'count': len(results),
-            'data': results,
-            'methodology': 'MEP Ranking (October 2017) with term-specific ranges'
-        })
+    except ValueError as exc:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {exc}'}), 400
+    # Unknown terms would each cost a scoring pass and a cache file.
+    if term not in TERM_YEAR_RANGES:
+        return jsonify({'success': False, 'error': f'Unknown term: {term}'}), 400
+
+    try:
+        cached = score_cache.get(term)
+    except Exception as exc:  # pragma: no cover
+        return jsonify({'success': False, 'error': str(exc)}), 500
+
+    gzipped = 'gzip' in request.accept_encodings
+    etag = cached.gzip_etag if gzipped else cached.etag
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if etag in request.if_none_match:
+        return Response(status=304, headers=headers)
+    if gzipped:
+        headers['Content-Encoding'] = 'gzip'
+        return Response(cached.gzipped, mimetype='application/json', headers=headers)
+    return Response(cached.body, mimetype='application/json', headers=headers)
+
+
+@app.route('/api/score/custom', methods=['GET', 'POST'])
+def get_custom_ranking():
+    """
+    Rank a term's MEPs by a weighted sum of their metrics and return one page.
+
+    Weights are metric -> number, sent as the JSON body's `weights` object or,
+    for GET, as query parameters (e.g. `?term=10&speeches=1&amendments=0.5`).
+    """
+    body = request.get_json(silent=True)
+    params = {**request.args, **(body if isinstance(body, dict) else {})}
+    try:
+        term = int(params.pop('term', 10))
+        offset = int(params.pop('offset', 0))
+        limit = int(params.pop('limit', DEFAULT_LIMIT))
+    except (TypeError, ValueError) as exc:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {exc}'}), 400
+    if term not in TERM_YEAR_RANGES:
+        return jsonify({'success': False, 'error': f'Unknown term: {term}'}), 400
+    weights = params.pop('weights', None) if request.method == 'POST' else None
+    if weights is None:
+        weights = params
+    if not isinstance(weights, dict):
+        return jsonify({'success': False, 'error': 'weights must be an object'}), 400
+
+    try:
+        return jsonify(custom_ranking.rank(term, weights, offset=offset, limit=limit))
+    except ValueError as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 400
     except Exception as exc:  # pragma: no cover
         return jsonify({'success': False, 'error': str(exc)}), 500
 
@@ -533,6 +607,23 @@ def get_mep_category_details(mep_id: int, category: str):
             'data': matches
         })
 
+    item_categories = SCORING_API_DETAIL_CATEGORIES.get(category)
+    if item_categories:
+        page = fetch_activity_items(MEPS_DB_PATH, mep_id, term, item_categories, offset, limit)
+        if page is not None:
+            total, paginated = page
+            return jsonify({
+                'success': True,
+                'category': category,
+                'mep_id': mep_id,
+                'term': term,
+                'total_count': total,
+                'offset': offset,
+                'limit': limit,
+                'has_more': total > offset + len(paginated),
+                'data': paginated
+            })
+
     app.logger.info("Loading MEP %s data for category %s (term %s)", mep_id, category, term)
 
     try:
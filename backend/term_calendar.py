@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+European Parliament term calendar shared by the whole data pipeline.
+
+ParlTrack dates are ISO strings (`YYYY-MM-DD`, optionally followed by a time
+and a timezone suffix). Their first ten characters sort exactly like the dates
+they encode, so a record is classified by comparing that prefix against the
+term start dates with a binary search: no `datetime` is built per record.
+The date part is taken as written; a timezone suffix does not shift it.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterable
+
+# First day of each term. A term lasts until the next one starts; the most
+# recent term is open-ended.
+TERM_STARTS: tuple[tuple[int, str], ...] = (
+    (7, "2009-07-14"),
+    (8, "2014-07-01"),
+    (9, "2019-07-02"),
+    (10, "2024-07-16"),
+)
+
+_STARTS = [start for _, start in TERM_STARTS]
+_TERMS = [term for term, _ in TERM_STARTS]
+
+
+def date_prefix(value: object) -> str | None:
+    """Return the `YYYY-MM-DD` part of an ISO date string, or None if it has none."""
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    prefix = value[:10]
+    if (
+        prefix[4] != "-"
+        or prefix[7] != "-"
+        or not (prefix[:4] + prefix[5:7] + prefix[8:]).isdigit()
+        or not "01" <= prefix[5:7] <= "12"
+        or not "01" <= prefix[8:] <= "31"
+    ):
+        return None
+    return prefix
+
+
+def term_for_prefix(prefix: str, min_term: int | None = None) -> int | None:
+    """Classify an already validated `YYYY-MM-DD` prefix."""
+    index = bisect_right(_STARTS, prefix) - 1
+    if index < 0:
+        return None
+    term = _TERMS[index]
+    if min_term is not None and term < min_term:
+        return None
+    return term
+
+
+@lru_cache(maxsize=1 << 16)
+def _term_for_string(value: str) -> int | None:
+    prefix = date_prefix(value)
+    return None if prefix is None else term_for_prefix(prefix)
+
+
+def term_for_date(value: object, min_term: int | None = None) -> int | None:
+    """
+    Return the EP term an ISO date string falls in.
+
+    Returns None for missing or malformed dates, dates before the first known
+    term, and terms older than `min_term`. Results are memoised per string,
+    since dumps repeat the same sitting dates over and over.
+    """
+    if not isinstance(value, str):
+        return None
+    term = _term_for_string(value)
+    if term is None or (min_term is not None and term < min_term):
+        return None
+    return term
+
+
+def term_bounds(term: int) -> tuple[str, str | None]:
+    """Return the first day of `term` and the first day of the next one (None if open-ended)."""
+    index = _TERMS.index(term)
+    end = _STARTS[index + 1] if index + 1 < len(_STARTS) else None
+    return _STARTS[index], end
+
+
+def classify_dates(values: Iterable[object], min_term: int | None = None) -> list[int | None]:
+    """
+    Classify a whole column of date strings.
+
+    Each distinct date is classified once; ParlTrack columns repeat the same
+    few thousand sitting dates across millions of records.
+    """
+    memo: dict[object, int | None] = {}
+    terms = []
+    for value in values:
+        try:
+            term = memo[value]
+        except KeyError:
+            term = memo[value] = term_for_date(value, min_term)
+        except TypeError:  # unhashable junk
+            term = None
+        terms.append(term)
+    return terms
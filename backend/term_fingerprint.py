@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Per-term input fingerprints, so unchanged terms are not rebuilt.
+
+A term's fingerprint digests everything its dataset is computed from: the
+term's `activities`, `roles`, `role_summary`, `mep_vote_summary` and
+`term_vote_totals` rows, the `meps` rows of its MEPs (plus any metadata the
+builder adds), the official term list file and the source of the code that
+scores and writes it. Writers store it in the manifest entry of each
+artifact together with their name (see `dataset_artifacts.write_artifacts`);
+a term whose artifacts all carry the current fingerprint of the same writer
+is up to date.
+
+`build_term_dataset` and `DataSyncService` both write the `term{N}_*`
+artifacts but assemble them from different inputs and code, so each has its
+own recipe in `WRITER_CODE_FILES` and only trusts entries it wrote itself.
+
+Archived terms (8 and 9) practically never change, so after an ingest only
+the current term is usually rebuilt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+try:
+    from .dataset_artifacts import DATA_DIR, load_manifest
+    from .file_utils import file_fingerprint, json_fingerprint
+except ImportError:
+    from dataset_artifacts import DATA_DIR, load_manifest
+    from file_utils import file_fingerprint, json_fingerprint
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+# Modules every term dataset depends on, whichever writer produced it.
+CODE_FILES = (
+    "mep_score_scorer.py",
+    "outlier_based_scorer.py",
+    "incremental_scoring.py",
+    "role_summary.py",
+    "aggregates.py",
+    "columnar.py",
+    "term_views.py",
+    "dataset_artifacts.py",
+)
+
+# The modules each writer builds a term dataset with, on top of `CODE_FILES`.
+WRITER_CODE_FILES = {
+    "build_term_dataset": ("build_term_dataset.py", "mep_store.py"),
+    "data_sync_service": ("data_sync_service.py",),
+}
+
+# (label, query) pairs over the rows of one term; ordered so the digest is stable.
+_TERM_QUERIES = (
+    ("activities", "SELECT * FROM activities WHERE term = ? ORDER BY mep_id, id"),
+    ("roles", "SELECT * FROM roles WHERE term = ? ORDER BY id"),
+    ("role_summary", "SELECT * FROM role_summary WHERE term = ? ORDER BY mep_id, role_key"),
+    ("mep_vote_summary", "SELECT * FROM mep_vote_summary WHERE term = ? ORDER BY mep_id"),
+    ("term_vote_totals", "SELECT * FROM term_vote_totals WHERE term = ?"),
+)
+
+
+def _digest_rows(digest: "hashlib._Hash", label: str, cursor: sqlite3.Cursor) -> None:
+    digest.update(f"\n[{label}]".encode("utf-8"))
+    digest.update(json.dumps([column[0] for column in cursor.description]).encode("utf-8"))
+    for row in cursor:
+        digest.update(b"\n")
+        digest.update(json.dumps(row, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def code_version(files: Iterable[Path | str] = ()) -> str:
+    """Digest of the source of `CODE_FILES` plus `files`."""
+    paths = [BACKEND_DIR / name for name in CODE_FILES] + [Path(path) for path in files]
+    return json_fingerprint([
+        [path.name, file_fingerprint(path) if path.exists() else None] for path in paths
+    ])
+
+
+def term_fingerprint(
+    conn: sqlite3.Connection,
+    term: int,
+    writer: str,
+    mep_ids: Optional[Iterable[int]] = None,
+    metadata: Any = None,
+    term_list: Optional[Path | str] = None,
+) -> str:
+    """
+    Fingerprint of the inputs `writer` builds one term's dataset from.
+
+    `meps` rows are included for the MEPs with activities in the term and for
+    `mep_ids` (e.g. the official term list). `metadata` is any JSON value the
+    caller also builds from, such as names and groups from ParlTrack.
+    """
+    code_files = [BACKEND_DIR / name for name in WRITER_CODE_FILES[writer]]
+    digest = hashlib.sha256(f"term {term} by {writer}".encode("utf-8"))
+    for label, query in _TERM_QUERIES:
+        try:
+            _digest_rows(digest, label, conn.execute(query, (term,)))
+        except sqlite3.OperationalError:  # table not created yet
+            digest.update(f"\n[{label}: missing]".encode("utf-8"))
+
+    ids = set(mep_ids or ())
+    ids.update(mep_id for (mep_id,) in conn.execute("SELECT DISTINCT mep_id FROM activities WHERE term = ?", (term,)))
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS fingerprint_ids (mep_id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM fingerprint_ids")
+    conn.executemany("INSERT OR IGNORE INTO fingerprint_ids VALUES (?)", ((mep_id,) for mep_id in ids))
+    _digest_rows(
+        digest, "meps",
+        conn.execute("SELECT m.* FROM meps m JOIN fingerprint_ids f USING (mep_id) ORDER BY m.mep_id"),
+    )
+    conn.execute("DELETE FROM fingerprint_ids")
+
+    digest.update(f"\n[metadata]{json_fingerprint(metadata)}".encode("utf-8"))
+    term_list = Path(term_list) if term_list is not None else None
+    list_digest = file_fingerprint(term_list) if term_list is not None and term_list.exists() else None
+    digest.update(f"\n[term list]{list_digest}".encode("utf-8"))
+    digest.update(f"\n[code]{code_version(code_files)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def artifacts_current(names: Iterable[str], fingerprint: str, writer: str, directory: Path = DATA_DIR) -> bool:
+    """True when every artifact in `names` was written by `writer` from inputs with `fingerprint` and still exists."""
+    artifacts = load_manifest(directory)["artifacts"]
+    for name in names:
+        entry = artifacts.get(name)
+        if (
+            not entry
+            or entry.get("writer") != writer
+            or entry.get("fingerprint") != fingerprint
+            or not (directory / entry["file"]).exists()
+        ):
+            return False
+    return True
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Term-level snapshot of the data the MEP scorer reads.
+
+`load_term_snapshot(db_path, term)` runs the scorer's queries once (MEPs
+joined with their activities and vote attendance, the term's vote total and
+the role summary) and keeps the result as:
+
+  * `meps`    one read-only mapping (`MappingProxyType`) per MEP, shaped as
+    `get_mep_data` returns them, with its roles as a tuple of read-only
+    mappings: the rows are shared by every scorer and by `IncrementalScorer`'s
+    stored state, so they must not be modified;
+  * `columns` the numeric fields as arrays in the same MEP order (numpy
+    float64 when numpy is installed, else lists of floats);
+  * `roles`   the distinct roles of each MEP (the same read-only tuples).
+
+Snapshots are kept per (database, term) and reused until the database file
+changes (its size, mtime or inode, or those of its WAL file), so repeated
+API scoring requests do not go back to SQLite.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - columns are plain lists instead
+    np = None
+
+try:
+    from .role_summary import load_role_summary
+except ImportError:
+    from role_summary import load_role_summary
+
+NUMERIC_FIELDS = (
+    "speeches", "reports_rapporteur", "reports_shadow", "amendments",
+    "questions_written", "questions_oral", "questions_major", "motions",
+    "opinions_rapporteur", "opinions_shadow", "explanations", "declarations",
+    "votes_attended", "votes_total",
+)
+
+_MEPS_QUERY = """
+    SELECT
+        m.mep_id, m.full_name, m.country, m.current_party_group, m.current_party,
+        a.speeches, a.reports_rapporteur, a.reports_shadow,
+        a.amendments, a.questions_written, a.questions_oral, a.questions_major,
+        a.motions, a.motions_individual, a.opinions_rapporteur, a.opinions_shadow,
+        a.explanations, a.declarations,
+        COALESCE(va.votes_attended, 0) as votes_attended
+    FROM meps m
+    INNER JOIN activities a ON m.mep_id = a.mep_id
+        LEFT JOIN (
+            SELECT mep_id, votes_attended
+            FROM mep_vote_summary
+            WHERE term = ?
+        ) va ON m.mep_id = va.mep_id
+    WHERE a.term = ?
+"""
+
+
+@dataclass(frozen=True)
+class TermSnapshot:
+    """The scorer's input data for one term, loaded once."""
+
+    term: int
+    meps: Tuple[Mapping[str, Any], ...]
+    columns: Dict[str, Any]
+    roles: Dict[int, Tuple[Mapping[str, Any], ...]]
+    votes_total: int
+    signature: Tuple = field(default=(), compare=False)
+
+    def values(self, name: str) -> List[float]:
+        """One numeric field for every MEP, in `meps` order, as Python floats."""
+        column = self.columns[name]
+        return column.tolist() if np is not None else list(column)
+
+    def __len__(self) -> int:
+        return len(self.meps)
+
+
+def database_signature(db_path: Path | str) -> Tuple:
+    """Changes whenever the database (or its write-ahead log) is written or replaced."""
+    signature = []
+    for path in (Path(db_path), Path(f"{db_path}-wal")):
+        try:
+            stat = path.stat()
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def read_term_snapshot(db_path: Path | str, term: int) -> TermSnapshot:
+    """Query one term's scorer inputs from the database (uncached)."""
+    signature = database_signature(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        total_row = conn.execute("SELECT votes_total FROM term_vote_totals WHERE term = ?", (term,)).fetchone()
+        votes_total = total_row[0] if total_row else 0
+
+        meps: Dict[int, Dict[str, Any]] = {}
+        for row in conn.execute(_MEPS_QUERY, (term, term)):
+            mep_id = row[0]
+            meps[mep_id] = {
+                'mep_id': mep_id,
+                'full_name': row[1] or 'Unknown',
+                'country': row[2] or 'Unknown',
+                'group': row[3] or 'Unknown',
+                'national_party': row[4] or 'Unknown',
+                'speeches': row[5] or 0,
+                'reports_rapporteur': row[6] or 0,
+                'reports_shadow': row[7] or 0,
+                'amendments': row[8] or 0,
+                'questions_written': row[9] or 0,
+                'questions_oral': row[10] or 0,
+                'questions_major': row[11] or 0,
+                'motions': (row[12] or 0) + (row[13] or 0),
+                'opinions_rapporteur': row[14] or 0,
+                'opinions_shadow': row[15] or 0,
+                'explanations': row[16] or 0,
+                'declarations': row[17] or 0,
+                'votes_attended': row[18] or 0,
+                'votes_total': votes_total,
+                'roles': ()
+            }
+
+        # Distinct roles held in the term, from the precomputed summary
+        # (only the best role counts, so one entry per role is enough)
+        roles: Dict[int, Tuple[Mapping[str, Any], ...]] = {}
+        for mep_id, summary in load_role_summary(conn, term).items():
+            if mep_id in meps:
+                roles[mep_id] = meps[mep_id]['roles'] = tuple(
+                    MappingProxyType({'type': role_type, 'role': role, 'count': count})
+                    for _, role_type, role, count, _ in summary
+                )
+    finally:
+        conn.close()
+
+    rows = tuple(MappingProxyType(row) for row in meps.values())
+    columns: Dict[str, Any] = {}
+    for name in NUMERIC_FIELDS:
+        values = [float(row[name]) for row in rows]
+        columns[name] = np.asarray(values, dtype=np.float64) if np is not None else values
+    return TermSnapshot(term, rows, columns, roles, votes_total, signature)
+
+
+_snapshots: Dict[Tuple[str, int], TermSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def load_term_snapshot(db_path: Path | str, term: int) -> TermSnapshot:
+    """The snapshot of `term`, reused per process until the database changes."""
+    key = (str(Path(db_path).resolve()), term)
+    signature = database_signature(db_path)
+    cached = _snapshots.get(key)
+    if cached is not None and cached.signature == signature:
+        return cached
+    with _snapshots_lock:
+        cached = _snapshots.get(key)
+        if cached is not None and cached.signature == database_signature(db_path):
+            return cached
+        snapshot = read_term_snapshot(db_path, term)
+        _snapshots[key] = snapshot
+        return snapshot
+
+
+def clear_term_snapshots(db_path: Optional[Path | str] = None, terms: Optional[Sequence[int]] = None) -> None:
+    """Drop cached snapshots (of one database and/or some terms; all by default)."""
+    path = str(Path(db_path).resolve()) if db_path is not None else None
+    with _snapshots_lock:
+        for key in list(_snapshots):
+            if (path is None or key[0] == path) and (terms is None or key[1] in terms):
+                del _snapshots[key]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Slim views of a term dataset for the pages that don't need all of it.
+
+The full `term{N}_dataset` carries every MEP's detailed roles and score
+breakdown. Next to it each build writes:
+
+  * `term{N}_index`     one slim row per MEP: the columns the rankings table
+    shows plus the activity counts the profile page compares against;
+  * `term{N}_averages`  the EP / group / country averages and percentiles;
+  * `term{N}_profiles_NN` the remaining fields (detailed roles, score
+    breakdown, ...) of the MEPs with `mep_id % PROFILE_SHARDS == NN`;
+  * `term{N}_dataset_columnar` and `term{N}_index_columnar`, the dataset and
+    the index with their rows in the columnar encoding of `columnar.py`.
+
+A profile page loads the index, the averages and one profile shard instead
+of the whole dataset; the rankings table reads the columnar index.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+try:
+    from .columnar import columnar_dataset
+    from .dataset_artifacts import DATA_DIR, write_artifacts
+except ImportError:
+    from columnar import columnar_dataset
+    from dataset_artifacts import DATA_DIR, write_artifacts
+
+PROFILE_SHARDS = 32
+
+INDEX_FIELDS = (
+    # identity and ranking
+    "mep_id", "full_name", "country", "group", "national_party", "rank", "final_score", "score",
+    # activities
+    "speeches", "amendments", "reports_rapporteur", "reports_shadow", "questions",
+    "questions_written", "questions_oral", "motions", "opinions_rapporteur", "opinions_shadow",
+    "explanations", "votes_attended", "attendance_rate",
+    # roles
+    "committee_chair", "committee_vice_chair", "committee_member", "committee_substitute",
+    "delegation_chair", "delegation_vice_chair", "delegation_member", "delegation_substitute",
+    "ep_president", "ep_vice_president", "ep_quaestor",
+    # category scores
+    "legislative_production_score", "control_transparency_score", "engagement_presence_score",
+    "institutional_roles_multiplier", "attendance_penalty",
+)
+
+_INDEX_FIELD_SET = frozenset(INDEX_FIELDS)
+
+
+def profile_shard(mep_id: int) -> str:
+    return f"{mep_id % PROFILE_SHARDS:02d}"
+
+
+def split_term_dataset(term: int, dataset: Mapping[str, Any]) -> Dict[str, Any]:
+    """Artifact name -> data of every view of one term dataset."""
+    meps: List[Mapping[str, Any]] = dataset.get("meps", [])
+    index = [{key: mep[key] for key in INDEX_FIELDS if key in mep} for mep in meps]
+
+    shards: Dict[str, Dict[str, Any]] = {profile_shard(n): {} for n in range(PROFILE_SHARDS)}
+    for mep in meps:
+        shards[profile_shard(mep["mep_id"])][str(mep["mep_id"])] = {
+            key: value for key, value in mep.items() if key not in _INDEX_FIELD_SET
+        }
+
+    averages = {"averages": dataset.get("averages", {})}
+    if "percentiles" in dataset:
+        averages["percentiles"] = dataset["percentiles"]
+
+    index_view = {"meps": index, "profile_shards": PROFILE_SHARDS}
+    views: Dict[str, Any] = {
+        f"term{term}_index": index_view,
+        f"term{term}_index_columnar": columnar_dataset(index_view),
+        f"term{term}_dataset_columnar": columnar_dataset(dataset),
+        f"term{term}_averages": averages,
+    }
+    for shard, profiles in shards.items():
+        views[f"term{term}_profiles_{shard}"] = {"meps": profiles}
+    return views
+
+
+def term_artifact_names(term: int) -> List[str]:
+    """Names of every artifact a term build writes: the dataset and its views."""
+    return [
+        f"term{term}_dataset",
+        f"term{term}_index",
+        f"term{term}_index_columnar",
+        f"term{term}_dataset_columnar",
+        f"term{term}_averages",
+        *(f"term{term}_profiles_{profile_shard(n)}" for n in range(PROFILE_SHARDS)),
+    ]
+
+
+def write_term_views(
+    term: int,
+    dataset: Mapping[str, Any],
+    directory: Path = DATA_DIR,
+    fingerprint: Optional[str] = None,
+    writer: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Write the views of `dataset`; returns their manifest entries by artifact name."""
+    return write_artifacts(split_term_dataset(term, dataset), directory, fingerprint, writer)
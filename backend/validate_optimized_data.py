@@ -15,6 +15,7 @@ from typing import Dict, List, Any, Optional, Tuple
 import time
 
 from file_utils import load_json_auto, resolve_json_path
+from term_calendar import date_prefix, term_for_prefix
 
 # Configure logging
 logging.basicConfig(
@@ -183,12 +184,6 @@ class DataValidator:
         """Validate that data falls within expected term date ranges"""
         logger.info("Validating date ranges...")
         
-        term_boundaries = {
-            8: (dt.datetime(2014, 7, 1), dt.datetime(2019, 7, 2)),
-            9: (dt.datetime(2019, 7, 2), dt.datetime(2024, 7, 16)),
-            10: (dt.datetime(2024, 7, 16), dt.datetime(2030, 1, 1))
-        }
-        
         date_valid = True
         
         # Check amendments dates
@@ -198,22 +193,12 @@ class DataValidator:
                 try:
                     amendments = load_json_auto(amend_file)
                     
-                    start_date, end_date = term_boundaries[term]
                     invalid_dates = 0
                     
                     for amend in amendments[:100]:  # Check sample
-                        date_str = amend.get('date', '')
-                        if date_str:
-                            try:
-                                if 'T' in date_str:
-                                    date_obj = dt.datetime.fromisoformat(date_str.replace('T', ' ').replace('Z', ''))
-                                else:
-                                    date_obj = dt.datetime.fromisoformat(date_str)
-                                
-                                if not (start_date <= date_obj < end_date):
-                                    invalid_dates += 1
-                            except (ValueError, TypeError):
-                                pass
+                        prefix = date_prefix(amend.get('date', ''))
+                        if prefix and term_for_prefix(prefix) != term:
+                            invalid_dates += 1
                     
                     if invalid_dates > 0:
                         self.results['warnings'].append(f"Found {invalid_dates} amendments with dates outside term {term} range")
@@ -314,18 +299,9 @@ class DataValidator:
                 # Count records after 2014 in original
                 orig_count_after_2014 = 0
                 for amend in orig_data:
-                    date_str = amend.get('date', '')
-                    if date_str:
-                        try:
-                            if 'T' in date_str:
-                                date_obj = dt.datetime.fromisoformat(date_str.replace('T', ' ').replace('Z', ''))
-                            else:
-                                date_obj = dt.datetime.fromisoformat(date_str)
-                            
-                            if date_obj >= dt.datetime(2014, 1, 1):
-                                orig_count_after_2014 += 1
-                        except (ValueError, TypeError):
-                            pass
+                    prefix = date_prefix(amend.get('date', ''))
+                    if prefix and prefix >= "2014-01-01":
+                        orig_count_after_2014 += 1
                 
                 # Count records in optimized files
                 optimized_count = 0
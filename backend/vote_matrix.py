@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped roll-call vote matrices and the analytics built on them.
+
+For every term the vote summary writes, under `data/derived/votes/`:
+
+  * `votes_term{N}.int8`   votes x MEPs, one `VOTE_CODES` value per cell;
+  * `groups_term{N}.uint8` votes x MEPs, 1-based index of the political group
+    the MEP voted with (0 when absent);
+  * `votes_term{N}.index.json` the sidecar: vote ids and timestamps (row
+    order, chronological), MEP ids (column order) and group names.
+
+The matrices are plain row-major files opened read-only with `numpy.memmap`,
+so every API worker maps the same pages from the OS page cache instead of
+holding its own copy. Writing only needs the standard library; the analytics
+need numpy.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is only needed to read the matrices
+    np = None
+
+MATRIX_DIR = Path("data/derived/votes")
+
+ABSENT = 0
+FOR = 1
+AGAINST = -1
+ABSTAIN = 2
+VOTE_CODES = {"+": FOR, "-": AGAINST, "0": ABSTAIN}
+
+
+def _paths(matrix_dir: Path, term: int) -> Tuple[Path, Path, Path]:
+    return (
+        matrix_dir / f"votes_term{term}.int8",
+        matrix_dir / f"groups_term{term}.uint8",
+        matrix_dir / f"votes_term{term}.index.json",
+    )
+
+
+class RollCallMatrixBuilder:
+    """
+    Collects how every MEP voted, vote by vote, while the votes dump is tallied.
+
+    Each vote keeps packed arrays (MEP id, vote code, group index); the dense
+    matrices are only laid out once a term's votes can be put in order.
+    """
+
+    def __init__(self) -> None:
+        self.group_names: List[str] = []
+        self._group_index: Dict[str, int] = {}
+        # term -> vote id -> (timestamp, MEP ids, vote codes, group indexes)
+        self.votes: Dict[int, Dict[str, Tuple[str, array, array, array]]] = {}
+
+    def _group(self, name: str) -> int:
+        index = self._group_index.get(name)
+        if index is None:
+            self.group_names.append(name)
+            index = self._group_index[name] = len(self.group_names)  # 1-based, 0 = absent
+        return index
+
+    def add_vote(self, term: int, vote_id: str, ts: str, ballots: Mapping[int, Tuple[str, str]]) -> None:
+        """Record one vote; `ballots` maps MEP id to `(outcome key, group name)`."""
+        term_votes = self.votes.setdefault(term, {})
+        entry = term_votes.get(vote_id)
+        if entry is None:
+            entry = term_votes[vote_id] = (ts, array("I"), array("b"), array("B"))
+        _, mep_ids, codes, groups = entry
+        for mep_id, (outcome_key, group_name) in ballots.items():
+            mep_ids.append(mep_id)
+            codes.append(VOTE_CODES[outcome_key])
+            groups.append(self._group(str(group_name)))
+
+    def merge(self, other: "RollCallMatrixBuilder") -> None:
+        remap = array("B", [0] + [self._group(name) for name in other.group_names])
+        for term, term_votes in other.votes.items():
+            target = self.votes.setdefault(term, {})
+            for vote_id, (ts, mep_ids, codes, groups) in term_votes.items():
+                entry = target.get(vote_id)
+                if entry is None:
+                    entry = target[vote_id] = (ts, array("I"), array("b"), array("B"))
+                entry[1].extend(mep_ids)
+                entry[2].extend(codes)
+                entry[3].extend(remap[index] for index in groups)
+
+    def write_term(self, term: int, matrix_dir: Path = MATRIX_DIR) -> Tuple[int, int]:
+        """
+        Lay out and write the matrices and sidecar of one term; returns `(votes, MEPs)`.
+
+        Rows follow (timestamp, vote id), like the attendance matrix. When an
+        MEP appears twice in one vote the first ballot wins.
+        """
+        ordered = sorted(self.votes.get(term, {}).items(), key=lambda item: (item[1][0], item[0]))
+        mep_ids = sorted({mep_id for _, (_, ids, _, _) in ordered for mep_id in ids})
+        column = {mep_id: index for index, mep_id in enumerate(mep_ids)}
+        width = len(mep_ids)
+
+        votes = bytearray(len(ordered) * width)
+        groups = bytearray(len(ordered) * width)
+        for row, (_, (_, ids, codes, group_indexes)) in enumerate(ordered):
+            base = row * width
+            for mep_id, code, group_index in zip(ids, codes, group_indexes):
+                cell = base + column[mep_id]
+                if groups[cell]:
+                    continue
+                votes[cell] = code & 0xFF  # int8 two's complement
+                groups[cell] = group_index
+
+        matrix_dir.mkdir(parents=True, exist_ok=True)
+        votes_path, groups_path, index_path = _paths(matrix_dir, term)
+        index = {
+            "term": term,
+            "shape": [len(ordered), width],
+            "encoding": {"absent": ABSENT, "for": FOR, "against": AGAINST, "abstain": ABSTAIN},
+            "vote_ids": [vote_id for vote_id, _ in ordered],
+            "vote_ts": [entry[0] for _, entry in ordered],
+            "mep_ids": mep_ids,
+            "groups": self.group_names,
+        }
+        # Matrices first and the sidecar last, each replaced atomically:
+        # readers that still map the old files keep their snapshot.
+        _replace(votes_path, bytes(votes))
+        _replace(groups_path, bytes(groups))
+        _replace(index_path, json.dumps(index, separators=(",", ":")).encode("utf-8"))
+        return len(ordered), width
+
+
+def _replace(path: Path, payload: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def write_vote_matrices(builder: RollCallMatrixBuilder, terms: Iterable[int], matrix_dir: Path = MATRIX_DIR) -> None:
+    for term in terms:
+        rows, columns = builder.write_term(term, matrix_dir)
+        print(f"[vote-matrix] Term {term}: {rows:,} votes x {columns:,} MEPs written to {matrix_dir}")
+
+
+# --- Reading and analytics ----------------------------------------------
+
+
+@dataclass
+class TermVoteMatrix:
+    """Read-only, memory-mapped roll-call matrix of one term."""
+
+    term: int
+    votes: "np.ndarray"      # int8 (votes, MEPs)
+    groups: "np.ndarray"     # uint8 (votes, MEPs)
+    vote_ids: List[str]
+    vote_ts: List[str]
+    mep_ids: List[int]
+    group_names: List[str]
+    columns: Dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.columns = {mep_id: index for index, mep_id in enumerate(self.mep_ids)}
+
+
+_matrix_memo: Dict[Tuple[Path, int], Tuple[int, TermVoteMatrix]] = {}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required to read the vote matrices (pip install numpy)")
+
+
+def load_term_matrix(term: int, matrix_dir: Path | str = MATRIX_DIR) -> TermVoteMatrix:
+    """Map the matrices of `term`; reused per process until the sidecar is rewritten."""
+    _require_numpy()
+    matrix_dir = Path(matrix_dir)
+    votes_path, groups_path, index_path = _paths(matrix_dir, term)
+    if not index_path.exists():
+        raise FileNotFoundError(f"No vote matrix for term {term} in {matrix_dir}")
+    key = (matrix_dir.resolve(), term)
+    mtime = index_path.stat().st_mtime_ns
+    cached = _matrix_memo.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    shape = tuple(index["shape"])
+    if shape[0] * shape[1] == 0:
+        votes = np.zeros(shape, dtype=np.int8)
+        groups = np.zeros(shape, dtype=np.uint8)
+    else:
+        votes = np.memmap(votes_path, dtype=np.int8, mode="r", shape=shape)
+        groups = np.memmap(groups_path, dtype=np.uint8, mode="r", shape=shape)
+    matrix = TermVoteMatrix(
+        term=term,
+        votes=votes,
+        groups=groups,
+        vote_ids=index["vote_ids"],
+        vote_ts=index["vote_ts"],
+        mep_ids=index["mep_ids"],
+        group_names=index["groups"],
+    )
+    _matrix_memo[key] = (mtime, matrix)
+    return matrix
+
+
+def _choice_counts(matrix: TermVoteMatrix) -> "np.ndarray":
+    """Per vote and group, the number of for / against / abstain ballots: shape (votes, groups + 1, 3)."""
+    n_groups = len(matrix.group_names) + 1
+    counts = np.zeros((matrix.votes.shape[0], n_groups, 3), dtype=np.int32)
+    choices = [matrix.votes == code for code in (FOR, AGAINST, ABSTAIN)]
+    # Group 0 (absent cells) is left at zero; callers skip it.
+    for group in range(1, n_groups):
+        in_group = matrix.groups == group
+        for slot, chose in enumerate(choices):
+            counts[:, group, slot] = np.count_nonzero(chose & in_group, axis=1)
+    return counts
+
+
+def group_cohesion(matrix: TermVoteMatrix) -> Dict[str, float]:
+    """
+    Agreement index of each political group, averaged over the votes it took part in.
+
+    Per vote: (max(Y, N, A) - (Y + N + A - max) / 2) / (Y + N + A), i.e. 1
+    when the group voted as one and 0 when split evenly three ways.
+    """
+    _require_numpy()
+    counts = _choice_counts(matrix)[:, 1:, :].astype(np.float64)
+    present = counts.sum(axis=2)
+    largest = counts.max(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        index = (largest - (present - largest) / 2) / present
+    result = {}
+    for group, name in enumerate(matrix.group_names):
+        taken_part = present[:, group] > 0
+        if taken_part.any():
+            result[name] = float(index[taken_part, group].mean())
+    return result
+
+
+def mep_loyalty(matrix: TermVoteMatrix) -> Dict[int, float]:
+    """
+    Share of each MEP's ballots that matched the majority of the group they voted with.
+
+    The group majority is its most common choice in that vote (ties go to
+    for, then against, then abstain).
+    """
+    _require_numpy()
+    majority_slot = _choice_counts(matrix).argmax(axis=2)  # (votes, groups + 1)
+    majority_code = np.array([FOR, AGAINST, ABSTAIN], dtype=np.int8)[majority_slot]
+    rows = np.arange(matrix.votes.shape[0])[:, None]
+    expected = majority_code[rows, matrix.groups]
+    present = matrix.groups > 0
+    loyal = ((matrix.votes == expected) & present).sum(axis=0)
+    cast = present.sum(axis=0)
+    return {
+        mep_id: float(loyal[column] / cast[column])
+        for column, mep_id in enumerate(matrix.mep_ids)
+        if cast[column]
+    }
+
+
+def pairwise_agreement(
+    matrix: TermVoteMatrix, mep_ids: Optional[Sequence[int]] = None
+) -> Tuple[List[int], "np.ndarray"]:
+    """
+    Agreement between every pair of MEPs: the share of the votes both took
+    part in where they made the same choice (NaN when they never both voted).
+
+    Returns the MEP ids (all of the term's by default) and the square matrix.
+    """
+    _require_numpy()
+    if mep_ids is None:
+        mep_ids = list(matrix.mep_ids)
+    columns = [matrix.columns[mep_id] for mep_id in mep_ids]
+    ballots = np.asarray(matrix.votes[:, columns])
+    same = np.zeros((len(columns), len(columns)), dtype=np.float64)
+    for code in (FOR, AGAINST, ABSTAIN):
+        chose = (ballots == code).astype(np.float32)
+        same += chose.T @ chose
+    present = (ballots != ABSENT).astype(np.float32)
+    both = present.T @ present
+    with np.errstate(invalid="ignore", divide="ignore"):
+        agreement = np.where(both > 0, same / both, np.nan)
+    return list(mep_ids), agreement
@@ -6,28 +6,38 @@ The original dataset stored one row per vote per MEP (~27M rows) in the
 `votes_attended` table, which inflated the SQLite file close to 2 GB.
 This module aggregates the raw ParlTrack votes dump into a compact
 summary table and (optionally) drops the heavyweight table.
+
+Alongside the totals, the per-vote detail is kept as a compact attendance
+matrix (see `attendance_store.py`) so date-range attendance can be answered
+without the dump, and as memory-mapped roll-call matrices (see
+`vote_matrix.py`) for cohesion and agreement analytics.
+
+The dump is parsed incrementally, one vote at a time. With `workers > 1` the
+per-term dumps written by `optimize_parltrack_data.py` are aggregated in
+parallel, one process per term, and their counters merged.
 """
 
 from __future__ import annotations
 
-import io
-import json
+import argparse
 import sqlite3
-from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import DefaultDict, Dict, Iterable, Iterator, MutableMapping, Set, Tuple
-
-import zstandard as zstd
+from typing import Dict, Iterable, Iterator, Set, Tuple
 
-# Keep only the terms that are used by the public site (8th onwards).
-# Older terms can easily be re-generated from the ParlTrack dump if needed.
-TERM_WINDOWS: Tuple[Tuple[int, datetime, datetime], ...] = (
-    (8, datetime(2014, 7, 1), datetime(2019, 7, 2)),
-    (9, datetime(2019, 7, 2), datetime(2024, 7, 16)),
-    (10, datetime(2024, 7, 16), datetime(2029, 7, 15)),
-)
+try:
+    from .attendance_store import AttendanceMatrixBuilder, write_attendance_matrix
+    from .file_utils import resolve_json_path, stream_json_items
+    from .term_calendar import term_for_date
+    from .vote_matrix import MATRIX_DIR, RollCallMatrixBuilder, write_vote_matrices
+except ImportError:
+    from attendance_store import AttendanceMatrixBuilder, write_attendance_matrix
+    from file_utils import resolve_json_path, stream_json_items
+    from term_calendar import term_for_date
+    from vote_matrix import MATRIX_DIR, RollCallMatrixBuilder, write_vote_matrices
 
 
 @dataclass(frozen=True)
@@ -36,6 +46,43 @@ class Config:
     votes_file: Path = Path("data/parltrack/ep_votes.json.zst")
     min_term: int = 8
     drop_raw_table: bool = True
+    # Keep the per-vote attendance matrix (term_votes / mep_vote_attendance).
+    attendance_matrix: bool = True
+    # Write the memory-mapped roll-call matrices (see vote_matrix.py).
+    rollcall_matrix: bool = True
+    matrix_dir: Path = MATRIX_DIR
+    # Parallel mode: one worker per per-term dump (see _term_shards).
+    workers: int = 1
+    votes_term_files: Tuple[Path, ...] = tuple(
+        Path(f"data/parltrack/ep_votes_term{term}.json") for term in (8, 9, 10)
+    )
+
+
+@dataclass
+class VoteTally:
+    """Mergeable attendance counters of a set of votes."""
+
+    attendance: Dict[int, Counter] = field(default_factory=dict)
+    vote_ids: Dict[int, Set[str]] = field(default_factory=dict)
+    votes_read: int = 0
+    processes: int = 1
+    matrix: AttendanceMatrixBuilder | None = None
+    rollcall: RollCallMatrixBuilder | None = None
+
+    def merge(self, other: "VoteTally") -> None:
+        for term, counts in other.attendance.items():
+            self.attendance.setdefault(term, Counter()).update(counts)
+        for term, vote_ids in other.vote_ids.items():
+            self.vote_ids.setdefault(term, set()).update(vote_ids)
+        self.votes_read += other.votes_read
+        if other.matrix is not None:
+            if self.matrix is None:
+                self.matrix = AttendanceMatrixBuilder()
+            self.matrix.merge(other.matrix)
+        if other.rollcall is not None:
+            if self.rollcall is None:
+                self.rollcall = RollCallMatrixBuilder()
+            self.rollcall.merge(other.rollcall)
 
 
 class VoteSummaryError(RuntimeError):
@@ -46,64 +93,56 @@ def _detect_term(timestamp: str, min_term: int) -> int | None:
     """
     Convert the ParlTrack timestamp (UTC ISO string) into an EP term number.
 
-    Returns None when the timestamp is outside of the configured term windows.
+    Only terms from `min_term` onwards are kept for the public site; older
+    terms can easily be re-generated from the ParlTrack dump if needed.
+    Returns None for those and for malformed timestamps.
     """
-    if not timestamp:
-        return None
-
-    try:
-        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00")).replace(tzinfo=None)
-    except ValueError:
-        return None
-
-    for term, start, end in TERM_WINDOWS:
-        if term < min_term:
-            continue
-        if start <= dt < end:
-            return term
-    return None
+    return term_for_date(timestamp, min_term)
 
 
 def _iter_votes(votes_file: Path) -> Iterator[dict]:
     """
-    Lazily stream the votes array from the compressed ParlTrack dump.
+    Stream the votes array from a ParlTrack dump (`.json` or `.json.zst`).
 
-    The file holds ~43k votes which expands to ~200 MB – loading everything
-    at once is acceptable, but the stream keeps memory usage predictable.
+    Votes are parsed one at a time straight from the decompressed bytes, so
+    memory stays flat no matter how large the ~200 MB dump grows.
     """
-    if not votes_file.exists():
+    resolved = resolve_json_path(votes_file)
+    if not resolved.exists():
         raise VoteSummaryError(f"Votes dump not found: {votes_file}")
-
-    with votes_file.open("rb") as fh:
-        reader = zstd.ZstdDecompressor().stream_reader(fh)
-        text_stream = io.TextIOWrapper(reader, encoding="utf-8")
-        yield from json.load(text_stream)
+    yield from stream_json_items(resolved)
 
 
-def aggregate_vote_attendance(
-    votes: Iterable[dict], min_term: int
-) -> Tuple[Dict[int, Dict[int, int]], Dict[int, int]]:
+def tally_votes(
+    votes: Iterable[dict],
+    min_term: int,
+    matrix: AttendanceMatrixBuilder | None = None,
+    rollcall: RollCallMatrixBuilder | None = None,
+) -> VoteTally:
     """
-    Reduce the verbose votes array into:
-      * per-term, per-MEP attendance counts
-      * total number of votes cast in a term (for attendance rates)
+    Count, per term, the votes each MEP took part in and the distinct vote ids.
+
+    Every identified vote is also handed to the `matrix` (attendees) and
+    `rollcall` (ballots) builders when given.
     """
-    attendance: DefaultDict[int, DefaultDict[int, int]] = defaultdict(lambda: defaultdict(int))
-    total_vote_ids: DefaultDict[int, Set[str]] = defaultdict(set)
+    tally = VoteTally(matrix=matrix, rollcall=rollcall)
+    votes_read = 0
 
     for vote in votes:
-        ts = vote.get("ts")
-        term = _detect_term(ts, min_term)
+        votes_read += 1
+        term = _detect_term(vote.get("ts"), min_term)
         if term is None:
             continue
 
         vote_id = str(vote.get("voteid") or "")
         if vote_id:
-            total_vote_ids[term].add(vote_id)
+            tally.vote_ids.setdefault(term, set()).add(vote_id)
 
         vote_groups = vote.get("votes") or {}
         # Guard against double counting: the same MEP must not be counted twice for a single vote.
-        seen_in_vote: Set[int] = set()
+        # (A dict rather than a set keeps the MEPs in first-seen order; the
+        # value is the MEP's first ballot, as (outcome, group).)
+        seen_in_vote: Dict[int, Tuple[str, str]] = {}
 
         for outcome_key in ("+", "-", "0"):
             outcome = vote_groups.get(outcome_key)
@@ -111,26 +150,96 @@ def aggregate_vote_attendance(
                 continue
 
             groups = outcome.get("groups") or {}
-            for members in groups.values():
+            for group_name, members in groups.items():
                 if not isinstance(members, list):
                     continue
+                ballot = (outcome_key, group_name)
                 for member in members:
                     mep_id = member.get("mepid")
-                    if mep_id is None:
-                        continue
-                    try:
-                        mep_id_int = int(mep_id)
-                    except (TypeError, ValueError):
-                        continue
-                    if mep_id_int in seen_in_vote:
-                        continue
-
-                    attendance[term][mep_id_int] += 1
-                    seen_in_vote.add(mep_id_int)
+                    if type(mep_id) is not int:  # dumps carry ints; convert anything else
+                        if mep_id is None:
+                            continue
+                        try:
+                            mep_id = int(mep_id)
+                        except (TypeError, ValueError):
+                            continue
+                    seen_in_vote.setdefault(mep_id, ballot)
+
+        if matrix is not None and vote_id:
+            matrix.add_vote(term, vote_id, vote["ts"], seen_in_vote.keys())
+        if rollcall is not None and vote_id:
+            rollcall.add_vote(term, vote_id, vote["ts"], seen_in_vote)
+
+        if seen_in_vote:
+            counts = tally.attendance.get(term)
+            if counts is None:
+                counts = tally.attendance[term] = Counter()
+            counts.update(seen_in_vote.keys())
+
+    tally.votes_read = votes_read
+    return tally
+
+
+def _tally_file(
+    votes_file: Path, min_term: int, with_matrix: bool = False, with_rollcall: bool = False
+) -> VoteTally:
+    """Tally one dump; module-level so it can run in a worker process."""
+    matrix = AttendanceMatrixBuilder() if with_matrix else None
+    rollcall = RollCallMatrixBuilder() if with_rollcall else None
+    return tally_votes(_iter_votes(votes_file), min_term, matrix, rollcall)
+
+
+def _term_shards(config: Config) -> list[Path] | None:
+    """
+    Return the per-term vote dumps to aggregate in parallel, or None when
+    they are incomplete or older than the main dump (then it is read instead).
+    """
+    shards = [resolve_json_path(path) for path in config.votes_term_files]
+    if not shards or not all(shard.exists() for shard in shards):
+        return None
+    main_dump = resolve_json_path(config.votes_file)
+    if main_dump.exists() and any(shard.stat().st_mtime < main_dump.stat().st_mtime for shard in shards):
+        return None
+    return shards
+
+
+def collect_vote_tally(config: Config) -> VoteTally:
+    """Tally the votes dump, sharded over worker processes when configured and possible."""
+    shards = _term_shards(config) if config.workers > 1 else None
+    if shards is None:
+        if config.workers > 1:
+            print("[vote-summary] Per-term vote dumps missing or stale, reading the full dump in one process.")
+        return _tally_file(config.votes_file, config.min_term, config.attendance_matrix, config.rollcall_matrix)
+
+    tally = VoteTally(processes=min(config.workers, len(shards)))
+    with ProcessPoolExecutor(max_workers=tally.processes) as pool:
+        partials = pool.map(
+            _tally_file,
+            shards,
+            [config.min_term] * len(shards),
+            [config.attendance_matrix] * len(shards),
+            [config.rollcall_matrix] * len(shards),
+        )
+        for partial in partials:
+            tally.merge(partial)
+    return tally
+
+
+def aggregate_vote_attendance(
+    votes: Iterable[dict], min_term: int
+) -> Tuple[Dict[int, Dict[int, int]], Dict[int, int]]:
+    """
+    Reduce the verbose votes array into:
+      * per-term, per-MEP attendance counts
+      * total number of votes cast in a term (for attendance rates)
+    """
+    return _summarize(tally_votes(votes, min_term))
+
 
+def _summarize(tally: VoteTally) -> Tuple[Dict[int, Dict[int, int]], Dict[int, int]]:
     # Convert vote id sets into counts
-    total_counts = {term: len(vote_ids) for term, vote_ids in total_vote_ids.items()}
-    attendance_dict = {term: dict(meps) for term, meps in attendance.items()}
+    total_counts = {term: len(vote_ids) for term, vote_ids in tally.vote_ids.items()}
+    attendance_dict = {term: dict(meps) for term, meps in tally.attendance.items()}
     return attendance_dict, total_counts
 
 
@@ -141,8 +250,15 @@ def update_vote_summary(config: Config = Config()) -> Tuple[int, int]:
     Returns:
         Tuple of (number of summary rows inserted, number of term totals inserted).
     """
-    votes_iter = _iter_votes(config.votes_file)
-    attendance_by_term, totals_by_term = aggregate_vote_attendance(votes_iter, config.min_term)
+    started = time.perf_counter()
+    tally = collect_vote_tally(config)
+    elapsed = time.perf_counter() - started
+    rate = tally.votes_read / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[vote-summary] Parsed {tally.votes_read:,} votes in {elapsed:.1f}s "
+        f"({rate:,.0f} votes/sec, {tally.processes} process(es))."
+    )
+    attendance_by_term, totals_by_term = _summarize(tally)
 
     if not attendance_by_term:
         raise VoteSummaryError("No attendance data extracted – aborting to avoid wiping tables.")
@@ -200,6 +316,10 @@ def update_vote_summary(config: Config = Config()) -> Tuple[int, int]:
             total_rows,
         )
 
+        bitsets = write_attendance_matrix(cur, tally.matrix, tracked_terms)
+        if tally.matrix is not None:
+            print(f"[vote-summary] Stored attendance bitsets for {bitsets:,} MEP-terms.")
+
         if config.drop_raw_table:
             cur.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name='votes_attended'"
@@ -209,14 +329,25 @@ def update_vote_summary(config: Config = Config()) -> Tuple[int, int]:
 
         conn.commit()
         conn.execute("VACUUM")
+        if tally.rollcall is not None:
+            write_vote_matrices(tally.rollcall, tracked_terms, config.matrix_dir)
         return len(summary_rows), len(total_rows)
     finally:
         conn.close()
 
 
 def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compact the ParlTrack votes dump into attendance summary tables.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="aggregate the per-term vote dumps in this many processes (default: 1)",
+    )
+    args = parser.parse_args(argv)
+
     try:
-        summary_count, term_count = update_vote_summary()
+        summary_count, term_count = update_vote_summary(Config(workers=args.workers))
     except VoteSummaryError as exc:
         print(f"[vote-summary] ERROR: {exc}")
         raise SystemExit(1)
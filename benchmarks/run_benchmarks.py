@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark the dataset build pipeline on synthetic ParlTrack data.
+
+For every scale, a fresh workspace is generated with `synthetic_parltrack`
+and the pipeline stages run in order against it:
+
+  ingest          ingest_parltrack.main() (full ingest, vote summary included)
+  vote_summary    vote_summary.update_vote_summary() on its own
+  build_datasets  build_term_dataset.build() for terms 8-10 (forced)
+  score_all_meps  MEPScoreScorer.score_all_meps() for terms 8-10
+
+Each stage runs in its own freshly spawned process, so its peak RSS is its
+own. Wall time, CPU time (including worker processes), peak RSS and
+records/sec are printed, compared with the previous run of the same stage
+and scale, and appended to the JSON history (benchmarks/history.json by
+default) together with the commit they were measured on.
+
+Usage:
+    python benchmarks/run_benchmarks.py                 # scales 1, 10 and 100
+    python benchmarks/run_benchmarks.py --scale 1 --stage build_datasets
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: CPU time and peak memory come from the stage process only
+    resource = None
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARKS_DIR.parent
+BACKEND_DIR = REPO_ROOT / "backend"
+HISTORY_FILE = BENCHMARKS_DIR / "history.json"
+
+STAGES = ("ingest", "vote_summary", "build_datasets", "score_all_meps")
+SCALES = (1, 10, 100)
+TERMS = (8, 9, 10)
+
+
+# --- Stages (run inside the spawned process, cwd = workspace) -------------
+
+def _stage_ingest(records: Dict[str, int]) -> int:
+    import ingest_parltrack
+    if ingest_parltrack.main([]) != 0:
+        raise RuntimeError("ingest failed")
+    return sum(records.values())
+
+
+def _stage_vote_summary(records: Dict[str, int]) -> int:
+    from vote_summary import Config, update_vote_summary
+    update_vote_summary(Config())
+    return records["votes"]
+
+
+def _stage_build_datasets(records: Dict[str, int]) -> int:
+    import build_term_dataset
+    mep_info = build_term_dataset.load_mep_data()
+    for term in TERMS:
+        build_term_dataset.build(term, mep_info, force=True)
+    return sum(
+        len(json.loads(Path(f"public/data/term{term}_index.json").read_text(encoding="utf-8"))["meps"])
+        for term in TERMS
+    )
+
+
+def _stage_score_all_meps(records: Dict[str, int]) -> int:
+    from mep_score_scorer import MEPScoreScorer
+    scorer = MEPScoreScorer("data/meps.db")
+    return sum(len(scorer.score_all_meps(term)) for term in TERMS)
+
+
+STAGE_FUNCTIONS = {
+    "ingest": _stage_ingest,
+    "vote_summary": _stage_vote_summary,
+    "build_datasets": _stage_build_datasets,
+    "score_all_meps": _stage_score_all_meps,
+}
+
+
+def _cpu_seconds() -> float:
+    if resource is None:
+        return time.process_time()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_stage(stage: str, workspace: str, records: Dict[str, int], verbose: bool) -> dict:
+    """Entry point of the stage process: run one stage and measure it."""
+    os.chdir(workspace)
+    sys.path.insert(0, str(BACKEND_DIR))
+    if not verbose:
+        logging.disable(logging.WARNING)
+    with open(os.devnull, "w") as devnull, contextlib.ExitStack() as quiet:
+        if not verbose:
+            quiet.enter_context(contextlib.redirect_stdout(devnull))
+        cpu_start = _cpu_seconds()
+        started = time.perf_counter()
+        rows = STAGE_FUNCTIONS[stage](records)
+        wall = time.perf_counter() - started
+        cpu = _cpu_seconds() - cpu_start
+    return {
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "peak_rss_mb": None if (peak := _peak_rss_mb()) is None else round(peak, 1),
+        "rows": rows,
+        "rows_per_s": round(rows / wall, 1) if wall > 0 else None,
+    }
+
+
+# --- Harness ----------------------------------------------------------------
+
+def git_revision() -> Dict[str, Optional[str]]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "subject": git("log", "-1", "--format=%s"),
+        "dirty": None if status is None else bool(status),
+    }
+
+
+def load_history(path: Path) -> List[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+
+def previous_result(history: List[dict], stage: str, scale: int) -> Optional[dict]:
+    for run in reversed(history):
+        for result in run.get("results", []):
+            if result["stage"] == stage and result["scale"] == scale:
+                return result
+    return None
+
+
+def _change(current: Optional[float], previous: Optional[float]) -> str:
+    if not current or not previous:
+        return ""
+    return f" ({(current - previous) / previous:+.0%})"
+
+
+def run(scales, stages, history_file: Path, keep: bool = False, verbose: bool = False) -> dict:
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+    from synthetic_parltrack import generate
+
+    history = load_history(history_file)
+    entry = {
+        "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        **git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": [],
+    }
+    spawn = multiprocessing.get_context("spawn")
+
+    for scale in scales:
+        workspace = Path(tempfile.mkdtemp(prefix=f"mep-bench-x{scale}-"))
+        try:
+            started = time.perf_counter()
+            records = generate(workspace, scale)
+            print(f"scale {scale}x: generated {', '.join(f'{n:,} {name}' for name, n in records.items())} "
+                  f"in {time.perf_counter() - started:.1f}s ({workspace})")
+            for stage in stages:
+                with spawn.Pool(1) as pool:
+                    measured = pool.apply(_run_stage, (stage, str(workspace), records, verbose))
+                result = {"stage": stage, "scale": scale, **measured}
+                before = previous_result(history, stage, scale) or {}
+                peak = result["peak_rss_mb"]
+                print(
+                    f"  {stage:<15} wall {result['wall_s']:8.2f}s{_change(result['wall_s'], before.get('wall_s')):<7} "
+                    f"cpu {result['cpu_s']:8.2f}s  "
+                    f"peak {'n/a' if peak is None else f'{peak:,.0f} MB'}{_change(peak, before.get('peak_rss_mb')):<7} "
+                    f"{result['rows_per_s'] or 0:,.0f} rows/s"
+                )
+                entry["results"].append(result)
+        finally:
+            if keep:
+                print(f"  workspace kept in {workspace}")
+            else:
+                shutil.rmtree(workspace, ignore_errors=True)
+
+    history.append(entry)
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    history_file.write_text(json.dumps(history, indent=2) + "\n", encoding="utf-8")
+    print(f"Results appended to {history_file}")
+    return entry
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the dataset build pipeline on synthetic data.")
+    parser.add_argument("--scale", type=int, nargs="+", default=list(SCALES),
+                        help="data size multipliers to run (default: 1 10 100)")
+    parser.add_argument("--stage", choices=STAGES, action="append",
+                        help="stage to run (repeatable, default: all; later stages need the ingest)")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE,
+                        help=f"JSON history file to append to (default: {HISTORY_FILE.relative_to(REPO_ROOT)})")
+    parser.add_argument("--keep", action="store_true", help="keep the generated workspaces")
+    parser.add_argument("--verbose", action="store_true", help="show the stages' own output")
+    args = parser.parse_args(argv)
+
+    stages = [stage for stage in STAGES if stage in (args.stage or STAGES)]
+    if stages and stages[0] != "ingest":
+        stages.insert(0, "ingest")  # every other stage reads the database it builds
+    run(args.scale, stages, args.history, keep=args.keep, verbose=args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Synthetic ParlTrack dumps for benchmarking the build pipeline.
+
+`generate(root, scale)` writes, under `root`, the files the ingest reads,
+shaped like the real ones but with random (seeded, so reproducible) content:
+
+  * data/parltrack/ep_meps.json.zst
+  * data/parltrack/ep_votes.json.zst
+  * data/parltrack/ep_amendments.json.zst
+  * data/parltrack/ep_mep_activities.json.zst, plus the archived term 8 and
+    term 9 dumps under `8th term/` and `9th term/`
+  * data/term_list/{8,9,10}th term_raw.csv
+
+Scale 1 is a few hundred MEPs' worth of data; every count (MEPs, votes,
+amendments) grows linearly with `scale`, except the ballots of one vote,
+which are capped at the size of a real plenary.
+
+Usage:
+    python benchmarks/synthetic_parltrack.py /tmp/bench 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+import zstandard
+
+MEPS = 120
+VOTES = 400
+AMENDMENTS = 3000
+PLENARY_SIZE = 750
+TERMS = (8, 9, 10)
+
+GROUPS = (
+    "Group of the European People's Party (Christian Democrats)",
+    "Group of the Progressive Alliance of Socialists and Democrats in the European Parliament",
+    "Renew Europe Group",
+    "Group of the Greens/European Free Alliance",
+    "European Conservatives and Reformists Group",
+    "Non-attached Members",
+)
+VOTE_GROUPS = ("EPP", "S&D", "RE", "Greens/EFA", "ECR", "NI")
+COUNTRIES = ("France", "Germany", "Italy", "Spain", "Poland", "Romania", "Netherlands", "Belgium")
+ROLES = ("Member", "Member", "Member", "Substitute", "Substitute", "Chair", "Vice-Chair")
+ACTIVITY_KEYS = (
+    "CRE", "REPORT", "REPORT-SHADOW", "COMPARL", "COMPARL-SHADOW", "WQ", "OQ",
+    "MINT", "MOTION", "IMOTION", "WDECL", "WEXP",
+)
+SPEECH_TITLES = ("Debate", "Explanations of vote", "One-minute speeches", "Speech")
+
+# Dump -> terms its activity items are spread over (mostly the dump's own term).
+ACTIVITY_DUMPS = {
+    "8th term/ep_mep_activities-2019-07-03.json.zst": (7, 8, 8, 8),
+    "9th term/ep_mep_activities-2024-07-02.json.zst": (8, 9, 9, 9),
+    "ep_mep_activities.json.zst": (9, 10, 10, 10),
+}
+
+
+def _write_array(path: Path, items: Iterable[Any]) -> int:
+    """Stream `items` into a zstd-compressed JSON array; returns how many were written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("wb") as handle, zstandard.ZstdCompressor(level=3).stream_writer(handle) as writer:
+        writer.write(b"[")
+        for item in items:
+            writer.write((b"," if count else b"") + json.dumps(item).encode("utf-8"))
+            count += 1
+        writer.write(b"]")
+    return count
+
+
+class _Generator:
+    def __init__(self, scale: int, seed: int) -> None:
+        self.rnd = random.Random(seed)
+        self.scale = scale
+        self.ids = list(range(1000, 1000 + MEPS * scale))
+
+    def date(self, first_year: int, last_year: int) -> str:
+        rnd = self.rnd
+        return f"{rnd.randint(first_year, last_year)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T00:00:00"
+
+    def memberships(self, kind: str, count: int) -> list:
+        return [
+            {
+                "Organization": f"{kind} {k}",
+                "abbr": f"{kind[0]}{k}",
+                "role": self.rnd.choice(ROLES),
+                "start": self.date(2014, 2025),
+                "end": self.date(2016, 2030),
+            }
+            for k in range(count)
+        ]
+
+    def meps(self) -> Iterable[dict]:
+        rnd = self.rnd
+        for mep_id in self.ids:
+            offices = []
+            if rnd.random() < 0.1:
+                offices.append({
+                    "Office": rnd.choice(("Vice-President", "Quaestor", "President", "Member of the Bureau")),
+                    "Body": rnd.choice(("European Parliament", "Group")),
+                    "start": self.date(2014, 2025),
+                })
+            yield {
+                "UserID": mep_id,
+                "Name": {"full": f"Mep {mep_id}", "sur": f"Surname{mep_id}", "family": f"Family{mep_id}"},
+                "Gender": rnd.choice(("F", "M")),
+                "Birth": {"date": "1970-01-01", "place": "Somewhere"},
+                "Constituencies": [{
+                    "country": rnd.choice(COUNTRIES),
+                    "party": f"Party {mep_id % 40}",
+                    "start": self.date(2014, 2016),
+                    "end": self.date(2019, 2030),
+                }],
+                "Groups": [{
+                    "Organization": rnd.choice(GROUPS),
+                    "groupid": "G",
+                    "start": self.date(2014, 2019),
+                    "end": self.date(2020, 2030),
+                    "Offices": offices,
+                }],
+                "Committees": self.memberships("Committee", rnd.randint(0, 4)),
+                "Delegations": self.memberships("Delegation", rnd.randint(0, 3)),
+                "Staff": [],
+                "Photo": f"https://example.org/photos/{mep_id}.jpg",
+                "Twitter": [f"https://twitter.com/mep{mep_id}"],
+                "Mail": [f"mep{mep_id}@example.org"],
+                "CV": ["Education", "Career", "Political career", "Other"],
+            }
+
+    def votes(self) -> Iterable[dict]:
+        rnd = self.rnd
+        present = int(min(len(self.ids), PLENARY_SIZE) * 0.8)
+        for vote_id in range(VOTES * self.scale):
+            ts = self.date(2014, 2026)
+            ballots = rnd.sample(self.ids, present)
+            outcomes = {}
+            for slot, key in enumerate(("+", "-", "0")):
+                part = ballots[slot::3]
+                groups: Dict[str, list] = {}
+                for mep_id in part:
+                    groups.setdefault(rnd.choice(VOTE_GROUPS), []).append({"mepid": mep_id, "name": f"Mep {mep_id}"})
+                outcomes[key] = {"total": len(part), "groups": groups}
+            yield {
+                "voteid": vote_id,
+                "ts": ts,
+                "date": ts,
+                "title": f"Vote {vote_id}",
+                "rapporteur": [{"UserID": rnd.choice(self.ids)}],
+                "shadows": [{"UserID": rnd.choice(self.ids)}],
+                "votes": outcomes,
+            }
+
+    def amendments(self) -> Iterable[dict]:
+        rnd = self.rnd
+        for amendment_id in range(AMENDMENTS * self.scale):
+            yield {
+                "id": amendment_id,
+                "date": self.date(2013, 2026),
+                "meps": rnd.sample(self.ids, rnd.randint(1, 3)),
+                "reference": f"A9-{amendment_id:06d}",
+                "title": f"Amendment {amendment_id}",
+                "seq": amendment_id,
+            }
+
+    def activities(self, terms: tuple) -> Iterable[dict]:
+        rnd = self.rnd
+        for mep_id in self.ids:
+            bundle: Dict[str, Any] = {"mep_id": mep_id}
+            for key in ACTIVITY_KEYS:
+                items = [
+                    {
+                        "term": rnd.choice(terms),
+                        "date": self.date(2014, 2026),
+                        "title": rnd.choice(SPEECH_TITLES),
+                        "url": f"https://example.org/{mep_id}/{key}/{n}",
+                    }
+                    for n in range(rnd.randint(0, 6))
+                ]
+                if items:
+                    bundle[key] = items
+            yield bundle
+
+
+def generate(root: Path | str, scale: int = 1, seed: int = 42) -> Dict[str, int]:
+    """Write a synthetic ParlTrack workspace under `root`; returns the record count of each dump."""
+    root = Path(root)
+    parltrack = root / "data/parltrack"
+    generator = _Generator(scale, seed)
+
+    counts = {
+        "meps": _write_array(parltrack / "ep_meps.json.zst", generator.meps()),
+        "votes": _write_array(parltrack / "ep_votes.json.zst", generator.votes()),
+        "amendments": _write_array(parltrack / "ep_amendments.json.zst", generator.amendments()),
+        "activities": 0,
+    }
+    for name, terms in ACTIVITY_DUMPS.items():
+        counts["activities"] += _write_array(parltrack / name, generator.activities(terms))
+
+    term_lists = root / "data/term_list"
+    term_lists.mkdir(parents=True, exist_ok=True)
+    for term in TERMS:
+        listed = generator.ids[: len(generator.ids) - (term - TERMS[0]) * 10 * scale]
+        entries = "".join(f"<mep><fullName>Mep {mep_id}</fullName><id>{mep_id}</id></mep>" for mep_id in listed)
+        (term_lists / f"{term}th term_raw.csv").write_text(f"<?xml version='1.0'?><meps>{entries}</meps>", encoding="utf-8")
+    (root / "public/data").mkdir(parents=True, exist_ok=True)
+    return counts
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic ParlTrack dumps for benchmarking.")
+    parser.add_argument("root", type=Path, help="workspace directory to write data/ and public/data/ into")
+    parser.add_argument("scale", type=int, nargs="?", default=1, help="size multiplier (default: 1)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    counts = generate(args.root, args.scale, args.seed)
+    print(", ".join(f"{count:,} {name}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
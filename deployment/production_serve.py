@@ -23,6 +23,9 @@ from logging.handlers import RotatingFileHandler
 import psutil
 from functools import lru_cache
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+from term_calendar import term_for_date
+
 # Configuration
 PORT = 8000
 DIRECTORY = "public"
@@ -461,27 +464,8 @@ class MEPProductionAPIHandler(http.server.SimpleHTTPRequestHandler):
                         mep_amendments.append(amend)
                     else:
                         # Original file needs term filtering
-                        amend_date = amend.get('date', '')
-                        if amend_date:
-                            try:
-                                if 'T' in amend_date:
-                                    date_obj = dt.datetime.fromisoformat(amend_date.replace('T', ' ').replace('Z', ''))
-                                else:
-                                    date_obj = dt.datetime.fromisoformat(amend_date)
-
-                                # Filter by term dates
-                                if term == 8:
-                                    if dt.datetime(2014, 7, 1) <= date_obj < dt.datetime(2019, 7, 2):
-                                        mep_amendments.append(amend)
-                                elif term == 9:
-                                    if dt.datetime(2019, 7, 2) <= date_obj < dt.datetime(2024, 7, 16):
-                                        mep_amendments.append(amend)
-                                elif term == 10:
-                                    if dt.datetime(2024, 7, 16) <= date_obj:
-                                        mep_amendments.append(amend)
-                            except (ValueError, TypeError) as e:
-                                logger.debug(f"Invalid date format in amendment: {amend_date}: {e}")
-                                continue
+                        if term_for_date(amend.get('date', '')) == term:
+                            mep_amendments.append(amend)
 
             # Sort and paginate
             mep_amendments.sort(key=lambda x: x.get('date', ''), reverse=True)
@@ -1,59 +1,77 @@
 import { loadTermDataset, createGroupDisplay, createCountryDisplay } from "./utilities.js";
+import scoringAPI from "./scoring-api.js";
 
 const inputs = document.querySelectorAll("input[data-key]");
 const tbody = document.getElementById("custom-table-body");
 const termSelect = document.getElementById("term-select");
 
-let dataset = [];
+// Rows requested from the server per ranking
+const PAGE_SIZE = 200;
 
-// Load initial dataset
-loadTermDataset(termSelect.value).then(data => {
-  dataset = data.meps;
-  const term = termSelect.value;
-  recompute();
-});
+// Full dataset, only downloaded when the scoring API is unavailable
+let dataset = null;
+
+// Incremented per ranking request; only the latest one may fill the table
+let latestRequest = 0;
+
+// Load initial ranking
+recompute();
 
 // Handle term changes
-termSelect.addEventListener("change", async () => {
-  const term = termSelect.value;
-  const data = await loadTermDataset(term);
-  dataset = data.meps;
+termSelect.addEventListener("change", () => {
+  dataset = null;
   recompute();
 });
 
 
-function recompute() {
-  // Gather weights from input fields
+function gatherWeights() {
   const weights = {};
   inputs.forEach(input => {
     weights[input.dataset.key] = parseFloat(input.value) || 0;
   });
-  
-  // Calculate custom scores for each MEP
+  return weights;
+}
+
+// Same ranking as the server, computed from the full dataset in the browser
+async function rankLocally(term, weights) {
+  if (!dataset) {
+    dataset = (await loadTermDataset(term)).meps;
+  }
   const rows = dataset.map(mep => {
     let customScore = 0;
-    
-    // Apply weights to each activity/role count
     for (const key in weights) {
       customScore += (mep[key] || 0) * weights[key];
     }
-    
-    return { ...mep, customScore };
+    return { ...mep, custom_score: customScore };
   });
-  
-  // Sort by custom score (descending)
-  rows.sort((a, b) => b.customScore - a.customScore);
-  
-  // Render table - show all rows
+  rows.sort((a, b) => b.custom_score - a.custom_score);
+  return rows.slice(0, PAGE_SIZE).map((row, index) => ({ ...row, rank: index + 1 }));
+}
+
+async function recompute() {
+  const request = ++latestRequest;
+  const term = termSelect.value;
+  const weights = gatherWeights();
+
+  let rows;
+  try {
+    rows = (await scoringAPI.getCustomRanking(term, weights, { limit: PAGE_SIZE })).data;
+  } catch (error) {
+    rows = await rankLocally(term, weights);
+  }
+  if (request !== latestRequest) {
+    return; // a newer ranking (other term or weights) was requested meanwhile
+  }
+
   tbody.innerHTML = "";
-  rows.forEach((row, index) => {
+  rows.forEach(row => {
     const tr = document.createElement("tr");
     tr.innerHTML = `
-      <td>${index + 1}</td>
+      <td>${row.rank}</td>
       <td>${row.full_name}</td>
       <td>${createCountryDisplay(row.country, { size: 'small', showCode: true })}</td>
       <td>${createGroupDisplay(row.group, { size: 'small' })}</td>
-      <td>${row.customScore.toFixed(2)}</td>`;
+      <td>${row.custom_score.toFixed(2)}</td>`;
     tbody.appendChild(tr);
   });
 }
@@ -67,4 +85,4 @@ inputs.forEach(input => {
     // Uncomment the next line for live updates
     // recompute();
   });
-}); 
\ No newline at end of file
+});
@@ -1,4 +1,4 @@
-import { loadTermDataset, createGroupDisplay, createCountryDisplay } from "./utilities.js";
+import { loadTermIndex, loadMepProfile, createGroupDisplay, createCountryDisplay } from "./utilities.js";
 import { showScoreBreakdown, hideScoreBreakdown, initializeScoreBreakdownModal } from "./score-breakdown.js";
 
 // DOM Elements
@@ -266,8 +266,8 @@ async function updateFilterOptions(forceReload = false) {
   
   // Load new data if term changed or forced reload
   if (forceReload || !currentTermData.length) {
-    // Loading dataset for term
-    const termDataset = await loadTermDataset(term);
+    // Loading the slim ranking index for term (breakdowns are fetched on demand)
+    const termDataset = await loadTermIndex(term);
     // Dataset loaded
     
     if (termDataset) {
@@ -1008,12 +1008,13 @@ async function render() {
   
   // Add click event listeners to score cells - use unified score breakdown
   document.querySelectorAll('.clickable-score').forEach(scoreElement => {
-    scoreElement.addEventListener('click', (e) => {
+    scoreElement.addEventListener('click', async (e) => {
       e.preventDefault();
       const mepId = parseInt(e.target.dataset.mepId);
       const mep = currentTermData.find(m => m.mep_id === mepId);
       if (mep) {
-        showScoreBreakdown(mep, currentTermData);
+        const profile = await loadMepProfile(termSelect.value, mepId).catch(() => null);
+        showScoreBreakdown({ ...profile, ...mep }, currentTermData);
       }
     });
   });
@@ -1,4 +1,4 @@
-import { loadTermDataset, createGroupDisplay, createCountryDisplay } from './utilities.js'; // Assuming utilities.js has a suitable loader
+import { loadTermIndex, loadTermAverages, loadMepProfile, createGroupDisplay, createCountryDisplay } from './utilities.js'; // Assuming utilities.js has a suitable loader
 import { showScoreBreakdown, hideScoreBreakdown, initializeScoreBreakdownModal } from './score-breakdown.js';
 
 // Profile page now uses MEP Ranking scores from the dataset
@@ -70,27 +70,35 @@ async function loadMEPProfile() {
         errorEl.style.display = 'none';
         profileContentEl.style.display = 'none';
 
-        // Load term dataset with fallback
-        let termData;
+        // Load the slim term index with fallback; the averages and this MEP's
+        // profile shard (detailed roles, score breakdown) are fetched separately
+        let dataTerm = term;
+        let termIndex;
         try {
-            termData = await loadTermDataset(term);
+            termIndex = await loadTermIndex(term);
         } catch (error) {
             console.warn(`Term ${term} dataset not found, trying term 10 as fallback`);
             try {
-                termData = await loadTermDataset(10);
+                dataTerm = 10;
+                termIndex = await loadTermIndex(10);
             } catch (fallbackError) {
                 throw new Error(`Could not load data for term ${term} or fallback term 10. Available terms: 8, 9, 10`);
             }
         }
         
         // Handle both data formats
-        const meps = Array.isArray(termData) ? termData : termData.meps;
-        const averages = Array.isArray(termData) ? {} : termData.averages;
+        const meps = Array.isArray(termIndex) ? termIndex : termIndex.meps;
 
         if (!meps || !Array.isArray(meps)) {
             throw new Error(`Could not load MEP data. Available terms: 8, 9, 10`);
         }
 
+        const [termAverages, profile] = await Promise.all([
+            Array.isArray(termIndex) ? { averages: {} } : loadTermAverages(dataTerm),
+            Array.isArray(termIndex) ? meps.find(m => m.mep_id === mepId) : loadMepProfile(dataTerm, mepId)
+        ]);
+        const averages = termAverages.averages || {};
+
         
         // Use MEP Ranking scores from the dataset (already calculated by build_term_dataset.py)
         // This ensures consistency with the index page scoring
@@ -101,7 +109,7 @@ async function loadMEPProfile() {
         }));
         
         // Find the MEP
-        const mep = scoredMeps.find(m => m.mep_id === mepId);
+        const mep = profile && { ...profile, score: profile.final_score || profile.score || 0 };
         
         if (!mep) {
             throw new Error(`MEP with ID ${mepId} not found in term ${term} data`);
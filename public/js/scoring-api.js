@@ -48,6 +48,34 @@ class ScoringAPI {
         }
     }
     
+    /**
+     * Get one page of MEPs ranked by a weighted sum of their metrics
+     * (weights: { metric: number }), computed server-side
+     */
+    async getCustomRanking(term = 10, weights = {}, { offset = 0, limit = 50 } = {}) {
+        try {
+            const response = await fetch(`${this.baseUrl}/api/score/custom`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ term: Number(term), weights, offset, limit })
+            });
+            
+            const data = await response.json();
+            
+            if (!response.ok || !data.success) {
+                throw new Error(data.error || `HTTP error! status: ${response.status}`);
+            }
+            
+            return data;
+            
+        } catch (error) {
+            console.error('Error fetching custom ranking:', error);
+            throw error;
+        }
+    }
+    
     /**
      * Get current scoring configuration
      */
@@ -1,5 +1,25 @@
+// data/manifest.json maps each dataset to its content-hashed file. Those files
+// never change, so browsers may cache them indefinitely; only the small manifest
+// is revalidated. Without a manifest the fixed-name files are used.
+let dataManifestPromise = null;
+
+function loadDataManifest() {
+  if (!dataManifestPromise) {
+    dataManifestPromise = fetch('./data/manifest.json', { cache: 'no-cache' })
+      .then(response => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return dataManifestPromise;
+}
+
+export async function dataArtifactUrl(name) {
+  const manifest = await loadDataManifest();
+  const artifact = manifest && manifest.artifacts && manifest.artifacts[name];
+  return artifact ? `./data/${artifact.file}` : `./data/${name}.json`;
+}
+
 export async function loadTermDataset(term) {
-  const url = `./data/term${term}_dataset.json`;
+  const url = await dataArtifactUrl(`term${term}_dataset`);
   
   try {
     const response = await fetch(url);
@@ -9,13 +29,94 @@ export async function loadTermDataset(term) {
     }
     
     const data = await response.json();
-    return data;
+    return withRowMeps(data);
   } catch (error) {
     console.error(`Failed to load dataset for term ${term}:`, error);
     throw error;
   }
 }
 
+// Columnar datasets store one array per column instead of one object per MEP
+// (see backend/columnar.py); country, group and national_party hold indexes
+// into `dictionaries`. Returns the rows.
+export function decodeColumnar(data) {
+  if (data.version !== 1) {
+    throw new Error(`Unsupported columnar version: ${data.version}`);
+  }
+  const names = Object.keys(data.columns);
+  const columns = names.map(name => {
+    const values = data.columns[name];
+    const dictionary = data.dictionaries && data.dictionaries[name];
+    return dictionary ? values.map(code => dictionary[code]) : values;
+  });
+  const rows = new Array(data.length);
+  for (let i = 0; i < data.length; i++) {
+    const row = {};
+    for (let c = 0; c < names.length; c++) {
+      row[names[c]] = columns[c][i];
+    }
+    rows[i] = row;
+  }
+  return rows;
+}
+
+// A dataset (or index) with its `meps` in row form, whichever encoding it was stored in.
+export function withRowMeps(data) {
+  if (data && data.meps && data.meps.encoding === 'columnar') {
+    return { ...data, meps: decodeColumnar(data.meps) };
+  }
+  return data;
+}
+
+async function fetchDataArtifact(name) {
+  const response = await fetch(await dataArtifactUrl(name));
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+  }
+  return response.json();
+}
+
+// Slim ranking index of a term: { meps, profile_shards }, read from its
+// columnar encoding. Datasets built before the index existed fall back to
+// the row index, then to the full dataset.
+const termIndexPromises = new Map();
+
+export function loadTermIndex(term) {
+  const key = String(term);
+  if (!termIndexPromises.has(key)) {
+    const promise = fetchDataArtifact(`term${term}_index_columnar`)
+      .then(withRowMeps)
+      .catch(() => fetchDataArtifact(`term${term}_index`))
+      .catch(() => loadTermDataset(term));
+    promise.catch(() => termIndexPromises.delete(key));
+    termIndexPromises.set(key, promise);
+  }
+  return termIndexPromises.get(key);
+}
+
+// EP, group and country averages (and percentiles) of a term.
+export async function loadTermAverages(term) {
+  try {
+    return await fetchDataArtifact(`term${term}_averages`);
+  } catch (error) {
+    const dataset = await loadTermDataset(term);
+    return { averages: dataset.averages || {}, percentiles: dataset.percentiles };
+  }
+}
+
+// One MEP's full record: the index row merged with its profile shard
+// (detailed roles, score breakdown). Returns null when the MEP is not in the term.
+export async function loadMepProfile(term, mepId) {
+  const index = await loadTermIndex(term);
+  const row = (index.meps || []).find(m => m.mep_id === mepId);
+  if (!row || !index.profile_shards) {
+    return row || null;
+  }
+  const shard = String(mepId % index.profile_shards).padStart(2, '0');
+  const profiles = await fetchDataArtifact(`term${term}_profiles_${shard}`);
+  return { ...row, ...(profiles.meps[String(mepId)] || {}) };
+}
+
 export async function loadMEPScores(term) {
   try {
     const response = await fetch(`/api/scores/${term}`);
@@ -15,10 +15,13 @@ import sqlite3
 import datetime as dt
 from pathlib import Path
 
+from backend.activity_items import SERVE_DETAIL_CATEGORIES, fetch_activity_items
+from backend.dataset_artifacts import resolve_artifact
 from backend.file_utils import load_json_auto, resolve_json_path
 
 PORT = 8000
 DIRECTORY = "public"
+DB_PATH = Path("data/meps.db")
 
 def kill_process_on_port(port):
     if platform.system() == "Windows":
@@ -68,10 +71,40 @@ class MEPAPIHandler(http.server.SimpleHTTPRequestHandler):
         # Handle API endpoints
         if path.startswith('/api/'):
             self.handle_api_request(path, query_params)
+        elif path.startswith('/data/') and self.send_data_artifact(path[len('/data/'):]):
+            # Dataset JSON, served precompressed with its cache policy
+            return
         else:
             # Serve static files
             super().do_GET()
     
+    def send_data_artifact(self, filename):
+        """Serve a public/data JSON file; returns False to leave the request to the static handler."""
+        artifact = resolve_artifact(Path(DIRECTORY) / 'data', filename, self.headers.get('Accept-Encoding', ''))
+        if artifact is None:
+            return False
+        try:
+            if self.headers.get('If-None-Match') == artifact.etag:
+                self.send_response(304)
+                self.send_header('ETag', artifact.etag)
+                self.send_header('Cache-Control', artifact.cache_control)
+                self.end_headers()
+                return True
+            body = artifact.path.read_bytes()
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            if artifact.encoding:
+                self.send_header('Content-Encoding', artifact.encoding)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Cache-Control', artifact.cache_control)
+            self.send_header('ETag', artifact.etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (ConnectionAbortedError, BrokenPipeError):
+            pass
+        return True
+    
     def handle_api_request(self, path, query_params):
         """Handle API endpoints"""
         try:
@@ -244,7 +277,22 @@ class MEPAPIHandler(http.server.SimpleHTTPRequestHandler):
             }
 
     def get_activities_detailed(self, mep_id, category, term, offset, limit, total_count):
-        """Get detailed activities data from term-specific activities file"""
+        """Get detailed activities data, from meps.db or else the term-specific activities file"""
+        page = fetch_activity_items(DB_PATH, mep_id, term, SERVE_DETAIL_CATEGORIES[category], offset, limit)
+        if page is not None:
+            total, paginated_data = page
+            return {
+                'success': True,
+                'data': paginated_data,
+                'total_count': total,
+                'category': category,
+                'offset': offset,
+                'limit': limit,
+                'has_more': total > offset + limit,
+                'mep_id': mep_id,
+                'term': term
+            }
+
         # Use term-specific activities files
         activities_file = resolve_json_path(Path(f"data/parltrack/ep_mep_activities_term{term}.json"))
 